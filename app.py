@@ -9,32 +9,28 @@ A production-ready web application for predicting employee attrition with 93% ac
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-import pickle
+import io
 import os
+import time
 from datetime import datetime
 import warnings
+from scoring import AttritionScorer, MODEL_DIR, risk_category
+from scoring_pool import ScoringPool, PoolBusy
+from data_cache import file_version, read_csv_cached
+from correlation import correlate_frame, target_correlations
+from summary_stats import summarize_frame
+from histogram_index import HistogramIndex
+from filter_index import FilterIndex
+from employee_store import EmployeeStore
+from schema import compact, default_memory, memory_report
+from figure_cache import FigureCache
+from exports import ExportCache, FORMATS, available_formats
+from shap_store import ShapStore
+from feature_store import FeatureStore
+from instrumentation import METRICS, METRICS_FILE, METRICS_HOST, METRICS_PORT, DEBUG_PANEL, serve_metrics, write_metrics, to_json, to_prometheus
+import roi
 warnings.filterwarnings('ignore')
 
-# Set professional matplotlib style
-plt.style.use('seaborn-v0_8-darkgrid')
-sns.set_palette(['#3498DB', '#2C3E50', '#5D6D7E', '#7F8C8D', '#95A5A6'])
-plt.rcParams['figure.facecolor'] = 'white'
-plt.rcParams['axes.facecolor'] = '#F8F9FA'
-plt.rcParams['axes.edgecolor'] = '#2C3E50'
-plt.rcParams['axes.labelcolor'] = '#2C3E50'
-plt.rcParams['text.color'] = '#2C3E50'
-plt.rcParams['xtick.color'] = '#2C3E50'
-plt.rcParams['ytick.color'] = '#2C3E50'
-plt.rcParams['grid.color'] = '#BDC3C7'
-plt.rcParams['grid.alpha'] = 0.3
-plt.rcParams['font.size'] = 10
-plt.rcParams['axes.titlesize'] = 14
-plt.rcParams['axes.titleweight'] = 'bold'
-plt.rcParams['axes.labelsize'] = 11
-plt.rcParams['axes.labelweight'] = 'bold'
-
 # Page Configuration
 st.set_page_config(
     page_title="Employee Attrition Predictor",
@@ -221,60 +217,136 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # Helper Functions
-@st.cache_data
-def load_data():
-    """Load the employee dataset"""
+PREDICTION_FILES = ['high_risk.csv', 'attritionprediction.csv']
+
+def employee_version():
+    """Version stamp of employee.csv (None if missing); every data cache is keyed on it"""
+    return file_version('employee.csv') if os.path.exists('employee.csv') else None
+
+def predictions_version():
+    """Version stamps of the prediction files and of the employee data joined into them"""
+    return tuple(file_version(path) if os.path.exists(path) else None for path in PREDICTION_FILES) + (employee_version(),)
+
+@METRICS.cached(st.cache_resource(max_entries=1))
+def load_employee_store(version):
+    """Load one version of the employee dataset into an ID-indexed store shared by all sessions"""
     try:
-        df = pd.read_csv('employee.csv')
-        # Standardize column names to handle case variations
-        df.columns = df.columns.str.strip()
-        # Create 'Attrition' column if it doesn't exist but 'attrition' does
-        if 'attrition' in df.columns and 'Attrition' not in df.columns:
-            df['Attrition'] = df['attrition']
-        return df
+        df = read_csv_cached('employee.csv')
     except FileNotFoundError:
+        return None
+    # Standardize column names to handle case variations
+    df.columns = df.columns.str.strip()
+    # int8 codes, categories and float32 measures instead of int64/object/float64
+    df = compact(df)
+    # Create 'Attrition' column if it doesn't exist but 'attrition' does
+    if 'attrition' in df.columns and 'Attrition' not in df.columns:
+        df['Attrition'] = df['attrition']
+    return EmployeeStore(df)
+
+@METRICS.timed('loader')
+def load_data(version=None):
+    """Load the employee dataset (the current version unless one is given)"""
+    store = load_employee_store(employee_version() if version is None else version)
+    if store is None:
         st.error("❌ employee.csv not found. Please ensure the data file is in the project directory.")
         return None
+    return store.frame
 
-@st.cache_resource
+@METRICS.cached(st.cache_resource)
 def load_model():
-    """Load the trained machine learning model"""
-    model_path = 'models/best_model.pkl'
-    scaler_path = 'models/scaler.pkl'
-    
-    if os.path.exists(model_path) and os.path.exists(scaler_path):
-        with open(model_path, 'rb') as f:
-            model = pickle.load(f)
-        with open(scaler_path, 'rb') as f:
-            scaler = pickle.load(f)
-        return model, scaler
-    else:
-        return None, None
+    """Load the trained model artifacts into a reusable scorer"""
+    required = ['best_model.pkl', 'scaler.pkl', 'feature_names.pkl']
+    if not all(os.path.exists(os.path.join(MODEL_DIR, f)) for f in required):
+        return None
+    
+    scorer = AttritionScorer(MODEL_DIR)
+    # Category codes and thresholds must match the data the model was trained on
+    df = load_data()
+    if df is not None:
+        scorer.fit_reference(df)
+    return scorer
 
-@st.cache_data
-def load_predictions():
-    """Load prediction results if available"""
+@METRICS.cached(st.cache_resource)
+def load_scoring_pool():
+    """The scoring threads every session submits to, so one large job can't block the others"""
+    scorer = load_model()
+    if scorer is None:
+        return None
+    pool = ScoringPool(scorer)
+    METRICS.register_gauges('scoring_pool', pool.metrics)
+    return pool
+
+@METRICS.cached(st.cache_resource(show_spinner=False, max_entries=1))
+def load_feature_store(version):
+    """Memory-map the scaled feature matrix if feature_store.py has been run for this model and data"""
+    return FeatureStore.open('.', MODEL_DIR, 'employee.csv')
+
+@METRICS.cached(st.cache_resource(show_spinner=False, max_entries=1))
+def load_shap_store(version):
+    """Memory-map precomputed SHAP values if shap_store.py has been run for this model and data"""
+    return ShapStore.open('.', MODEL_DIR, 'employee.csv')
+
+@METRICS.cached(st.cache_resource(show_spinner=False, max_entries=1))
+def load_summary(version):
+    """Chunked describe() and null counts for one version of employee.csv"""
+    return summarize_frame(load_data(version))
+
+@METRICS.cached(st.cache_resource(show_spinner=False, max_entries=1))
+def load_histograms(version):
+    """Pre-binned histograms and box plot summaries for one version of employee.csv"""
+    df = load_data(version)
+    return HistogramIndex(df, by='Attrition' if 'Attrition' in df.columns else None)
+
+@METRICS.cached(st.cache_data(show_spinner=False, max_entries=1))
+def load_memory_report(version):
+    """Per-column memory of employee.csv with pandas' default dtypes and with the compact schema"""
+    # The default-dtype sizes are summed chunk by chunk, never holding that frame next to the compact one
+    return memory_report(default_memory('employee.csv'), load_data(version))
+
+@METRICS.cached(st.cache_data(show_spinner=False, max_entries=1))
+def load_correlations(version):
+    """Feature correlations for one version of employee.csv, computed in a single pass"""
+    df = load_data(version)
+    target = 'Attrition' if 'Attrition' in df.columns else None
+    return correlate_frame(df, target=target)
+
+# Assumptions varied by the ROI page's uncertainty analysis (headcount is known)
+UNCERTAIN_INPUTS = ['avg_salary', 'attrition_rate', 'replacement_multiplier', 'model_accuracy',
+                    'success_rate', 'implementation_cost', 'annual_maintenance']
+
+@METRICS.cached(st.cache_data(show_spinner=False))
+def simulate_roi(inputs, spread, n_scenarios):
+    """Monte Carlo summary of the 5-year benefit around one set of calculator inputs"""
+    results = roi.monte_carlo(dict(inputs), {name: spread for name in UNCERTAIN_INPUTS}, n=n_scenarios)
+    total = results['total_net']
+    # Only the binned distribution is kept, not the million scenarios behind it
+    counts, edges = np.histogram(total, bins=50)
+    bands = roi.percentiles(total)
+    return {'edges': edges, 'counts': counts, 'p5': bands[5], 'p50': bands[50], 'p95': bands[95],
+            'positive': float(np.mean(results['roi'] > 0))}
+
+@METRICS.cached(st.cache_resource(max_entries=1))
+def load_filter_index(version):
+    """Risk/department bitmaps and the score ordering over one version of the predictions"""
+    _, predictions = load_predictions(version)
+    if predictions is None:
+        return None
+    risk_col = 'RiskLevel' if 'RiskLevel' in predictions.columns else 'risk_category'
+    dept_col = 'Department' if 'Department' in predictions.columns else 'department'
+    prob_col = 'Attrition_Probability' if 'Attrition_Probability' in predictions.columns else 'attrition_risk_score'
+    return FilterIndex(predictions, categorical=[risk_col, dept_col], score=prob_col)
+
+@METRICS.cached(st.cache_resource(max_entries=1))
+def load_predictions(version):
+    """Load one version of the prediction results if available (shared across sessions; treat as read-only)"""
     try:
-        high_risk = pd.read_csv('high_risk.csv')
-        predictions = pd.read_csv('attritionprediction.csv')
-        
-        # Merge predictions with employee data to get department info
-        employee_df = pd.read_csv('employee.csv')
-        if 'employee_id' in predictions.columns and 'employee_id' in employee_df.columns:
-            # Select only the columns we need from employee data
-            merge_cols = ['employee_id']
-            if 'department' in employee_df.columns:
-                merge_cols.append('department')
-            if 'Department' in employee_df.columns:
-                merge_cols.append('Department')
-            if 'job_role' in employee_df.columns:
-                merge_cols.append('job_role')
-                
-            predictions = predictions.merge(
-                employee_df[merge_cols],
-                on='employee_id',
-                how='left'
-            )
+        high_risk = read_csv_cached('high_risk.csv')
+        predictions = read_csv_cached('attritionprediction.csv')
+        
+        # Join department info from the already-loaded employee store by ID
+        store = load_employee_store(version[-1])
+        if store is not None and store.key in predictions.columns:
+            predictions = store.join(predictions, ['department', 'Department', 'job_role'])
         
         # Standardize column names
         if 'risk_category' in high_risk.columns:
@@ -288,25 +360,90 @@ def load_predictions():
     except FileNotFoundError:
         return None, None
 
-def create_feature_for_prediction(input_data, feature_columns):
-    """Prepare input data for prediction"""
-    # Create a DataFrame with all required features
-    df_input = pd.DataFrame([input_data])
-    
-    # Ensure all required features are present
-    for col in feature_columns:
-        if col not in df_input.columns:
-            df_input[col] = 0
-    
-    return df_input[feature_columns]
+@METRICS.cached(st.cache_resource(show_spinner=False))
+def pyplot():
+    """Import matplotlib and apply the app's chart style on first use"""
+    # Deferred so pages without charts (and cached charts) never pay the import
+    import matplotlib.pyplot as plt
+    from cycler import cycler
+    
+    # Set professional matplotlib style
+    plt.style.use('seaborn-v0_8-darkgrid')
+    plt.rcParams['axes.prop_cycle'] = cycler(color=['#3498DB', '#2C3E50', '#5D6D7E', '#7F8C8D', '#95A5A6'])
+    plt.rcParams['figure.facecolor'] = 'white'
+    plt.rcParams['axes.facecolor'] = '#F8F9FA'
+    plt.rcParams['axes.edgecolor'] = '#2C3E50'
+    plt.rcParams['axes.labelcolor'] = '#2C3E50'
+    plt.rcParams['text.color'] = '#2C3E50'
+    plt.rcParams['xtick.color'] = '#2C3E50'
+    plt.rcParams['ytick.color'] = '#2C3E50'
+    plt.rcParams['grid.color'] = '#BDC3C7'
+    plt.rcParams['grid.alpha'] = 0.3
+    plt.rcParams['font.size'] = 10
+    plt.rcParams['axes.titlesize'] = 14
+    plt.rcParams['axes.titleweight'] = 'bold'
+    plt.rcParams['axes.labelsize'] = 11
+    plt.rcParams['axes.labelweight'] = 'bold'
+    return plt
+
+@METRICS.cached(st.cache_resource)
+def figure_cache():
+    """Rendered chart images shared by every session"""
+    cache = FigureCache(span=lambda name: METRICS.span('plot', name))
+    METRICS.register_gauges('figure_cache', lambda: {'entries': len(cache), 'hits': cache.hits, 'misses': cache.misses})
+    return cache
+
+def show_chart(image):
+    """Display cached chart bytes the way st.pyplot would"""
+    st.image(image, use_column_width=True, output_format='PNG')
+
+@METRICS.cached(st.cache_resource)
+def export_cache():
+    """Serialized downloads shared by every session"""
+    cache = ExportCache()
+    METRICS.register_gauges('export_cache', lambda: {'entries': len(cache), 'bytes': cache.size_bytes,
+                                                     'hits': cache.hits, 'misses': cache.misses})
+    return cache
+
+def offer_download(label, frame, key, file_stem):
+    """Format picker and download button; the frame is serialized only once asked for"""
+    cache = export_cache()
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        fmt = st.selectbox("Export format", available_formats(), key=f"{file_stem}_format",
+                           label_visibility="collapsed")
+    extension, mime = FORMATS[fmt]
+    with col2:
+        data = cache.get(key, fmt)
+        if data is None:
+            if not st.button(f"📦 Prepare {label}", key=f"{file_stem}_prepare", use_container_width=True):
+                return
+            with st.spinner("Preparing export..."):
+                data = cache.export(frame, key, fmt)
+        st.download_button(
+            label=f"📥 {label}",
+            data=data,
+            file_name=f"{file_stem}_{datetime.now().strftime('%Y%m%d')}{extension}",
+            mime=mime,
+            use_container_width=True
+        )
 
+def filter_key(filters, min_score=None):
+    """Hashable description of a filter selection (value order doesn't matter)"""
+    return tuple((col, tuple(sorted(map(str, values)))) for col, values in sorted(filters.items())), min_score
+
+@METRICS.timed('plot')
 def plot_attrition_distribution(df):
     """Plot attrition distribution"""
+    attrition_col = 'Attrition' if 'Attrition' in df.columns else 'attrition'
+    attrition_counts = df[attrition_col].value_counts()
+    return figure_cache().render(_draw_attrition_distribution, attrition_counts)
+
+def _draw_attrition_distribution(attrition_counts):
+    plt = pyplot()
     fig, ax = plt.subplots(1, 2, figsize=(14, 5), facecolor='white')
     
     # Count plot - Professional colors
-    attrition_col = 'Attrition' if 'Attrition' in df.columns else 'attrition'
-    attrition_counts = df[attrition_col].value_counts()
     colors = ['#3498DB', '#5D6D7E']  # Professional blue and gray
     ax[0].bar(attrition_counts.index, attrition_counts.values, color=colors, edgecolor='black', linewidth=1.5)
     ax[0].set_title('Attrition Distribution', fontsize=14, fontweight='bold')
@@ -326,23 +463,39 @@ def plot_attrition_distribution(df):
     plt.tight_layout()
     return fig
 
+@METRICS.timed('plot')
 def plot_risk_distribution(predictions_df):
     """Plot risk level distribution"""
     if predictions_df is None or predictions_df.empty:
         return None
     
-    fig, ax = plt.subplots(1, 2, figsize=(14, 5))
-    
     # Risk level distribution
     risk_col = 'RiskLevel' if 'RiskLevel' in predictions_df.columns else 'risk_category'
-    risk_counts = predictions_df[risk_col].value_counts()
-    
-    # Define risk order and colors - Vibrant, high-contrast colors
     risk_order = ['High', 'Medium', 'Low']
-    color_map = {'High': '#D32F2F', 'Medium': '#FFA000', 'Low': '#00BCD4'}  # Bright Red, Bright Amber, Bright Cyan
-    
     # Reindex to ensure proper order
-    risk_counts = risk_counts.reindex(risk_order, fill_value=0)
+    risk_counts = predictions_df[risk_col].value_counts().reindex(risk_order, fill_value=0)
+    
+    # Department-wise risk
+    dept_col = 'Department' if 'Department' in predictions_df.columns else 'department'
+    dept_risk = None
+    if dept_col in predictions_df.columns:
+        dept_risk = predictions_df.groupby([dept_col, risk_col]).size().unstack(fill_value=0)
+        
+        # Ensure columns are in High, Medium, Low order
+        dept_risk = dept_risk.reindex(columns=risk_order, fill_value=0)
+        
+        # Sort by total risk (sum of all risk levels) - highest to lowest
+        dept_risk['_total'] = dept_risk.sum(axis=1)
+        dept_risk = dept_risk.sort_values('_total', ascending=False).drop('_total', axis=1)
+    
+    return figure_cache().render(_draw_risk_distribution, risk_counts, dept_risk)
+
+def _draw_risk_distribution(risk_counts, dept_risk):
+    plt = pyplot()
+    fig, ax = plt.subplots(1, 2, figsize=(14, 5))
+    
+    # Define risk colors - Vibrant, high-contrast colors
+    color_map = {'High': '#D32F2F', 'Medium': '#FFA000', 'Low': '#00BCD4'}  # Bright Red, Bright Amber, Bright Cyan
     bar_colors = [color_map.get(risk, '#95A5A6') for risk in risk_counts.index]
     
     ax[0].bar(risk_counts.index, risk_counts.values, color=bar_colors, edgecolor='black', linewidth=1.5)
@@ -356,19 +509,7 @@ def plot_risk_distribution(predictions_df):
             ax[0].text(i, v + 2, str(v), ha='center', fontweight='bold')
     
     # Department-wise risk
-    dept_col = 'Department' if 'Department' in predictions_df.columns else 'department'
-    if dept_col in predictions_df.columns:
-        risk_col = 'RiskLevel' if 'RiskLevel' in predictions_df.columns else 'risk_category'
-        dept_risk = predictions_df.groupby([dept_col, risk_col]).size().unstack(fill_value=0)
-        
-        # Ensure columns are in High, Medium, Low order
-        risk_order = ['High', 'Medium', 'Low']
-        dept_risk = dept_risk.reindex(columns=risk_order, fill_value=0)
-        
-        # Sort by total risk (sum of all risk levels) - highest to lowest
-        dept_risk['_total'] = dept_risk.sum(axis=1)
-        dept_risk = dept_risk.sort_values('_total', ascending=False).drop('_total', axis=1)
-        
+    if dept_risk is not None:
         # Vibrant, eye-catching colors for risk levels (High, Medium, Low)
         sharp_colors = ['#D32F2F', '#FFA000', '#00BCD4']  # Bright Red, Bright Amber, Bright Cyan
         
@@ -388,8 +529,110 @@ def plot_risk_distribution(predictions_df):
     plt.tight_layout()
     return fig
 
+def _draw_department_attrition(dept_attrition):
+    plt = pyplot()
+    fig, ax = plt.subplots(figsize=(12, 5), facecolor='white')
+    # Vibrant gradient: red to cyan based on attrition rate (high to low)
+    import matplotlib.colors as mcolors
+    
+    # Create a colormap from bright red (high attrition) to bright cyan (low attrition)
+    cmap = mcolors.LinearSegmentedColormap.from_list("attrition", ["#D32F2F", "#FFA000", "#00BCD4"])
+    colors = [cmap(i / len(dept_attrition)) for i in range(len(dept_attrition))]
+    
+    ax.barh(dept_attrition.index, dept_attrition.values, color=colors, edgecolor='#2C3E50', linewidth=1.5)
+    ax.set_xlabel('Attrition Rate (%)', fontsize=12, fontweight='bold')
+    ax.set_title('Attrition Rate by Department', fontsize=14, fontweight='bold')
+    ax.grid(axis='x', alpha=0.3)
+    
+    for i, (idx, val) in enumerate(dept_attrition.items()):
+        ax.text(val + 0.5, i, f'{val:.1f}%', va='center', fontweight='bold')
+    return fig
+
+def _draw_cash_flow(cashflows):
+    plt = pyplot()
+    years = np.arange(1, 6)
+    cumulative = np.cumsum(cashflows)
+    
+    fig, ax = plt.subplots(figsize=(12, 6), facecolor='white')
+    
+    ax.bar(years, cashflows, color='#2ecc71', alpha=0.7, label='Annual Net Benefit', edgecolor='black')
+    ax.plot(years, cumulative, color='#3498db', marker='o', linewidth=3, markersize=10, label='Cumulative Benefit')
+    ax.axhline(y=0, color='red', linestyle='--', linewidth=1)
+    ax.set_xlabel('Year', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Amount ($)', fontsize=12, fontweight='bold')
+    ax.set_title('5-Year Financial Projection', fontsize=14, fontweight='bold')
+    ax.legend()
+    ax.grid(axis='y', alpha=0.3)
+    
+    for i, (cf, cum) in enumerate(zip(cashflows, cumulative)):
+        ax.text(years[i], cf + 50000, f'${cf:,.0f}', ha='center', fontweight='bold')
+    return fig
+
+def _draw_roi_distribution(edges, counts, marks):
+    plt = pyplot()
+    fig, ax = plt.subplots(figsize=(8, 5), facecolor='white')
+    ax.hist(edges[:-1], bins=edges, weights=counts, color='#3498DB', alpha=0.7, edgecolor='black')
+    for value, label in zip(marks, ['P5', 'Median', 'P95']):
+        ax.axvline(value, color='#2C3E50', linestyle='--', linewidth=1.5)
+        ax.text(value, ax.get_ylim()[1] * 0.95, f' {label}', fontweight='bold')
+    if edges[0] < 0 < edges[-1]:
+        ax.axvline(0, color='red', linewidth=1)
+    ax.set_xlabel('5-Year Net Benefit ($)', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Scenarios', fontsize=12, fontweight='bold')
+    ax.set_title('Distribution of 5-Year Benefit', fontsize=14, fontweight='bold')
+    return fig
+
+def _draw_tornado(tornado, base_value):
+    plt = pyplot()
+    fig, ax = plt.subplots(figsize=(8, 5), facecolor='white')
+    rows = tornado.iloc[::-1]
+    positions = np.arange(len(rows))
+    ax.barh(positions, rows['Low'] - base_value, left=base_value, color='#e74c3c', alpha=0.7,
+            edgecolor='black', label='Input at low bound')
+    ax.barh(positions, rows['High'] - base_value, left=base_value, color='#2ecc71', alpha=0.7,
+            edgecolor='black', label='Input at high bound')
+    ax.axvline(base_value, color='#2C3E50', linewidth=1.5)
+    ax.set_yticks(positions)
+    ax.set_yticklabels(rows['Parameter'])
+    ax.set_xlabel('5-Year Net Benefit ($)', fontsize=12, fontweight='bold')
+    ax.set_title('Sensitivity (Tornado)', fontsize=14, fontweight='bold')
+    ax.legend(loc='lower right')
+    return fig
+
+def _draw_correlation_heatmap(corr_matrix):
+    import seaborn as sns
+    plt = pyplot()
+    fig, ax = plt.subplots(figsize=(12, 10))
+    sns.heatmap(corr_matrix, annot=False, cmap='coolwarm', center=0, ax=ax,
+               cbar_kws={'label': 'Correlation'})
+    ax.set_title('Feature Correlation Matrix', fontsize=14, fontweight='bold')
+    return fig
+
+def _draw_feature_distribution(feature, edges, counts, boxes):
+    plt = pyplot()
+    fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+    
+    # Histogram, drawn from the pre-binned counts
+    axes[0].hist(edges[:-1], bins=edges, weights=counts, color='#3498db', edgecolor='black', alpha=0.7)
+    axes[0].set_title(f'{feature} Distribution', fontsize=12, fontweight='bold')
+    axes[0].set_xlabel(feature)
+    axes[0].set_ylabel('Frequency')
+    axes[0].grid(axis='y', alpha=0.3)
+    
+    # Box plot by Attrition, from the precomputed five-number summaries
+    if boxes:
+        axes[1].bxp(boxes)
+        axes[1].set_title(f'{feature} by Attrition Status', fontsize=12, fontweight='bold')
+        axes[1].set_xlabel('Attrition')
+        axes[1].set_ylabel(feature)
+        axes[1].grid(True)
+    
+    plt.tight_layout()
+    return fig
+
 # Main App
 def main():
+    started = time.perf_counter()
     # Header
     st.markdown('<h1 class="main-header">🎯 Employee Attrition Prediction System</h1>', unsafe_allow_html=True)
     st.markdown("---")
@@ -424,10 +667,18 @@ def main():
             st.metric("Attrition Rate", f"{attrition_rate:.1f}%")
             st.metric("Model Accuracy", "93.0%")
     
+    try:
+        show_page(page)
+    finally:
+        # Header, sidebar, loaders and the page itself: what the user waits for on each rerun
+        METRICS.record('page', page, time.perf_counter() - started)
+    publish_metrics(page)
+
+def show_page(page):
+    """Load the shared data and render the selected page"""
     # Load data
     df = load_data()
-    model, scaler = load_model()
-    high_risk_df, predictions_df = load_predictions()
+    high_risk_df, predictions_df = load_predictions(predictions_version())
     
     if df is None:
         st.error("❌ Unable to load data. Please check if employee.csv exists in the project directory.")
@@ -437,7 +688,8 @@ def main():
     if page == "📊 Dashboard":
         show_dashboard(df, high_risk_df, predictions_df)
     elif page == "🔮 Single Prediction":
-        show_single_prediction(df, model, scaler)
+        # Only this page needs the model, so the sklearn unpickle waits until it's opened
+        show_single_prediction(df, load_model())
     elif page == "📈 Batch Analysis":
         show_batch_analysis(df, predictions_df)
     elif page == "🎯 High-Risk Employees":
@@ -449,6 +701,58 @@ def main():
     elif page == "ℹ️ About":
         show_about()
 
+@st.cache_resource
+def metrics_server():
+    """Start the /metrics endpoint once per process"""
+    try:
+        return serve_metrics(METRICS, int(METRICS_PORT), METRICS_HOST)
+    except OSError as exc:
+        # Another replica on this host already holds the port
+        print(f"⚠️ Metrics endpoint not started on {METRICS_HOST}:{METRICS_PORT}: {exc}")
+        return None
+
+def publish_metrics(page):
+    """Export the process metrics and show the debug panel when it is switched on"""
+    if METRICS_PORT:
+        metrics_server()
+    if METRICS_FILE:
+        write_metrics(METRICS, METRICS_FILE)
+    if DEBUG_PANEL or st.query_params.get('debug') == '1':
+        show_debug_panel(page)
+
+def show_debug_panel(page):
+    """Sidebar render timings and cache counters for this process, with Prometheus/JSON downloads"""
+    snapshot = METRICS.snapshot()
+    spans = pd.DataFrame(snapshot['spans'])
+    pages = spans[spans['kind'] == 'page']
+    functions = spans[spans['kind'] != 'page'].sort_values('p95_ms', ascending=False)
+    current = pages[pages['name'] == page].iloc[0]
+    
+    with st.sidebar:
+        st.markdown("---")
+        with st.expander("⏱️ Performance", expanded=True):
+            st.metric("This Render", f"{current['last_ms']:,.0f} ms",
+                      delta=f"{current['last_ms'] - current['p50_ms']:+,.0f} ms vs median", delta_color="inverse")
+            if current['count'] >= 5 and current['last_ms'] > 2 * current['p50_ms']:
+                st.warning(f"⚠️ {current['last_ms'] / current['p50_ms']:.1f}x slower than this page's median")
+            
+            columns = ['name', 'count', 'last_ms', 'p50_ms', 'p95_ms', 'max_ms']
+            st.caption("Pages")
+            st.dataframe(pages[columns].round(1), hide_index=True, use_container_width=True)
+            st.caption("Slowest Functions (p95)")
+            st.dataframe(functions[['kind'] + columns].head(15).round(1), hide_index=True, use_container_width=True)
+            st.caption("Cache Hits")
+            st.dataframe(pd.DataFrame(snapshot['caches']), hide_index=True, use_container_width=True)
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                st.download_button("📥 Prometheus", to_prometheus(snapshot), file_name="metrics.prom",
+                                   mime="text/plain", use_container_width=True)
+            with col2:
+                st.download_button("📥 JSON", to_json(snapshot), file_name="metrics.json",
+                                   mime="application/json", use_container_width=True)
+
+@METRICS.timed('view')
 def show_dashboard(df, high_risk_df, predictions_df):
     """Display the main dashboard"""
     st.header("📊 Executive Dashboard")
@@ -489,15 +793,14 @@ def show_dashboard(df, high_risk_df, predictions_df):
     
     with col1:
         st.subheader("📊 Attrition Distribution")
-        fig = plot_attrition_distribution(df)
-        st.pyplot(fig)
+        show_chart(plot_attrition_distribution(df))
     
     with col2:
         st.subheader("🎯 Risk Analysis")
         if predictions_df is not None and not predictions_df.empty:
-            fig = plot_risk_distribution(predictions_df)
-            if fig:
-                st.pyplot(fig)
+            chart = plot_risk_distribution(predictions_df)
+            if chart:
+                show_chart(chart)
         else:
             st.info("ℹ️ Risk analysis data not available. Please run the prediction model from the notebook first.")
     
@@ -509,38 +812,20 @@ def show_dashboard(df, high_risk_df, predictions_df):
     if dept_col in df.columns:
         attrition_col = 'Attrition' if 'Attrition' in df.columns else 'attrition'
         if df[attrition_col].dtype == 'object':
-            dept_attrition = df.groupby(dept_col)[attrition_col].apply(
-                lambda x: (x.str.lower() == 'yes').sum() / len(x) * 100
-            ).sort_values(ascending=False)
+            left = df[attrition_col].str.lower() == 'yes'
         else:
-            dept_attrition = df.groupby(dept_col)[attrition_col].apply(
-                lambda x: (x == 1).sum() / len(x) * 100
-            ).sort_values(ascending=False)
-        
-        fig, ax = plt.subplots(figsize=(12, 5), facecolor='white')
-        # Vibrant gradient: red to cyan based on attrition rate (high to low)
-        import matplotlib.cm as cm
-        import matplotlib.colors as mcolors
-        
-        # Create a colormap from bright red (high attrition) to bright cyan (low attrition)
-        cmap = mcolors.LinearSegmentedColormap.from_list("attrition", ["#D32F2F", "#FFA000", "#00BCD4"])
-        colors = [cmap(i / len(dept_attrition)) for i in range(len(dept_attrition))]
-        
-        bars = ax.barh(dept_attrition.index, dept_attrition.values, color=colors, edgecolor='#2C3E50', linewidth=1.5)
-        ax.set_xlabel('Attrition Rate (%)', fontsize=12, fontweight='bold')
-        ax.set_title('Attrition Rate by Department', fontsize=14, fontweight='bold')
-        ax.grid(axis='x', alpha=0.3)
-        
-        for i, (idx, val) in enumerate(dept_attrition.items()):
-            ax.text(val + 0.5, i, f'{val:.1f}%', va='center', fontweight='bold')
+            left = df[attrition_col] == 1
+        # One vectorized mean per department instead of a Python call per group
+        dept_attrition = (left.groupby(df[dept_col], observed=True).mean() * 100).sort_values(ascending=False)
         
-        st.pyplot(fig)
+        show_chart(figure_cache().render(_draw_department_attrition, dept_attrition))
 
-def show_single_prediction(df, model, scaler):
+@METRICS.timed('view')
+def show_single_prediction(df, scorer):
     """Single employee attrition prediction"""
     st.header("🔮 Single Employee Prediction")
     
-    if model is None or scaler is None:
+    if scorer is None:
         st.warning("⚠️ Model not found. Please train the model first using the Jupyter notebook.")
         st.info("""
         ### 📝 Steps to train the model:
@@ -562,8 +847,8 @@ def show_single_prediction(df, model, scaler):
         
     with col2:
         distance_from_home = st.number_input("Distance from Home (km)", min_value=0, max_value=50, value=10)
-        job_satisfaction = st.selectbox("Job Satisfaction", [1, 2, 3, 4], format_func=lambda x: f"Level {x}")
-        environment_satisfaction = st.selectbox("Environment Satisfaction", [1, 2, 3, 4], format_func=lambda x: f"Level {x}")
+        job_satisfaction = st.selectbox("Job Satisfaction", [1, 2, 3, 4, 5], format_func=lambda x: f"Level {x}")
+        environment_satisfaction = st.selectbox("Environment Satisfaction", [1, 2, 3, 4, 5], format_func=lambda x: f"Level {x}")
         
     with col3:
         # Get department column (handle both cases)
@@ -576,25 +861,34 @@ def show_single_prediction(df, model, scaler):
         job_roles = sorted(df[role_col].unique()) if role_col in df.columns else ['Manager', 'Executive', 'Analyst', 'Engineer', 'Director']
         job_role = st.selectbox("Job Role", job_roles)
         
-        overtime = st.selectbox("Overtime", ['Yes', 'No'])
+        overtime_hours = st.number_input("Overtime Hours (monthly)", min_value=0.0, max_value=80.0, value=5.0, step=0.5)
     
     if st.button("🎯 Predict Attrition Risk", type="primary", use_container_width=True):
-        # Prepare input data (simplified - you'll need to match your actual feature engineering)
+        # Fields not on the form default to the typical employee in the dataset
         input_data = {
-            'Age': age,
-            'MonthlyIncome': monthly_income,
-            'YearsAtCompany': years_at_company,
-            'DistanceFromHome': distance_from_home,
-            'JobSatisfaction': job_satisfaction,
-            'EnvironmentSatisfaction': environment_satisfaction,
-            'OverTime': 1 if overtime == 'Yes' else 0
+            'age': age,
+            'base_salary': monthly_income * 12,
+            'tenure_years': years_at_company,
+            'commute_distance': distance_from_home,
+            'job_satisfaction': job_satisfaction,
+            'environment_satisfaction': environment_satisfaction,
+            'department': department,
+            'job_role': job_role,
+            'overtime_hours': overtime_hours
         }
         
         st.markdown("---")
         st.subheader("📊 Prediction Result")
         
-        # Display placeholder prediction (implement actual prediction logic)
-        risk_score = np.random.uniform(0.3, 0.9)  # Placeholder
+        try:
+            # Through the shared pool, so concurrent sessions' requests are batched together
+            risk_score = load_scoring_pool().score_one(input_data, timeout=30)
+        except PoolBusy:
+            st.error("❌ The scoring queue is full. Please try again in a moment.")
+            return
+        except ValueError as exc:
+            st.error(f"❌ Invalid employee details: {exc}")
+            return
         
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -631,6 +925,7 @@ def show_single_prediction(df, model, scaler):
             - 🔄 Consider role adjustments if applicable
             """)
 
+@METRICS.timed('view')
 def show_batch_analysis(df, predictions_df):
     """Batch prediction analysis"""
     st.header("📈 Batch Analysis")
@@ -666,41 +961,32 @@ def show_batch_analysis(df, predictions_df):
         st.subheader("📋 Prediction Results")
         
         # Filter options
+        index = load_filter_index(predictions_version())
+        filters = {}
         col1, col2 = st.columns(2)
         with col1:
             risk_col = 'RiskLevel' if 'RiskLevel' in predictions_df.columns else 'risk_category'
             if risk_col in predictions_df.columns:
-                risk_filter = st.multiselect("Filter by Risk Level", 
-                                            options=predictions_df[risk_col].unique(),
-                                            default=predictions_df[risk_col].unique())
+                filters[risk_col] = st.multiselect("Filter by Risk Level", 
+                                                   options=index.values(risk_col),
+                                                   default=index.values(risk_col))
         with col2:
             dept_col = 'Department' if 'Department' in predictions_df.columns else 'department'
             if dept_col in predictions_df.columns:
-                dept_filter = st.multiselect("Filter by Department",
-                                            options=predictions_df[dept_col].unique(),
-                                            default=predictions_df[dept_col].unique())
+                filters[dept_col] = st.multiselect("Filter by Department",
+                                                   options=index.values(dept_col),
+                                                   default=index.values(dept_col))
         
-        # Apply filters
-        filtered_df = predictions_df.copy()
-        risk_col = 'RiskLevel' if 'RiskLevel' in predictions_df.columns else 'risk_category'
-        if risk_col in predictions_df.columns and 'risk_filter' in locals() and risk_filter:
-            filtered_df = filtered_df[filtered_df[risk_col].isin(risk_filter)]
-        dept_col = 'Department' if 'Department' in predictions_df.columns else 'department'
-        if dept_col in predictions_df.columns and 'dept_filter' in locals() and dept_filter:
-            filtered_df = filtered_df[filtered_df[dept_col].isin(dept_filter)]
+        # Apply filters through the precomputed bitmaps
+        filtered_df = index.filter(filters)
         
         # Display data
         st.dataframe(filtered_df, use_container_width=True, height=400)
         
         # Download button
-        csv = filtered_df.to_csv(index=False)
-        st.download_button(
-            label="📥 Download Filtered Results",
-            data=csv,
-            file_name=f"attrition_predictions_{datetime.now().strftime('%Y%m%d')}.csv",
-            mime="text/csv",
-            use_container_width=True
-        )
+        offer_download("Download Filtered Results", filtered_df,
+                       ('attritionprediction.csv', predictions_version(), filter_key(filters)),
+                       'attrition_predictions')
     else:
         st.info("""
         ### 📝 No batch predictions available
@@ -711,7 +997,52 @@ def show_batch_analysis(df, predictions_df):
         3. Predictions will be saved to `attritionprediction.csv`
         4. Refresh this page
         """)
+    
+    show_file_scoring()
 
+@METRICS.timed('view')
+def show_file_scoring():
+    """Score an uploaded employee file through the shared scoring pool"""
+    st.markdown("---")
+    st.subheader("🧮 Score an Employee File")
+    pool = load_scoring_pool()
+    if pool is None:
+        st.info("ℹ️ Train the model first to score uploaded files.")
+        return
+    uploaded = st.file_uploader("Employee CSV with the same columns as employee.csv", type=['csv'])
+    if uploaded is not None and st.button("🎯 Score File", type="primary"):
+        frame = read_upload(uploaded.getvalue())
+        with st.spinner(f"Scoring {len(frame):,} employees..."):
+            try:
+                # Scored in chunks behind other sessions' single predictions
+                probabilities = pool.score_bulk(frame)
+            except PoolBusy:
+                st.error("❌ The scoring queue is full. Please try again in a moment.")
+                return
+            except ValueError as exc:
+                st.error(f"❌ Could not score this file: {exc}")
+                return
+        scored = pd.DataFrame({'attrition_risk_score': probabilities,
+                               'risk_category': risk_category(probabilities)})
+        if 'employee_id' in frame.columns:
+            scored.insert(0, 'employee_id', frame['employee_id'].to_numpy())
+        st.session_state['scored_upload'] = (uploaded.file_id, scored)
+    
+    result = st.session_state.get('scored_upload')
+    if result is not None:
+        file_id, scored = result
+        counts = scored['risk_category'].value_counts()
+        st.success(f"✅ Scored {len(scored):,} employees: {counts.get('High', 0):,} high, "
+                   f"{counts.get('Medium', 0):,} medium, {counts.get('Low', 0):,} low risk")
+        st.dataframe(scored.head(1000), use_container_width=True, height=300)
+        offer_download("Download Scores", scored, ('upload', file_id), 'uploaded_scores')
+
+@METRICS.cached(st.cache_data(show_spinner=False, max_entries=4))
+def read_upload(data):
+    """Parse an uploaded CSV once per distinct file"""
+    return pd.read_csv(io.BytesIO(data))
+
+@METRICS.timed('view')
 def show_high_risk_employees(predictions_df):
     """Display high-risk employees"""
     st.header("🎯 High-Risk Employees")
@@ -742,51 +1073,71 @@ def show_high_risk_employees(predictions_df):
         st.markdown("---")
         
         # Filters
+        index = load_filter_index(predictions_version())
+        filters = {}
+        min_prob = None
         col1, col2, col3 = st.columns(3)
         
         with col1:
             risk_col = 'RiskLevel' if 'RiskLevel' in predictions_df.columns else 'risk_category'
             all_risks = ['High', 'Medium', 'Low']
-            available_risks = [r for r in all_risks if r in predictions_df[risk_col].values]
-            risk_filter = st.multiselect("Risk Level", 
-                                        options=available_risks,
-                                        default=['High'])
+            available_risks = [r for r in all_risks if r in index.values(risk_col)]
+            filters[risk_col] = st.multiselect("Risk Level", 
+                                               options=available_risks,
+                                               default=['High'])
         
         with col2:
             dept_col = 'Department' if 'Department' in predictions_df.columns else 'department'
             if dept_col in predictions_df.columns:
-                dept_filter = st.multiselect("Department",
-                                            options=sorted(predictions_df[dept_col].unique()),
-                                            default=sorted(predictions_df[dept_col].unique()))
+                # key=str so a missing department (NaN) sorts alongside the labels instead of raising
+                departments = sorted(index.values(dept_col), key=str)
+                filters[dept_col] = st.multiselect("Department",
+                                                   options=departments,
+                                                   default=departments)
         
         with col3:
             prob_col = 'Attrition_Probability' if 'Attrition_Probability' in predictions_df.columns else 'attrition_risk_score'
             if prob_col in predictions_df.columns:
                 min_prob = st.slider("Min Risk Score", 0.0, 1.0, 0.5)
         
-        # Apply filters
-        filtered_df = predictions_df.copy()
-        risk_col = 'RiskLevel' if 'RiskLevel' in predictions_df.columns else 'risk_category'
-        if risk_filter:
-            filtered_df = filtered_df[filtered_df[risk_col].isin(risk_filter)]
-        dept_col = 'Department' if 'Department' in predictions_df.columns else 'department'
-        if dept_col in predictions_df.columns and 'dept_filter' in locals() and dept_filter:
-            filtered_df = filtered_df[filtered_df[dept_col].isin(dept_filter)]
-        prob_col = 'Attrition_Probability' if 'Attrition_Probability' in predictions_df.columns else 'attrition_risk_score'
-        if prob_col in predictions_df.columns and 'min_prob' in locals():
-            filtered_df = filtered_df[filtered_df[prob_col] >= min_prob]
+        # Apply filters: bitmap lookups plus a binary search on the sorted scores
+        filtered_df = index.filter(filters, min_score=min_prob)
         
         st.dataframe(filtered_df, use_container_width=True, height=400)
         
         # Download
-        csv = filtered_df.to_csv(index=False)
-        st.download_button(
-            label="📥 Download High-Risk List",
-            data=csv,
-            file_name=f"high_risk_employees_{datetime.now().strftime('%Y%m%d')}.csv",
-            mime="text/csv",
-            use_container_width=True
-        )
+        offer_download("Download High-Risk List", filtered_df,
+                       ('attritionprediction.csv', predictions_version(), filter_key(filters, min_prob)),
+                       'high_risk_employees')
+        
+        # Per-employee drivers from the precomputed SHAP store
+        st.markdown("---")
+        st.subheader("🔍 Top Risk Drivers")
+        version = employee_version()
+        shap_values = load_shap_store(version)
+        features = load_feature_store(version) if version else None
+        if shap_values is None and features is None:
+            st.info("ℹ️ Run `python shap_store.py` to precompute per-employee risk drivers.")
+        elif 'employee_id' in filtered_df.columns and not filtered_df.empty:
+            prob_col = 'Attrition_Probability' if 'Attrition_Probability' in filtered_df.columns else 'attrition_risk_score'
+            candidates = filtered_df.sort_values(prob_col, ascending=False) if prob_col in filtered_df.columns else filtered_df
+            employee_id = st.selectbox("Employee ID", candidates['employee_id'].head(1000).tolist())
+            if shap_values is not None:
+                drivers = shap_values.top_drivers(employee_id, n=5)
+                if drivers is None:
+                    st.warning(f"⚠️ No SHAP values stored for employee {employee_id}. Rerun `python shap_store.py`.")
+                else:
+                    st.dataframe(drivers, use_container_width=True, hide_index=True)
+                    st.caption("Impact on the model's log-odds of attrition, relative to the average employee.")
+            else:
+                # Without SHAP values, the scaled features still show what sets this employee apart
+                standouts = features.standouts(employee_id, n=5)
+                if standouts is None:
+                    st.warning(f"⚠️ Employee {employee_id} is not in the feature store. Rerun `python feature_store.py`.")
+                else:
+                    st.dataframe(standouts, use_container_width=True, hide_index=True)
+                    st.caption("Model inputs furthest from the training average. "
+                               "Run `python shap_store.py --features` for per-employee risk drivers.")
         
         # Action plan
         st.markdown("---")
@@ -815,6 +1166,7 @@ def show_high_risk_employees(predictions_df):
         Run the prediction model in the Jupyter notebook to identify high-risk employees.
         """)
 
+@METRICS.timed('view')
 def show_roi_calculator():
     """ROI Calculator"""
     st.header("💰 ROI Calculator")
@@ -844,34 +1196,27 @@ def show_roi_calculator():
         st.subheader("📈 ROI Analysis")
         
         # Calculations
-        annual_attrition_count = int(total_employees * current_attrition_rate / 100)
-        replacement_cost = avg_salary * replacement_cost_multiplier
-        productivity_loss = avg_salary * 0.5  # 50% of salary as productivity loss
-        total_cost_per_employee = replacement_cost + productivity_loss
-        
-        annual_attrition_cost = annual_attrition_count * total_cost_per_employee
-        
-        # ML Impact
-        identifiable_rate = model_accuracy / 100
-        identified_employees = annual_attrition_count * identifiable_rate
-        retained_employees = identified_employees * (retention_success_rate / 100)
-        cost_savings = retained_employees * total_cost_per_employee
-        
-        # Year 1
-        year1_net = cost_savings - implementation_cost - annual_maintenance
-        
-        # Year 2-5
-        annual_net = cost_savings - annual_maintenance
-        
-        # 5-year totals
-        five_year_total = year1_net + (annual_net * 4)
-        five_year_roi = (five_year_total / (implementation_cost + annual_maintenance * 5)) * 100
-        
-        # Payback period
-        if year1_net > 0:
-            payback_period = 1.0
-        else:
-            payback_period = implementation_cost / annual_net if annual_net > 0 else float('inf')
+        inputs = {
+            'total_employees': total_employees,
+            'avg_salary': avg_salary,
+            'attrition_rate': current_attrition_rate,
+            'replacement_multiplier': replacement_cost_multiplier,
+            'model_accuracy': model_accuracy,
+            'success_rate': retention_success_rate,
+            'implementation_cost': implementation_cost,
+            'annual_maintenance': annual_maintenance,
+        }
+        result = roi.scenario(**inputs)
+        annual_attrition_cost = result['attrition_cost']
+        total_cost_per_employee = result['cost_per_attrition']
+        identified_employees = result['identified']
+        retained_employees = result['retained']
+        cost_savings = result['savings']
+        year1_net = result['year1_net']
+        annual_net = result['annual_net']
+        five_year_total = result['total_net']
+        five_year_roi = result['roi']
+        payback_period = result['payback_years']
         
         # Display results
         st.metric("💰 Annual Attrition Cost", f"${annual_attrition_cost:,.0f}")
@@ -904,27 +1249,41 @@ def show_roi_calculator():
     st.markdown("---")
     st.subheader("📊 5-Year Cash Flow Projection")
     
-    years = np.arange(1, 6)
     # Year 1 has implementation cost, Years 2-5 only have maintenance
     cashflows = [year1_net, annual_net, annual_net, annual_net, annual_net]
-    cumulative = np.cumsum(cashflows)
+    show_chart(figure_cache().render(_draw_cash_flow, cashflows))
     
-    fig, ax = plt.subplots(figsize=(12, 6), facecolor='white')
-    
-    ax.bar(years, cashflows, color='#2ecc71', alpha=0.7, label='Annual Net Benefit', edgecolor='black')
-    ax.plot(years, cumulative, color='#3498db', marker='o', linewidth=3, markersize=10, label='Cumulative Benefit')
-    ax.axhline(y=0, color='red', linestyle='--', linewidth=1)
-    ax.set_xlabel('Year', fontsize=12, fontweight='bold')
-    ax.set_ylabel('Amount ($)', fontsize=12, fontweight='bold')
-    ax.set_title('5-Year Financial Projection', fontsize=14, fontweight='bold')
-    ax.legend()
-    ax.grid(axis='y', alpha=0.3)
+    # Uncertainty
+    st.markdown("---")
+    st.subheader("🎲 Uncertainty Analysis")
+    st.markdown("How the 5-year benefit moves when the assumptions above are only known approximately.")
     
-    for i, (cf, cum) in enumerate(zip(cashflows, cumulative)):
-        ax.text(years[i], cf + 50000, f'${cf:,.0f}', ha='center', fontweight='bold')
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        spread = st.slider("Assumption uncertainty (±%)", 0, 50, 20, 5) / 100
+        n_scenarios = st.select_slider("Scenarios", options=[10_000, 100_000, 1_000_000], value=100_000)
+    uncertainty = {name: spread for name in UNCERTAIN_INPUTS}
+    outcome = simulate_roi(tuple(inputs.items()), spread, n_scenarios)
+    with col2:
+        col_a, col_b, col_c, col_d = st.columns(4)
+        with col_a:
+            st.metric("P5 Benefit", f"${outcome['p5']:,.0f}")
+        with col_b:
+            st.metric("Median Benefit", f"${outcome['p50']:,.0f}")
+        with col_c:
+            st.metric("P95 Benefit", f"${outcome['p95']:,.0f}")
+        with col_d:
+            st.metric("Chance of Positive ROI", f"{outcome['positive']:.0%}")
     
-    st.pyplot(fig)
+    col1, col2 = st.columns(2)
+    with col1:
+        show_chart(figure_cache().render(_draw_roi_distribution, outcome['edges'], outcome['counts'],
+                                         [outcome['p5'], outcome['p50'], outcome['p95']]))
+    with col2:
+        tornado = roi.sensitivity(inputs, uncertainty)
+        show_chart(figure_cache().render(_draw_tornado, tornado, five_year_total))
 
+@METRICS.timed('view')
 def show_data_explorer(df):
     """Data explorer"""
     st.header("📋 Data Explorer")
@@ -940,10 +1299,11 @@ def show_data_explorer(df):
     with col2:
         st.metric("Features", len(feature_cols))
     with col3:
-        numeric_features = [col for col in feature_cols if df[col].dtype in ['int64', 'float64']]
+        numeric_features = [col for col in feature_cols if pd.api.types.is_numeric_dtype(df[col])]
         st.metric("Numeric Features", len(numeric_features))
     with col4:
-        categorical_features = [col for col in feature_cols if df[col].dtype == 'object']
+        categorical_features = [col for col in feature_cols
+                                if df[col].dtype == 'object' or isinstance(df[col].dtype, pd.CategoricalDtype)]
         st.metric("Categorical Features", len(categorical_features))
     
     st.markdown("---")
@@ -976,50 +1336,44 @@ def show_data_explorer(df):
         st.dataframe(display_df, use_container_width=True)
         
         # Download
-        csv = df.to_csv(index=False)
-        st.download_button(
-            label="📥 Download Full Dataset",
-            data=csv,
-            file_name=f"employee_data_{datetime.now().strftime('%Y%m%d')}.csv",
-            mime="text/csv"
-        )
+        offer_download("Download Full Dataset", df, ('employee.csv', file_version('employee.csv')), 'employee_data')
     
     with tab2:
         st.subheader("Statistical Summary")
-        st.dataframe(df.describe(), use_container_width=True)
+        summary = load_summary(employee_version())
+        st.dataframe(summary.describe(), use_container_width=True)
+        st.caption("Quartiles are estimated from a quantile sketch; the other statistics are exact.")
         
         st.markdown("#### Missing Values")
-        missing = df.isnull().sum()
+        missing = summary.missing()
         missing_df = pd.DataFrame({'Feature': missing.index, 'Missing Count': missing.values, 
-                                  'Missing %': (missing.values / len(df) * 100).round(2)})
+                                  'Missing %': (missing.values / summary.rows * 100).round(2)})
         missing_df = missing_df[missing_df['Missing Count'] > 0]
         
         if not missing_df.empty:
             st.dataframe(missing_df, use_container_width=True)
         else:
             st.success("✅ No missing values in the dataset!")
+        
+        st.markdown("#### Memory Footprint")
+        memory = load_memory_report(employee_version())
+        before, after = memory['Before (MB)'].sum(), memory['After (MB)'].sum()
+        st.caption(f"Loaded with compact dtypes: {after:,.1f} MB instead of {before:,.1f} MB "
+                   f"({before / max(after, 1e-9):.1f}x smaller)")
+        st.dataframe(memory.round(2), use_container_width=True)
     
     with tab3:
         st.subheader("Feature Correlations")
         
-        numeric_df = df.select_dtypes(include=[np.number])
-        if not numeric_df.empty:
-            corr_matrix = numeric_df.corr()
-            
-            fig, ax = plt.subplots(figsize=(12, 10))
-            sns.heatmap(corr_matrix, annot=False, cmap='coolwarm', center=0, ax=ax,
-                       cbar_kws={'label': 'Correlation'})
-            ax.set_title('Feature Correlation Matrix', fontsize=14, fontweight='bold')
-            st.pyplot(fig)
+        corr = load_correlations(employee_version())
+        if not corr.empty:
+            # The derived target column is only used for the rankings below
+            corr_matrix = corr.drop(index='Attrition_Numeric', columns='Attrition_Numeric', errors='ignore')
+            show_chart(figure_cache().render(_draw_correlation_heatmap, corr_matrix))
             
             # Top correlations with Attrition
             if 'Attrition' in df.columns:
-                # Convert Attrition to numeric
-                df_temp = df.copy()
-                df_temp['Attrition_Numeric'] = (df_temp['Attrition'] == 'Yes').astype(int)
-                
-                correlations = df_temp.select_dtypes(include=[np.number]).corr()['Attrition_Numeric'].sort_values(ascending=False)
-                correlations = correlations[correlations.index != 'Attrition_Numeric']
+                correlations = target_correlations(corr, exclude=['Attrition', 'attrition'])
                 
                 st.markdown("#### 🎯 Top Features Correlated with Attrition")
                 
@@ -1034,30 +1388,17 @@ def show_data_explorer(df):
     with tab4:
         st.subheader("Feature Distributions")
         
-        numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+        histograms = load_histograms(employee_version())
+        numeric_cols = list(histograms.features)
         
         if numeric_cols:
             selected_feature = st.selectbox("Select Feature to Visualize", numeric_cols)
             
-            fig, axes = plt.subplots(1, 2, figsize=(14, 5))
-            
-            # Histogram
-            axes[0].hist(df[selected_feature].dropna(), bins=30, color='#3498db', edgecolor='black', alpha=0.7)
-            axes[0].set_title(f'{selected_feature} Distribution', fontsize=12, fontweight='bold')
-            axes[0].set_xlabel(selected_feature)
-            axes[0].set_ylabel('Frequency')
-            axes[0].grid(axis='y', alpha=0.3)
-            
-            # Box plot by Attrition
-            if 'Attrition' in df.columns:
-                df.boxplot(column=selected_feature, by='Attrition', ax=axes[1])
-                axes[1].set_title(f'{selected_feature} by Attrition Status', fontsize=12, fontweight='bold')
-                axes[1].set_xlabel('Attrition')
-                axes[1].set_ylabel(selected_feature)
-            
-            plt.tight_layout()
-            st.pyplot(fig)
+            histogram = histograms[selected_feature]
+            show_chart(figure_cache().render(_draw_feature_distribution, selected_feature, histogram.edges,
+                                             histogram.counts, histogram.boxes))
 
+@METRICS.timed('view')
 def show_about():
     """About page"""
     st.header("ℹ️ About This Application")
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Batch Attrition Scoring
+Streams employee.csv in fixed-size chunks, scores the chunks on a process pool
+and writes attritionprediction.csv and high_risk.csv without a notebook kernel.
+
+Usage:
+    python batch_score.py --input employee.csv --chunksize 100000 --workers 4
+    python batch_score.py --incremental   # only rescore new or changed employees
+    python batch_score.py --features   # score from the matrix built by feature_store.py
+"""
+
+import argparse
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from employee_store import EmployeeStore
+from scoring import AttritionScorer, CATEGORICAL_COLUMNS, MODEL_DIR, risk_category
+
+OUTPUT_COLUMNS = ['employee_id', 'attrition_risk_score', 'risk_category', 'prediction_date']
+
+# Only these columns are needed to reproduce the notebook's encoders and thresholds
+REFERENCE_COLUMNS = CATEGORICAL_COLUMNS + ['salary_hike_pct', 'overtime_hours']
+
+_scorer = None
+_features = None
+
+
+def read_reference_columns(path, chunksize):
+    """The columns the reference statistics come from, read in one narrow pass over the CSV"""
+    header = pd.read_csv(path, nrows=0).columns
+    usecols = [c for c in REFERENCE_COLUMNS if c in header]
+    # Categoricals cost one byte per row and each threshold column eight, so the
+    # exact median/quantile fits in memory even for millions of rows
+    dtypes = {c: 'category' for c in CATEGORICAL_COLUMNS if c in usecols}
+    dtypes.update({c: np.float64 for c in usecols if c not in dtypes})
+    parts = list(pd.read_csv(path, usecols=usecols, dtype=dtypes, chunksize=chunksize))
+    if not parts:
+        return None
+    # Chunks may see different category sets, which concat widens to object
+    reference = pd.concat(parts, ignore_index=True)
+    for col in CATEGORICAL_COLUMNS:
+        if col in usecols:
+            reference[col] = reference[col].astype('category')
+    return reference
+
+
+def fit_reference_streaming(scorer, path, chunksize):
+    """Fit the scorer's reference statistics in one narrow pass over the CSV"""
+    if scorer.trained_reference:
+        # Saved with the model by train.py; nothing to learn from the data
+        return scorer
+    reference = read_reference_columns(path, chunksize)
+    return scorer if reference is None else scorer.fit_reference(reference)
+
+
+def covers_labels(reference, frame):
+    """Whether every category label in `frame` already has a code in `reference`"""
+    for col, vocab in reference['vocabularies'].items():
+        if frame is not None and col in frame.columns:
+            values = frame[col]
+            labels = values.cat.categories if isinstance(values.dtype, pd.CategoricalDtype) else values.unique()
+            if any(str(label) not in vocab for label in labels):
+                return False
+    return True
+
+
+def digest_path(predictions_path):
+    """Row-digest file kept next to a predictions CSV"""
+    return os.path.splitext(predictions_path)[0] + '.digest.npz'
+
+
+def row_digests(chunk, columns):
+    """64-bit hash of each row's model inputs"""
+    # Numbers hash as float64 so a chunk inferred as int and one as float agree
+    normalized = pd.DataFrame({
+        c: chunk[c].astype(np.float64) if pd.api.types.is_numeric_dtype(chunk[c]) else chunk[c].astype(str)
+        for c in columns
+    })
+    return pd.util.hash_pandas_object(normalized, index=False).to_numpy()
+
+
+class PreviousRun:
+    """Scores and row digests from the last run, looked up by employee_id"""
+
+    def __init__(self, predictions, digests):
+        self.predictions = predictions
+        self.digests = digests
+        self.store = EmployeeStore(predictions)
+
+    @staticmethod
+    def reference(predictions_path, model_stamp):
+        """Reference statistics the last run scored with, or None if missing or from another model"""
+        path = digest_path(predictions_path)
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            if 'reference' not in data.files or str(data['model_stamp']) != model_stamp:
+                return None
+            return json.loads(str(data['reference']))
+
+    @classmethod
+    def load(cls, predictions_path, fingerprint):
+        """The last run's results, or None if missing or scored with a different model/reference"""
+        path = digest_path(predictions_path)
+        if not (os.path.exists(path) and os.path.exists(predictions_path)):
+            return None
+        with np.load(path) as data:
+            if str(data['fingerprint']) != fingerprint:
+                return None
+            ids, digests = data['employee_id'], data['digest']
+        predictions = pd.read_csv(predictions_path, usecols=OUTPUT_COLUMNS)[OUTPUT_COLUMNS]
+        # Digests are written in the same row order as the predictions they belong to
+        if not len(ids) or not np.array_equal(predictions['employee_id'].to_numpy(), ids):
+            return None
+        return cls(predictions, digests)
+
+    def reusable(self, ids, digests):
+        """Previous row for each ID whose inputs are unchanged; -1 where it must be rescored"""
+        positions = self.store.locate(ids)
+        unchanged = (positions >= 0) & (self.digests[positions] == digests)
+        return np.where(unchanged, positions, -1)
+
+
+def _init_worker(scorer, features_path=None):
+    """Keep one scorer (and a mapping of the feature store) per worker process"""
+    global _scorer, _features
+    _scorer = scorer
+    _features = None if features_path is None else np.load(features_path, mmap_mode='r')
+
+
+def _score_chunk(chunk, prediction_date):
+    """Score one chunk and return the prediction columns"""
+    probabilities = _scorer.predict_proba(chunk)
+    return pd.DataFrame({
+        'employee_id': chunk['employee_id'].to_numpy(),
+        'attrition_risk_score': probabilities,
+        'risk_category': risk_category(probabilities),
+        'prediction_date': prediction_date
+    }, columns=OUTPUT_COLUMNS)
+
+
+def _score_rows(ids, start, prediction_date):
+    """Score rows [start, start + len(ids)) of the mapped feature store"""
+    probabilities = _scorer.predict_scaled(np.asarray(_features[start:start + len(ids)]))
+    return pd.DataFrame({
+        'employee_id': ids,
+        'attrition_risk_score': probabilities,
+        'risk_category': risk_category(probabilities),
+        'prediction_date': prediction_date
+    }, columns=OUTPUT_COLUMNS)
+
+
+def _merge(previous, reuse, scored):
+    """Interleave carried-forward and freshly scored rows back into input order"""
+    keep = reuse >= 0
+    if scored is None:
+        return previous.predictions.take(reuse).reset_index(drop=True)
+    if not keep.any():
+        return scored
+    carried = previous.predictions.take(reuse[keep]).set_axis(np.flatnonzero(keep))
+    return pd.concat([carried, scored.set_axis(np.flatnonzero(~keep))]).sort_index().reset_index(drop=True)
+
+
+def _write(result, predictions_path, high_risk_path, first):
+    """Append one scored chunk to the prediction and high-risk files"""
+    mode = 'w' if first else 'a'
+    result.to_csv(predictions_path, mode=mode, header=first, index=False, float_format='%.6f')
+    high = result[result['risk_category'] == 'High']
+    high.to_csv(high_risk_path, mode=mode, header=first, index=False, float_format='%.6f')
+    return len(high)
+
+
+def _scored_chunks(chunks, scorer, workers, prediction_date, previous, columns):
+    """Yield (result, ids, digests, rows rescored) per chunk, in input order"""
+    def plan(chunk):
+        digests = row_digests(chunk, columns)
+        ids = chunk['employee_id'].to_numpy()
+        if previous is None:
+            return ids, digests, np.full(len(chunk), -1), chunk
+        reuse = previous.reusable(ids, digests)
+        changed = reuse < 0
+        return ids, digests, reuse, chunk[changed] if changed.any() else None
+
+    def finish(ids, digests, reuse, scored):
+        result = scored if previous is None else _merge(previous, reuse, scored)
+        return result, ids, digests, 0 if scored is None else len(scored)
+
+    if workers == 1:
+        _init_worker(scorer)
+        for chunk in chunks:
+            ids, digests, reuse, todo = plan(chunk)
+            scored = None if todo is None else _score_chunk(todo, prediction_date)
+            yield finish(ids, digests, reuse, scored)
+        return
+
+    # At most two chunks per worker are in flight, which bounds memory
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(scorer,)) as pool:
+        pending = deque()
+        for chunk in chunks:
+            ids, digests, reuse, todo = plan(chunk)
+            future = None if todo is None else pool.submit(_score_chunk, todo, prediction_date)
+            pending.append((ids, digests, reuse, future))
+            if len(pending) >= 2 * workers:
+                ids, digests, reuse, future = pending.popleft()
+                yield finish(ids, digests, reuse, future and future.result())
+        while pending:
+            ids, digests, reuse, future = pending.popleft()
+            yield finish(ids, digests, reuse, future and future.result())
+
+
+def score_file(input_path='employee.csv', output_dir='.', model_dir=MODEL_DIR,
+               chunksize=100_000, workers=None, prediction_date=None, incremental=False, features=None):
+    """Score an employee CSV chunk by chunk; returns (rows written, high-risk rows, rows scored)
+
+    With `incremental`, employees whose inputs hash the same as in the last run
+    keep their previous prediction and only new or changed rows are scored. Carried
+    rows keep their `prediction_date`, which is therefore the date each employee was
+    last scored. The last run's reference statistics are reused (unless the model
+    changed or new category labels appear), so ordinary data edits don't force a
+    full rescore.
+    With `features` (an open FeatureStore built from `input_path`), rows are
+    scored straight from its scaled matrix instead of parsing and transforming the CSV.
+    """
+    prediction_date = prediction_date or datetime.now().strftime('%Y-%m-%d')
+    workers = workers or os.cpu_count() or 1
+    os.makedirs(output_dir, exist_ok=True)
+    predictions_path = os.path.join(output_dir, 'attritionprediction.csv')
+    high_risk_path = os.path.join(output_dir, 'high_risk.csv')
+
+    scorer = AttritionScorer(model_dir)
+    if not scorer.trained_reference:
+        reference_frame = read_reference_columns(input_path, chunksize)
+        previous_reference = PreviousRun.reference(predictions_path, scorer.model_stamp) if incremental else None
+        if previous_reference is not None and covers_labels(previous_reference, reference_frame):
+            # Refitting would move the hike median and overtime quartile with every data
+            # edit, changing the fingerprint and forcing a full rescore
+            scorer.set_reference(previous_reference)
+        elif reference_frame is not None:
+            scorer.fit_reference(reference_frame)
+    header = pd.read_csv(input_path, nrows=0).columns
+    columns = [c for c in scorer.base_features if c in header]
+    # The column set changes which inputs fall back to defaults, so it is part of the key
+    fingerprint = f'{scorer.fingerprint()}:{",".join(columns)}'
+    if features is not None:
+        if incremental:
+            raise ValueError('Incremental scoring needs the raw rows; it cannot read a feature store')
+        if features.meta.get('fingerprint') != scorer.fingerprint():
+            raise ValueError('The feature store was built for another model or dataset; rebuild it')
+        if features.values.dtype != features.dtype_for(scorer.model):
+            raise ValueError(f'The feature store holds {features.values.dtype} features, which would change '
+                             f'{type(scorer.model).__name__} scores; rebuild it')
+        return _score_features(features, scorer, predictions_path, high_risk_path, chunksize, workers,
+                               prediction_date)
+    previous = PreviousRun.load(predictions_path, fingerprint) if incremental else None
+
+    # Build the new outputs beside the old ones; the previous run is read while
+    # scoring and only replaced once everything has been written
+    suffix = f'.{os.getpid()}.tmp'
+    total = high_total = rescored = 0
+    all_ids, all_digests = [], []
+    chunks = pd.read_csv(input_path, chunksize=chunksize)
+    for result, ids, digests, n_scored in _scored_chunks(chunks, scorer, workers, prediction_date,
+                                                         previous, columns):
+        high_total += _write(result, predictions_path + suffix, high_risk_path + suffix, total == 0)
+        total += len(result)
+        rescored += n_scored
+        all_ids.append(ids)
+        all_digests.append(digests)
+
+    if total == 0:
+        return 0, 0, 0
+    os.replace(predictions_path + suffix, predictions_path)
+    os.replace(high_risk_path + suffix, high_risk_path)
+    digests_tmp = digest_path(predictions_path) + suffix + '.npz'
+    np.savez(digests_tmp, employee_id=np.concatenate(all_ids), digest=np.concatenate(all_digests),
+             fingerprint=np.array(fingerprint), model_stamp=np.array(scorer.model_stamp),
+             reference=np.array(json.dumps(scorer.reference())))
+    os.replace(digests_tmp, digest_path(predictions_path))
+    return total, high_total, rescored
+
+
+def _score_features(features, scorer, predictions_path, high_risk_path, chunksize, workers, prediction_date):
+    """Score every row of a feature store into the prediction files"""
+    suffix = f'.{os.getpid()}.tmp'
+    spans = [(features.ids[start:start + chunksize], start) for start in range(0, len(features), chunksize)]
+    if workers == 1:
+        _init_worker(scorer, features.path)
+        results = (_score_rows(ids, start, prediction_date) for ids, start in spans)
+        pool = None
+    else:
+        # Workers map the same file, so no rows are pickled across processes
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                   initargs=(scorer, features.path))
+        results = pool.map(_score_rows, *zip(*spans), [prediction_date] * len(spans)) if spans else []
+    total = high_total = 0
+    try:
+        for result in results:
+            high_total += _write(result, predictions_path + suffix, high_risk_path + suffix, total == 0)
+            total += len(result)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    if total == 0:
+        return 0, 0, 0
+    os.replace(predictions_path + suffix, predictions_path)
+    os.replace(high_risk_path + suffix, high_risk_path)
+    # There are no raw-row digests for this run, so the next --incremental run starts fresh
+    if os.path.exists(digest_path(predictions_path)):
+        os.remove(digest_path(predictions_path))
+    return total, high_total, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Score employees in chunks and write attritionprediction.csv')
+    parser.add_argument('--input', default='employee.csv', help='Employee CSV to score')
+    parser.add_argument('--output-dir', default='.', help='Directory for attritionprediction.csv and high_risk.csv')
+    parser.add_argument('--model-dir', default=MODEL_DIR, help='Directory holding the model artifacts')
+    parser.add_argument('--chunksize', type=int, default=100_000, help='Rows per chunk')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only score employees that are new or changed since the last run '
+                             '(prediction_date then records when each employee was last scored)')
+    parser.add_argument('--features', nargs='?', const='.', default=None, metavar='DIR',
+                        help='Score from the feature store built by feature_store.py (default dir: .)')
+    args = parser.parse_args()
+    if args.features is not None and args.incremental:
+        parser.error('--features and --incremental cannot be combined')
+
+    print('=' * 70)
+    print('🎯 BATCH ATTRITION SCORING')
+    print('=' * 70)
+    features = None
+    if args.features is not None:
+        from feature_store import FeatureStore
+        features = FeatureStore.open(args.features, args.model_dir, args.input)
+        if features is None:
+            parser.error(f'No current feature store in {args.features}; run feature_store.py first')
+    start = time.perf_counter()
+    total, high_total, rescored = score_file(args.input, args.output_dir, args.model_dir,
+                                             args.chunksize, args.workers, incremental=args.incremental,
+                                             features=features)
+    elapsed = time.perf_counter() - start
+    print(f'✅ Scored {total:,} employees in {elapsed:.1f}s ({total / max(elapsed, 1e-9):,.0f} rows/s)')
+    if args.incremental:
+        print(f'🔁 Rescored {rescored:,} new or changed, carried forward {total - rescored:,}')
+    print(f'⚠️  High risk: {high_total:,}')
+    print(f'📁 Wrote {os.path.join(args.output_dir, "attritionprediction.csv")} '
+          f'and {os.path.join(args.output_dir, "high_risk.csv")}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Inference Benchmark
+Measures how fast each model scores: artifact load time, per-call latency
+percentiles and rows/second for batch sizes from 1 to 1,000,000, and peak
+memory. Each model runs in its own fresh process so load time and peak RSS are
+not polluted by the others. Results go to a JSON file; pass an earlier file
+as --baseline to flag regressions between model versions.
+
+Usage:
+    python bench_inference.py                                  # models/best_model.pkl
+    python bench_inference.py --candidates --output bench.json # also the notebook's other candidates
+    python bench_inference.py --baseline bench_old.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import pickle
+import platform
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from scoring import AttritionScorer, MODEL_DIR
+from tree_compiler import compile_model, source_stamp
+
+BATCH_SIZES = [1, 10, 100, 1_000, 10_000, 100_000, 1_000_000]
+# The compiled forest only serves small batches, so larger ones aren't worth the time
+COMPILED_MAX_BATCH = 10_000
+REGRESSION_THRESHOLD = 0.10
+
+
+def _peak_rss_mb():
+    """Peak resident memory of this process so far, or None where unsupported"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 ** 2 if platform.system() == 'Darwin' else 1024)
+
+
+def time_batches(predict, sample, batch_sizes, seconds=1.0, min_repeats=3, max_repeats=1000):
+    """Latency percentiles and throughput of `predict` for each batch size"""
+    results = []
+    for batch_size in batch_sizes:
+        # Real rows repeated up to the batch size, so trees take realistic paths
+        X = np.ascontiguousarray(sample[np.arange(batch_size) % len(sample)])
+        predict(X)  # warm-up
+        times = []
+        deadline = time.perf_counter() + seconds
+        while len(times) < min_repeats or (len(times) < max_repeats and time.perf_counter() < deadline):
+            start = time.perf_counter()
+            predict(X)
+            times.append(time.perf_counter() - start)
+        times = np.array(times)
+        p50, p95, p99 = np.percentile(times, [50, 95, 99]) * 1000
+        results.append({
+            'batch_size': batch_size,
+            'repeats': len(times),
+            'p50_ms': round(float(p50), 4),
+            'p95_ms': round(float(p95), 4),
+            'p99_ms': round(float(p99), 4),
+            'rows_per_second': round(batch_size / float(np.median(times)), 1),
+        })
+        del X
+    return results
+
+
+def bench_model(name, model_path, scaler_path, sample, batch_sizes, seconds):
+    """Benchmark one pickled model; runs inside a fresh worker process"""
+    baseline_rss = _peak_rss_mb()
+
+    def load():
+        with open(model_path, 'rb') as f:
+            model = pickle.load(f)
+        with open(scaler_path, 'rb') as f:
+            return model, pickle.load(f)
+
+    # The first load also imports the model's library; the second is deserialization alone
+    start = time.perf_counter()
+    load()
+    cold_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    model, scaler = load()
+    load_seconds = time.perf_counter() - start
+    loaded_rss = _peak_rss_mb()
+
+    # Same hand-rolled standardization as AttritionScorer, then predict_proba
+    mean, scale = scaler.mean_, scaler.scale_
+    entries = [{
+        'name': name,
+        'engine': 'sklearn' if type(model).__module__.startswith('sklearn') else type(model).__module__.split('.')[0],
+        'model_class': type(model).__name__,
+        'model_stamp': source_stamp(model_path),
+        'cold_load_seconds': round(cold_seconds, 4),
+        'load_seconds': round(load_seconds, 4),
+        'loaded_rss_mb': None if loaded_rss is None else round(loaded_rss, 1),
+        'batches': time_batches(lambda X: model.predict_proba((X - mean) / scale)[:, 1],
+                                sample, batch_sizes, seconds),
+    }]
+    try:
+        forest = compile_model(model)
+    except ValueError:
+        forest = None
+    if forest is not None:
+        small = [b for b in batch_sizes if b <= COMPILED_MAX_BATCH]
+        entries.append({**entries[0], 'engine': 'compiled',
+                        'batches': time_batches(lambda X: forest.predict_proba((X - mean) / scale)[:, 1],
+                                                sample, small, seconds)})
+    peak = _peak_rss_mb()
+    for entry in entries:
+        entry['peak_rss_mb'] = None if peak is None else round(peak, 1)
+        entry['baseline_rss_mb'] = None if baseline_rss is None else round(baseline_rss, 1)
+    return entries
+
+
+def load_sample(input_path, model_dir, n_rows=5000):
+    """Raw (unscaled) feature rows to benchmark with, from the employee data if available"""
+    scorer = AttritionScorer(model_dir)
+    if input_path and os.path.exists(input_path):
+        df = pd.read_csv(input_path, nrows=n_rows)
+        return scorer.fit_reference(df).build_matrix(df)
+    # No data: draw rows around the training distribution the scaler recorded
+    rng = np.random.default_rng(0)
+    return scorer.mean + scorer.scale * rng.standard_normal((n_rows, scorer.n_features))
+
+
+def train_candidates(input_path, directory):
+    """Fit the notebook's candidate models and pickle them into `directory`"""
+    from train import candidate_models, load_prepared
+    data, _ = load_prepared(input_path)
+    paths = {}
+    for name, estimator in candidate_models(data['y_train']).items():
+        estimator.fit(data['X_train'], data['y_train'])
+        paths[name] = os.path.join(directory, f"{name.lower().replace(' ', '_')}.pkl")
+        with open(paths[name], 'wb') as f:
+            pickle.dump(estimator, f)
+    return paths
+
+
+def compare(results, baseline, threshold=REGRESSION_THRESHOLD):
+    """Lines describing throughput changes against an earlier benchmark file"""
+    previous = {(m['name'], m['engine'], b['batch_size']): b['rows_per_second']
+                for m in baseline['models'] for b in m['batches']}
+    lines = []
+    for m in results['models']:
+        for b in m['batches']:
+            before = previous.get((m['name'], m['engine'], b['batch_size']))
+            if not before:
+                continue
+            ratio = b['rows_per_second'] / before
+            marker = '⚠️ ' if ratio < 1 - threshold else '✅'
+            lines.append(f"{marker} {m['name']:<20} {m['engine']:<9} batch {b['batch_size']:>9,}: "
+                         f"{ratio:6.2f}x rows/s ({before:,.0f} → {b['rows_per_second']:,.0f})")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark model scoring latency, throughput and memory')
+    parser.add_argument('--model-dir', default=MODEL_DIR, help='Directory holding best_model.pkl and scaler.pkl')
+    parser.add_argument('--models', nargs='*', default=[], help='Extra pickled models to benchmark (name=path or path)')
+    parser.add_argument('--candidates', action='store_true',
+                        help="Also train and benchmark the notebook's candidate models (needs --input)")
+    parser.add_argument('--input', default='employee.csv', help='Employee CSV for realistic rows')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=BATCH_SIZES, help='Batch sizes to time')
+    parser.add_argument('--seconds', type=float, default=1.0, help='Time spent per batch size (min 3 calls)')
+    parser.add_argument('--output', default='inference_benchmark.json', help='Where to write the results')
+    parser.add_argument('--baseline', default=None, help='Earlier results file to compare against')
+    args = parser.parse_args()
+
+    print('=' * 70)
+    print('⏱️  INFERENCE BENCHMARK')
+    print('=' * 70)
+    scaler_path = os.path.join(args.model_dir, 'scaler.pkl')
+    sample = load_sample(args.input, args.model_dir)
+    models = {'best_model': os.path.join(args.model_dir, 'best_model.pkl')}
+    for spec in args.models:
+        name, _, path = spec.rpartition('=')
+        models[name or os.path.splitext(os.path.basename(path))[0]] = path
+
+    # A fresh interpreter per model keeps load time and peak RSS independent
+    context = multiprocessing.get_context('spawn')
+    with tempfile.TemporaryDirectory() as directory:
+        if args.candidates:
+            models.update(train_candidates(args.input, directory))
+        entries = []
+        for name, path in models.items():
+            with context.Pool(1) as pool:
+                measured = pool.apply(bench_model, (name, path, scaler_path, sample, args.batch_sizes, args.seconds))
+            for entry in measured:
+                print(f"\n📦 {entry['name']} [{entry['engine']}] {entry['model_class']}: "
+                      f"load {entry['load_seconds'] * 1000:.1f} ms ({entry['cold_load_seconds'] * 1000:.0f} ms cold), "
+                      f"RSS {entry['loaded_rss_mb']} MB loaded / {entry['peak_rss_mb']} MB peak")
+                for b in entry['batches']:
+                    print(f"   batch {b['batch_size']:>9,}: p50 {b['p50_ms']:>10.3f} ms  p95 {b['p95_ms']:>10.3f} ms  "
+                          f"p99 {b['p99_ms']:>10.3f} ms  {b['rows_per_second']:>13,.0f} rows/s")
+            entries.extend(measured)
+
+    import sklearn
+    results = {
+        'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'host': {'platform': platform.platform(), 'python': platform.python_version(),
+                 'cpu_count': os.cpu_count(), 'numpy': np.__version__, 'scikit-learn': sklearn.__version__},
+        'models': entries,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f'\n📁 Wrote {args.output}')
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print(f'\n📊 Compared with {args.baseline}:')
+        for line in compare(results, baseline):
+            print('   ' + line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Page Scaling Benchmark
+Renders each page of app.py headlessly with Streamlit's AppTest against
+synthetic workforces of increasing size. Per page it reports the cold render
+(empty in-memory caches), a warm rerun, peak memory and the slowest functions.
+It flags pages whose render time grows faster than the number of employees.
+Every (size, page) runs in a fresh process, so memory and caches of one page
+never leak into the next.
+
+Usage:
+    python bench_pages.py                              # 5k, 100k and 1M employees
+    python bench_pages.py --sizes 5000 50000 --pages "📋 Data Explorer" --top 10
+"""
+
+import argparse
+import cProfile
+import json
+import multiprocessing
+import os
+import platform
+import pstats
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+import synthetic
+from data_cache import read_csv_cached
+from scoring import MODEL_DIR, risk_category
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+REPO_DIR = os.path.dirname(APP)
+
+PAGES = ['📊 Dashboard', '📈 Batch Analysis', '🎯 High-Risk Employees', '📋 Data Explorer', '💰 ROI Calculator']
+SIZES = [5_000, 100_000, 1_000_000]
+
+# Growth exponent (time ∝ n^k) above which a page counts as super-linear; renders
+# under MIN_FLAG_SECONDS are dominated by fixed costs and are not judged
+SUPERLINEAR_EXPONENT = 1.15
+MIN_FLAG_SECONDS = 0.5
+
+
+def synthesize(n_rows, directory, seed=42):
+    """Stream employee.csv plus matching prediction files for `n_rows` employees"""
+    synthetic.write(os.path.join(directory, 'employee.csv'), n_rows, seed)
+    paths = [os.path.join(directory, name) for name in ['attritionprediction.csv', 'high_risk.csv']]
+    today = time.strftime('%Y-%m-%d')
+    for i, chunk in enumerate(synthetic.iter_chunks(n_rows, seed)):
+        # The generator's own attrition probability stands in for the model's score
+        predictions = pd.DataFrame({
+            'employee_id': chunk['employee_id'],
+            'attrition_risk_score': chunk['attrition_risk_score'],
+            'risk_category': risk_category(chunk['attrition_risk_score'].to_numpy()),
+            'prediction_date': today,
+        })
+        for path, rows in zip(paths, [predictions, predictions[predictions['risk_category'] == 'High']]):
+            rows.to_csv(path, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 ** 2 if platform.system() == 'Darwin' else 1024)
+
+
+def _page_states(page):
+    """Widget states selecting `page`, taken from a run without data (the radio renders first)"""
+    from streamlit.testing.v1 import AppTest
+    empty = tempfile.mkdtemp()
+    try:
+        os.chdir(empty)
+        at = AppTest.from_file(APP, default_timeout=60)
+        at.run()
+        at.sidebar.radio[0].set_value(page)
+        return at._tree.get_widget_states()
+    finally:
+        shutil.rmtree(empty, ignore_errors=True)
+
+
+def _top_functions(stats, top, repo_only):
+    """(function, seconds) pairs by cumulative time (repo code) or self time (everything)"""
+    rows = []
+    for (filename, line, name), (_, _, self_time, cumulative, _) in stats.stats.items():
+        if repo_only and not os.path.abspath(filename).startswith(REPO_DIR):
+            continue
+        label = f'{os.path.basename(filename)}:{line}({name})' if line else name
+        rows.append((label, cumulative if repo_only else self_time))
+    rows.sort(key=lambda row: -row[1])
+    return [{'function': label, 'seconds': round(seconds, 4)} for label, seconds in rows[:top]]
+
+
+def measure_page(page, data_dir, top=8, timeout=600):
+    """Render one page cold and warm; runs inside a fresh worker process"""
+    import streamlit as st
+    from streamlit.logger import set_log_level
+    from streamlit.testing.v1 import AppTest
+
+    set_log_level('error')  # "No runtime found" warnings on every run
+
+    states = _page_states(page)
+    os.chdir(data_dir)
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    baseline_rss = _peak_rss_mb()
+
+    # The script runs on its own thread, so the profiler is switched on from inside it
+    profiler = cProfile.Profile()
+
+    def start_profiler(*_):
+        sys.setprofile(None)
+        profiler.enable()
+
+    threading.setprofile(start_profiler)
+    at = AppTest.from_file(APP, default_timeout=timeout)
+    start = time.perf_counter()
+    at._run(states)
+    cold = time.perf_counter() - start
+    threading.setprofile(None)
+    profiler.disable()
+    stats = pstats.Stats(profiler)
+
+    start = time.perf_counter()
+    at.run()
+    warm = time.perf_counter() - start
+    peak_rss = _peak_rss_mb()
+    return {
+        'page': page,
+        'cold_seconds': round(cold, 3),
+        'warm_seconds': round(warm, 3),
+        'peak_rss_mb': None if peak_rss is None else round(peak_rss, 1),
+        'baseline_rss_mb': None if baseline_rss is None else round(baseline_rss, 1),
+        'exceptions': [str(e.value)[:300] for e in at.exception],
+        'app_functions': _top_functions(stats, top, repo_only=True),
+        'hotspots': _top_functions(stats, top, repo_only=False),
+    }
+
+
+def growth(results, key='cold_seconds'):
+    """Per page, the exponent k in time ∝ n^k between consecutive sizes"""
+    by_page = {}
+    for size in sorted(results):
+        for page in results[size]:
+            by_page.setdefault(page['page'], []).append((size, page[key]))
+    exponents = {}
+    for page, points in by_page.items():
+        exponents[page] = [
+            {'from': n1, 'to': n2, 'exponent': round(float(np.log(t2 / t1) / np.log(n2 / n1)), 2),
+             'superlinear': bool(t2 >= MIN_FLAG_SECONDS and np.log(t2 / t1) / np.log(n2 / n1) > SUPERLINEAR_EXPONENT)}
+            for (n1, t1), (n2, t2) in zip(points, points[1:]) if t1 > 0 and t2 > 0
+        ]
+    return exponents
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark app pages against synthetic workforces of increasing size')
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES, help='Employee counts to test')
+    parser.add_argument('--pages', nargs='+', default=PAGES, help='Pages to render')
+    parser.add_argument('--top', type=int, default=8, help='Slowest functions to keep per page')
+    parser.add_argument('--model-dir', default=MODEL_DIR, help='Model artifacts the app should load')
+    parser.add_argument('--data-dir', default=None, help='Keep the synthetic datasets here (default: temporary)')
+    parser.add_argument('--output', default='page_benchmark.json', help='Where to write the results')
+    args = parser.parse_args()
+
+    print('=' * 70)
+    print('📈 PAGE SCALING BENCHMARK')
+    print('=' * 70)
+    root = args.data_dir or tempfile.mkdtemp(prefix='page_bench_')
+    context = multiprocessing.get_context('spawn')
+    results = {}
+    try:
+        for size in sorted(args.sizes):
+            data_dir = os.path.join(root, f'n{size}')
+            os.makedirs(data_dir, exist_ok=True)
+            # The app loads its artifacts from ./models
+            models = os.path.join(data_dir, MODEL_DIR)
+            if not os.path.exists(models):
+                os.symlink(os.path.abspath(args.model_dir), models)
+            if not os.path.exists(os.path.join(data_dir, 'employee.csv')):
+                start = time.perf_counter()
+                synthesize(size, data_dir)
+                print(f'\n🧪 Generated {size:,} employees in {time.perf_counter() - start:.1f}s')
+            # Build the Parquet cache up front so every page sees the steady state
+            for name in ['employee.csv', 'attritionprediction.csv', 'high_risk.csv']:
+                read_csv_cached(os.path.join(data_dir, name))
+
+            print(f'\n👥 {size:,} employees')
+            results[size] = []
+            for page in args.pages:
+                with context.Pool(1) as pool:
+                    measured = pool.apply(measure_page, (page, data_dir, args.top))
+                results[size].append(measured)
+                status = '❌ ' + measured['exceptions'][0][:60] if measured['exceptions'] else ''
+                print(f"   {page:<26} cold {measured['cold_seconds']:>8.2f}s  warm {measured['warm_seconds']:>7.2f}s  "
+                      f"peak {measured['peak_rss_mb']:>8} MB  {status}")
+    finally:
+        if args.data_dir is None:
+            shutil.rmtree(root, ignore_errors=True)
+
+    exponents = growth(results)
+    print('\n📐 Growth (cold render time ∝ employees^k):')
+    for page, steps in exponents.items():
+        flags = [s for s in steps if s['superlinear']]
+        text = ', '.join(f"{s['from']:,}→{s['to']:,}: k={s['exponent']}" for s in steps) or 'needs two sizes'
+        print(f"   {'⚠️ ' if flags else '✅'} {page:<26} {text}")
+
+    print('\n🐢 Slowest app functions at the largest size (cumulative):')
+    for page in results[max(results)]:
+        top = ', '.join(f"{f['function']} {f['seconds']:.2f}s" for f in page['app_functions'][:3])
+        print(f"   {page['page']:<26} {top}")
+
+    report = {
+        'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'host': {'platform': platform.platform(), 'python': platform.python_version(), 'cpu_count': os.cpu_count()},
+        'sizes': {str(size): pages for size, pages in results.items()},
+        'growth': exponents,
+        'superlinear_pages': sorted(page for page, steps in exponents.items() if any(s['superlinear'] for s in steps)),
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f'\n📁 Wrote {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""
+Streaming Correlation Engine
+Accumulates pairwise counts, sums and cross-products over row chunks, so a
+full Pearson correlation matrix (and each column's correlation with a target)
+comes out of one pass without holding the dataset in memory. Missing values
+are handled pairwise, like DataFrame.corr().
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class CorrelationAccumulator:
+    """Pairwise-complete Pearson correlation built up one block at a time"""
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        k = len(self.columns)
+        self.n = np.zeros((k, k))
+        self.sum_x = np.zeros((k, k))     # sum of column i over rows where i and j are present
+        self.sum_xx = np.zeros((k, k))
+        self.sum_xy = np.zeros((k, k))
+        self.shift = None
+
+    def update(self, block):
+        """Add a (rows x columns) float block; NaN marks a missing value"""
+        block = np.asarray(block, dtype=np.float64)
+        if self.shift is None:
+            # Centering on the first block's means keeps the raw sums small, so
+            # n*Σxy - ΣxΣy doesn't cancel catastrophically for large-valued columns
+            with np.errstate(all='ignore'):
+                self.shift = np.nan_to_num(np.nanmean(block, axis=0)) if len(block) else np.zeros(block.shape[1])
+        present = ~np.isnan(block)
+        if present.all():
+            # Complete rows: every pair sees every row, so the masked products collapse
+            x = block - self.shift
+            self.n += len(x)
+            self.sum_x += x.sum(axis=0)[:, None]
+            self.sum_xx += (x * x).sum(axis=0)[:, None]
+            self.sum_xy += x.T @ x
+            return self
+        x = np.where(present, block - self.shift, 0.0)
+        m = present.astype(np.float64)
+        self.n += m.T @ m
+        self.sum_x += x.T @ m
+        self.sum_xx += (x * x).T @ m
+        self.sum_xy += x.T @ x
+        return self
+
+    def correlation(self):
+        """The correlation matrix as a DataFrame (NaN where undefined)"""
+        n, sx, sy = self.n, self.sum_x, self.sum_x.T
+        with np.errstate(all='ignore'):
+            cov = n * self.sum_xy - sx * sy
+            var_x = n * self.sum_xx - sx * sx
+            var_y = var_x.T
+            corr = cov / np.sqrt(var_x * var_y)
+        corr[n < 2] = np.nan
+        corr = np.clip(corr, -1, 1)
+        diagonal = np.diag_indices_from(corr)
+        corr[diagonal] = np.where(np.isfinite(corr[diagonal]), 1.0, np.nan)
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+
+def _target_values(chunk, target):
+    """A numeric 0/1 view of the target column (Yes/No labels become 1/0)"""
+    values = chunk[target]
+    if values.dtype == object:
+        return values.str.lower().eq('yes').astype(np.float64).where(values.notna())
+    return pd.to_numeric(values, errors='coerce').astype(np.float64)
+
+
+def correlate_chunks(chunks, target=None, target_name='Attrition_Numeric'):
+    """Correlation matrix over an iterable of DataFrame chunks
+
+    Numeric columns are taken from the first chunk. With `target`, a numeric
+    copy of that column is added as `target_name` so its correlations with
+    every feature come out of the same pass.
+    """
+    accumulator = None
+    for chunk in chunks:
+        if accumulator is None:
+            columns = chunk.select_dtypes(include=[np.number]).columns.tolist()
+            names = columns + ([target_name] if target is not None else [])
+            accumulator = CorrelationAccumulator(names)
+        block = np.empty((len(chunk), len(accumulator.columns)))
+        for i, col in enumerate(columns):
+            block[:, i] = pd.to_numeric(chunk[col], errors='coerce')
+        if target is not None:
+            block[:, -1] = _target_values(chunk, target)
+        accumulator.update(block)
+    if accumulator is None:
+        return pd.DataFrame()
+    return accumulator.correlation()
+
+
+def correlate_frame(df, target=None, chunksize=100_000, **kwargs):
+    """Correlation matrix of an in-memory frame, computed in row blocks"""
+    chunks = (df.iloc[start:start + chunksize] for start in range(0, max(len(df), 1), chunksize))
+    return correlate_chunks(chunks, target, **kwargs)
+
+
+def correlate_csv(path, target=None, chunksize=100_000, **kwargs):
+    """Correlation matrix of a CSV streamed in chunks, for files larger than memory"""
+    return correlate_chunks(pd.read_csv(path, chunksize=chunksize), target, **kwargs)
+
+
+def target_correlations(corr, target_name='Attrition_Numeric', exclude=()):
+    """The target's correlation with every other column, strongest positive first"""
+    if target_name not in corr.columns:
+        return pd.Series(dtype=np.float64)
+    drop = [c for c in corr.index if c == target_name or c in exclude]
+    return corr[target_name].drop(drop).dropna().sort_values(ascending=False)
@@ -0,0 +1,74 @@
+"""
+Columnar Data Cache
+Parses a CSV once per source version and serves later reads from a Parquet copy.
+The cache key is the source file's size and modification time, so editing or
+replacing employee.csv (or a prediction file) invalidates it automatically.
+"""
+
+import os
+import threading
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (Parquet engine; ships with streamlit)
+    HAS_PARQUET = True
+except ImportError:
+    HAS_PARQUET = False
+
+CACHE_DIR = '.data_cache'
+
+
+def file_version(path):
+    """Version stamp of `path` that changes whenever the file is edited or replaced"""
+    stat = os.stat(path)
+    return f'{stat.st_size}.{stat.st_mtime_ns}'
+
+
+def cache_path(path):
+    """Parquet location for the current version of `path`"""
+    source = os.path.abspath(path)
+    name = os.path.basename(source)
+    directory = os.path.join(os.path.dirname(source), CACHE_DIR)
+    return os.path.join(directory, f'{name}.{file_version(path)}.parquet')
+
+
+def _remove_stale(path, current):
+    """Delete cache files left over from earlier versions of `path`"""
+    directory = os.path.dirname(current)
+    prefix = os.path.basename(path) + '.'
+    for entry in os.listdir(directory):
+        candidate = os.path.join(directory, entry)
+        if entry.startswith(prefix) and entry.endswith('.parquet') and candidate != current:
+            try:
+                os.remove(candidate)
+            except OSError:
+                pass
+
+
+def read_csv_cached(path, columns=None):
+    """Read a CSV through the columnar cache; raises FileNotFoundError like pd.read_csv"""
+    if not HAS_PARQUET:
+        return pd.read_csv(path, usecols=columns)
+
+    cached = cache_path(path)
+    if os.path.exists(cached):
+        try:
+            return pd.read_parquet(cached, columns=columns)
+        except Exception:
+            # A truncated or unreadable cache file is rebuilt below
+            pass
+
+    df = pd.read_csv(path)
+    # Write to a temp name unique to this writer so concurrent sessions never see
+    # (or overwrite) each other's partial file
+    tmp = f'{cached}.{os.getpid()}.{threading.get_ident()}.tmp'
+    try:
+        os.makedirs(os.path.dirname(cached), exist_ok=True)
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, cached)
+        _remove_stale(path, cached)
+    except (OSError, ValueError, TypeError):
+        # Read-only checkouts and columns Arrow can't type still work, just uncached
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return df[columns] if columns is not None else df
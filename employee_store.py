@@ -0,0 +1,62 @@
+"""
+Indexed Employee Store
+Holds the parsed employee frame once, keyed by a hash index on employee_id, so
+predictions can pick up employee attributes without re-reading or merging the file.
+"""
+
+import numpy as np
+import pandas as pd
+from pandas.api.extensions import take
+
+
+class EmployeeStore:
+    """Employee frame with O(1) lookups and vectorized joins by employee_id"""
+
+    def __init__(self, frame, key='employee_id'):
+        self.frame = frame
+        # Without an ID column the store still serves the frame, just no lookups
+        self.key = key if key in frame.columns else None
+        index = pd.Index(frame[key].to_numpy() if self.key else [])
+        if index.is_unique:
+            self.index = index
+            self.rows = None
+        else:
+            # Duplicate IDs resolve to their first row so joins never fan out
+            first = ~index.duplicated()
+            self.index = index[first]
+            self.rows = np.flatnonzero(first)
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, employee_id):
+        return employee_id in self.index
+
+    def locate(self, ids):
+        """Row positions for an array of IDs; -1 where the ID is unknown"""
+        positions = self.index.get_indexer(np.asarray(ids))
+        if self.rows is not None:
+            positions = np.where(positions >= 0, self.rows[positions], -1)
+        return positions
+
+    def get(self, employee_id):
+        """The employee's record as a Series, or None if the ID is unknown"""
+        position = self.locate([employee_id])[0]
+        return None if position < 0 else self.frame.iloc[position]
+
+    def lookup(self, ids, columns):
+        """Gather `columns` for `ids` in order, with NaN for unknown IDs"""
+        positions = self.locate(ids)
+        fill = bool((positions < 0).any())
+        return {col: take(self.frame[col].to_numpy(), positions, allow_fill=fill)
+                for col in columns}
+
+    def join(self, df, columns, on=None):
+        """Left-join employee `columns` onto `df` by ID without copying the store"""
+        on = on or self.key
+        if on is None or on not in df.columns:
+            return df
+        columns = [c for c in columns if c in self.frame.columns and c not in df.columns]
+        if not columns:
+            return df
+        return df.assign(**self.lookup(df[on].to_numpy(), columns))
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Scaled Feature Store
+Builds the engineered, standardized feature matrix for every employee once and
+keeps it as a memory-mapped .npy (columns in feature_names.pkl order) with an
+employee_id index. App workers and scoring jobs map the same file, so replicas
+on one host share a single page-cached copy and nothing re-applies scaler.pkl.
+Tree ensembles compare features as float32, so their store is float32; other
+models (e.g. logistic regression) get a float64 store, so scores from the store
+always match scoring the CSV.
+
+Usage:
+    python feature_store.py --input employee.csv --chunksize 100000
+"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from batch_score import fit_reference_streaming
+from data_cache import file_version
+from employee_store import EmployeeStore
+from scoring import AttritionScorer, MODEL_DIR
+from tree_compiler import source_stamp
+
+FEATURES_FILE = 'features.npy'
+INDEX_FILE = 'features_index.npz'
+# Models that cast every feature to float32 before comparing it with a split
+FLOAT32_MODELS = ('GradientBoostingClassifier', 'RandomForestClassifier', 'XGBClassifier')
+
+
+class FeatureStore:
+    """Read-only, memory-mapped scaled feature rows looked up by employee_id"""
+
+    def __init__(self, values, ids, meta, path=None):
+        self.values = values
+        self.ids = ids
+        self.meta = meta
+        self.path = path
+        self.feature_names = meta['feature_names']
+        self.index = EmployeeStore(pd.DataFrame({'employee_id': ids}))
+
+    @classmethod
+    def open(cls, directory='.', model_dir=MODEL_DIR, data_path=None):
+        """Map the store in `directory`; None if missing, built for another model or for other data"""
+        values_path = os.path.join(directory, FEATURES_FILE)
+        index_path = os.path.join(directory, INDEX_FILE)
+        if not (os.path.exists(values_path) and os.path.exists(index_path)):
+            return None
+        with np.load(index_path) as data:
+            ids = data['employee_id']
+            meta = json.loads(str(data['meta']))
+        model_path = os.path.join(model_dir, 'best_model.pkl')
+        if os.path.exists(model_path) and meta.get('model_stamp') != source_stamp(model_path):
+            return None
+        if data_path is not None and os.path.exists(data_path) and meta.get('data_version') != file_version(data_path):
+            return None
+        values = np.load(values_path, mmap_mode='r')
+        if values.shape != (len(ids), len(meta['feature_names'])):
+            return None
+        return cls(values, ids, meta, values_path)
+
+    @staticmethod
+    def dtype_for(model):
+        """Narrowest dtype that leaves the model's scores unchanged"""
+        return np.float32 if type(model).__name__ in FLOAT32_MODELS else np.float64
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, employee_id):
+        return employee_id in self.index
+
+    def get(self, employee_id):
+        """One employee's scaled features as a Series, or None if unknown"""
+        position = self.index.locate([employee_id])[0]
+        if position < 0:
+            return None
+        return pd.Series(np.asarray(self.values[position], dtype=np.float64),
+                         index=self.feature_names, name=employee_id)
+
+    def standouts(self, employee_id, n=5):
+        """The `n` features where this employee sits furthest from the training average"""
+        row = self.get(employee_id)
+        if row is None:
+            return None
+        top = row.reindex(row.abs().sort_values(ascending=False).index[:n])
+        return pd.DataFrame({
+            'Feature': top.index,
+            'Std. Deviations': top.to_numpy(),
+            'Compared to Average': np.where(top.to_numpy() > 0, '⬆️ Above', '⬇️ Below')
+        })
+
+
+def build_store(input_path='employee.csv', output_dir='.', model_dir=MODEL_DIR, chunksize=100_000):
+    """Write the scaled feature matrix for every row of `input_path`; returns the number of rows"""
+    scorer = fit_reference_streaming(AttritionScorer(model_dir), input_path, chunksize)
+    ids = pd.read_csv(input_path, usecols=['employee_id'])['employee_id'].to_numpy()
+
+    values_path = os.path.join(output_dir, FEATURES_FILE)
+    index_path = os.path.join(output_dir, INDEX_FILE)
+    # Written under temporary names and swapped in at the end, so workers that
+    # have the old file mapped keep reading it until the new one is complete
+    values_tmp = f'{values_path}.{os.getpid()}.tmp.npy'
+    try:
+        out = np.lib.format.open_memmap(values_tmp, mode='w+', dtype=FeatureStore.dtype_for(scorer.model),
+                                        shape=(len(ids), scorer.n_features))
+        start = 0
+        for chunk in pd.read_csv(input_path, chunksize=chunksize):
+            out[start:start + len(chunk)] = scorer.transform(scorer.build_matrix(chunk))
+            start += len(chunk)
+        out.flush()
+        del out
+    except BaseException:
+        # A failed run leaves the previous store as it was and no half-written file behind
+        if os.path.exists(values_tmp):
+            os.remove(values_tmp)
+        raise
+
+    meta = {
+        'feature_names': scorer.feature_names,
+        'model_stamp': scorer.model_stamp,
+        'fingerprint': scorer.fingerprint(),
+        'data_version': file_version(input_path),
+        'created': time.strftime('%Y-%m-%d %H:%M:%S')
+    }
+    index_tmp = f'{index_path}.{os.getpid()}.tmp.npz'
+    np.savez(index_tmp, employee_id=ids, meta=np.array(json.dumps(meta)))
+    os.replace(values_tmp, values_path)
+    os.replace(index_tmp, index_path)
+    return len(ids)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Precompute the scaled feature matrix into a memory-mapped store')
+    parser.add_argument('--input', default='employee.csv', help='Employee CSV to transform')
+    parser.add_argument('--output-dir', default='.', help=f'Directory for {FEATURES_FILE} and {INDEX_FILE}')
+    parser.add_argument('--model-dir', default=MODEL_DIR, help='Directory holding the model artifacts')
+    parser.add_argument('--chunksize', type=int, default=100_000, help='Rows per chunk')
+    args = parser.parse_args()
+
+    print('=' * 70)
+    print('🧮 SCALED FEATURE STORE')
+    print('=' * 70)
+    start = time.perf_counter()
+    n_rows = build_store(args.input, args.output_dir, args.model_dir, args.chunksize)
+    elapsed = time.perf_counter() - start
+    size_mb = os.path.getsize(os.path.join(args.output_dir, FEATURES_FILE)) / 1024 ** 2
+    print(f'✅ Transformed {n_rows:,} employees in {elapsed:.1f}s ({n_rows / max(elapsed, 1e-9):,.0f} rows/s)')
+    print(f'📁 Wrote {os.path.join(args.output_dir, FEATURES_FILE)} ({size_mb:,.1f} MB) '
+          f'and {os.path.join(args.output_dir, INDEX_FILE)}')
+
+
+if __name__ == '__main__':
+    main()
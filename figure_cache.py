@@ -0,0 +1,111 @@
+"""
+Rendered Figure Cache
+Keeps the PNG bytes of dashboard charts keyed by a hash of the data they were
+drawn from, so a rerun with unchanged data re-serves the image instead of
+re-rasterizing it. Every figure is closed as soon as it has been rendered.
+"""
+
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+from contextlib import nullcontext
+
+import numpy as np
+import pandas as pd
+
+# Same output st.pyplot produces, so cached charts look identical
+RENDER_OPTIONS = {'format': 'png', 'dpi': 200, 'bbox_inches': 'tight'}
+
+
+def _update_hash(h, value):
+    """Feed a chart input into the hash, content-addressed for pandas/NumPy data"""
+    if isinstance(value, pd.DataFrame):
+        h.update(repr((value.shape, list(value.columns), list(value.dtypes.astype(str)))).encode())
+        h.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, pd.Series):
+        h.update(repr((value.name, len(value), str(value.dtype))).encode())
+        h.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        h.update(repr((value.shape, str(value.dtype))).encode())
+        h.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, dict):
+        _update_hash(h, sorted(value.items(), key=lambda item: repr(item[0])))
+    elif isinstance(value, (list, tuple)):
+        h.update(f'{type(value).__name__}{len(value)}'.encode())
+        for item in value:
+            _update_hash(h, item)
+    else:
+        h.update(repr(value).encode())
+
+
+def data_key(*parts):
+    """Stable digest of the data a chart is drawn from"""
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        _update_hash(h, part)
+    return h.hexdigest()
+
+
+class FigureCache:
+    """LRU cache of rendered chart images keyed by drawing function and input data"""
+
+    def __init__(self, max_entries=64, span=None):
+        self.max_entries = max_entries
+        # Optional span(name) context manager timed around every render call
+        self.span = span
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        # pyplot keeps global state, so renders are serialized across sessions
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    @property
+    def size_bytes(self):
+        return sum(len(image) for image in self.entries.values())
+
+    def render(self, draw, *args):
+        """PNG bytes of draw(*args), drawing it only if these inputs were not seen before"""
+        with self.span(draw.__name__) if self.span else nullcontext():
+            return self._render(draw, args)
+
+    def _render(self, draw, args):
+        key = (draw.__qualname__, data_key(*args))
+        with self._lock:
+            image = self.entries.get(key)
+            if image is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return image
+
+            self.misses += 1
+            image = _render_png(draw, args)
+            self.entries[key] = image
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            return image
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+
+
+def _render_png(draw, args):
+    """Draw a figure, rasterize it and close every figure the draw opened"""
+    # Imported here so a process serving only cached charts never loads pyplot
+    import matplotlib.pyplot as plt
+
+    before = set(plt.get_fignums())
+    try:
+        fig = draw(*args)
+        buffer = io.BytesIO()
+        fig.savefig(buffer, **RENDER_OPTIONS)
+        return buffer.getvalue()
+    finally:
+        # Also covers figures left open by a draw that raised halfway
+        for num in set(plt.get_fignums()) - before:
+            plt.close(num)
+
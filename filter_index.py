@@ -0,0 +1,82 @@
+"""
+Prediction Filter Index
+Precomputes, once per predictions load, a packed bitmap for every value of the
+categorical filter columns (risk level, department) and a score-sorted row
+permutation. A filter is then a few bitmap ORs/ANDs plus one searchsorted for
+the minimum score, and returns row positions instead of copying the frame.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class FilterIndex:
+    """Bitmap and sorted-score index over a predictions frame"""
+
+    def __init__(self, frame, categorical=(), score=None):
+        self.frame = frame
+        self.n_rows = len(frame)
+        self.categories = {}
+        self.bitmaps = {}
+        self.missing = {}
+        for col in categorical:
+            if col not in frame.columns:
+                continue
+            # Missing values get a code (and a bitmap) of their own, as isin() matches them too
+            codes, uniques = pd.factorize(frame[col], use_na_sentinel=False)
+            self.categories[col] = list(uniques)
+            # One bit per row and value, so a million rows cost 125 KB per value
+            self.bitmaps[col] = {value: np.packbits(codes == code) for code, value in enumerate(uniques)}
+            self.missing[col] = next((value for value in uniques if pd.isna(value)), None)
+
+        self.score = score if score in frame.columns else None
+        if self.score is not None:
+            scores = frame[self.score].to_numpy(dtype=np.float64)
+            # Rows without a score never pass a minimum-score filter, so they stay out of the ordering
+            scored = np.flatnonzero(~np.isnan(scores))
+            self.order = scored[np.argsort(scores[scored], kind='stable')]
+            self.sorted_scores = scores[self.order]
+
+    def values(self, col):
+        """Distinct values of a categorical column, in order of first appearance"""
+        return self.categories.get(col, [])
+
+    def _category_mask(self, col, selected):
+        bitmaps = self.bitmaps[col]
+        bits = np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+        for value in selected:
+            if value not in bitmaps and pd.isna(value):
+                # NaN != NaN, so a missing value is looked up by the column's own NaN object
+                value = self.missing[col]
+            if value in bitmaps:
+                bits |= bitmaps[value]
+        return bits
+
+    def select(self, filters=None, min_score=None):
+        """Row positions (ascending) matching every filter
+
+        `filters` maps a categorical column to the values to keep; a column
+        with an empty selection is not filtered, matching the pages' multiselects.
+        """
+        bits = None
+        for col, selected in (filters or {}).items():
+            if col not in self.bitmaps or not len(selected):
+                continue
+            mask = self._category_mask(col, selected)
+            bits = mask if bits is None else bits & mask
+        mask = None if bits is None else np.unpackbits(bits, count=self.n_rows).view(bool)
+
+        if min_score is None or self.score is None:
+            return np.arange(self.n_rows) if mask is None else np.flatnonzero(mask)
+        # Rows at or above the cut are a suffix of the score-sorted permutation
+        above = self.order[np.searchsorted(self.sorted_scores, min_score, side='left'):]
+        if mask is not None:
+            above = above[mask[above]]
+        return np.sort(above)
+
+    def filter(self, filters=None, min_score=None):
+        """The matching rows of the frame, in their original order"""
+        positions = self.select(filters, min_score)
+        if len(positions) == self.n_rows:
+            return self.frame
+        return self.frame.iloc[positions]
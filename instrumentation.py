@@ -0,0 +1,258 @@
+"""
+App Instrumentation
+Process-wide timing spans and cache hit/miss counters for the Streamlit app.
+Loaders, pages, views and charts are wrapped once at import, every session
+records into the same registry, and the totals can be exported as Prometheus
+text or JSON: written to a file after each rerun, served over HTTP, or shown
+in the sidebar debug panel.
+
+Usage:
+    ATTRITION_METRICS_FILE=metrics.prom streamlit run app.py     # or metrics.json
+    ATTRITION_METRICS_PORT=9464 streamlit run app.py             # GET /metrics or /metrics.json (localhost only)
+    ATTRITION_METRICS_HOST=0.0.0.0 ATTRITION_METRICS_PORT=9464 streamlit run app.py   # expose it to other hosts
+    ATTRITION_DEBUG_PANEL=1 streamlit run app.py                 # or open the app with ?debug=1
+"""
+
+import functools
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+METRICS_FILE = os.environ.get('ATTRITION_METRICS_FILE')
+METRICS_PORT = os.environ.get('ATTRITION_METRICS_PORT')
+METRICS_HOST = os.environ.get('ATTRITION_METRICS_HOST', '127.0.0.1')
+DEBUG_PANEL = os.environ.get('ATTRITION_DEBUG_PANEL', '') not in ('', '0')
+
+PREFIX = 'attrition_app'
+SAMPLES = 512
+QUANTILES = (0.5, 0.95, 0.99)
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class Metrics:
+    """Thread-safe registry of timing spans and cache counters shared by every session"""
+
+    def __init__(self, samples=SAMPLES):
+        self.samples = samples
+        self.started = time.time()
+        self._spans = {}
+        self._caches = {}
+        self._gauges = {}
+        self._lock = threading.Lock()
+
+    def record(self, kind, name, seconds):
+        """Add one duration to the span `name` of the given kind (page, view, loader, plot)"""
+        with self._lock:
+            span = self._spans.get((kind, name))
+            if span is None:
+                span = self._spans[(kind, name)] = {'count': 0, 'total': 0.0, 'max': 0.0, 'last': 0.0,
+                                                    'samples': deque(maxlen=self.samples)}
+            span['count'] += 1
+            span['total'] += seconds
+            span['max'] = max(span['max'], seconds)
+            span['last'] = seconds
+            span['samples'].append(seconds)
+
+    @contextmanager
+    def span(self, kind, name):
+        """Time the block, including when it raises (st.stop and reruns unwind through it)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(kind, name, time.perf_counter() - start)
+
+    def timed(self, kind, name=None):
+        """Decorator recording every call of the function as a span"""
+        def wrap(fn):
+            label = name or fn.__name__
+
+            @functools.wraps(fn)
+            def call(*args, **kwargs):
+                with self.span(kind, label):
+                    return fn(*args, **kwargs)
+            return call
+        return wrap
+
+    def count_cache(self, name, hits=0, misses=0):
+        with self._lock:
+            counts = self._caches.setdefault(name, {'hits': 0, 'misses': 0})
+            counts['hits'] += hits
+            counts['misses'] += misses
+
+    def cached(self, cache_decorator, kind='loader'):
+        """Apply a Streamlit cache decorator, timing each call and counting hits and misses
+
+        The function body only runs on a miss, so misses are flagged inside the
+        cache and counted by the wrapper outside it. The flag is per thread, so a
+        session that waited on another one's computation still counts a hit.
+        """
+        def wrap(fn):
+            name = fn.__name__
+            local = threading.local()
+
+            # functools.wraps keeps the name and source Streamlit derives the cache key from
+            @functools.wraps(fn)
+            def compute(*args, **kwargs):
+                local.missed = True
+                return fn(*args, **kwargs)
+            cached = cache_decorator(compute)
+
+            @functools.wraps(fn)
+            def call(*args, **kwargs):
+                local.missed = False
+                with self.span(kind, name):
+                    result = cached(*args, **kwargs)
+                missed = local.missed
+                self.count_cache(name, hits=int(not missed), misses=int(missed))
+                return result
+            call.clear = cached.clear
+            return call
+        return wrap
+
+    def register_gauges(self, source, read):
+        """Export the numbers `read()` returns (e.g. ScoringPool.metrics) under `source`"""
+        with self._lock:
+            self._gauges[source] = read
+
+    def snapshot(self):
+        """Everything recorded so far, with durations in milliseconds"""
+        with self._lock:
+            spans = [(kind, name, dict(span, samples=np.array(span['samples'])))
+                     for (kind, name), span in self._spans.items()]
+            caches = {name: dict(counts) for name, counts in self._caches.items()}
+            gauges = dict(self._gauges)
+
+        rows = []
+        for kind, name, span in sorted(spans):
+            row = {'kind': kind, 'name': name, 'count': span['count'],
+                   'total_ms': round(span['total'] * 1000, 3),
+                   'mean_ms': round(span['total'] / span['count'] * 1000, 3),
+                   'last_ms': round(span['last'] * 1000, 3),
+                   'max_ms': round(span['max'] * 1000, 3)}
+            for q in QUANTILES:
+                row[f'p{round(q * 100)}_ms'] = round(float(np.quantile(span['samples'], q)) * 1000, 3)
+            rows.append(row)
+
+        cache_rows = []
+        for name, counts in sorted(caches.items()):
+            calls = counts['hits'] + counts['misses']
+            cache_rows.append({'function': name, **counts,
+                               'hit_rate': round(counts['hits'] / calls, 4) if calls else None})
+
+        gauge_values = {}
+        for source, read in sorted(gauges.items()):
+            try:
+                values = read()
+            except Exception:
+                continue
+            gauge_values[source] = {key: value for key, value in values.items()
+                                    if isinstance(value, (int, float)) and not isinstance(value, bool)}
+
+        return {'generated': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'uptime_seconds': round(time.time() - self.started, 1),
+                'spans': rows, 'caches': cache_rows, 'gauges': gauge_values}
+
+    def reset(self):
+        with self._lock:
+            self._spans.clear()
+            self._caches.clear()
+            self.started = time.time()
+
+
+def _label(value):
+    """Escape a Prometheus label value"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _metric_name(*parts):
+    return re.sub(r'[^a-zA-Z0-9_]', '_', '_'.join(parts))
+
+
+def to_prometheus(snapshot):
+    """Prometheus text exposition of a snapshot (durations in seconds)"""
+    lines = [f'# HELP {PREFIX}_uptime_seconds Seconds since the app process started recording',
+             f'# TYPE {PREFIX}_uptime_seconds gauge',
+             f'{PREFIX}_uptime_seconds {snapshot["uptime_seconds"]}']
+
+    span = f'{PREFIX}_span_seconds'
+    lines += [f'# HELP {span} Duration of app pages, views, loaders and charts',
+              f'# TYPE {span} summary']
+    for row in snapshot['spans']:
+        labels = f'kind="{_label(row["kind"])}",name="{_label(row["name"])}"'
+        for q in QUANTILES:
+            lines.append(f'{span}{{{labels},quantile="{q}"}} {row[f"p{round(q * 100)}_ms"] / 1000:.6f}')
+        lines.append(f'{span}_sum{{{labels}}} {row["total_ms"] / 1000:.6f}')
+        lines.append(f'{span}_count{{{labels}}} {row["count"]}')
+    for stat in ('last', 'max'):
+        name = f'{PREFIX}_span_{stat}_seconds'
+        lines += [f'# HELP {name} {stat.capitalize()} duration of each span',
+                  f'# TYPE {name} gauge']
+        lines += [f'{name}{{kind="{_label(row["kind"])}",name="{_label(row["name"])}"}} '
+                  f'{row[f"{stat}_ms"] / 1000:.6f}' for row in snapshot['spans']]
+
+    for result in ('hits', 'misses'):
+        name = f'{PREFIX}_cache_{result}_total'
+        lines += [f'# HELP {name} Cached loader calls served {"from" if result == "hits" else "without"} the cache',
+                  f'# TYPE {name} counter']
+        lines += [f'{name}{{function="{_label(row["function"])}"}} {row[result]}' for row in snapshot['caches']]
+
+    for source, values in snapshot['gauges'].items():
+        for key, value in values.items():
+            name = _metric_name(PREFIX, source, key)
+            lines += [f'# TYPE {name} gauge', f'{name} {value}']
+    return '\n'.join(lines) + '\n'
+
+
+def to_json(snapshot):
+    return json.dumps(snapshot, indent=2, ensure_ascii=False)
+
+
+def write_metrics(metrics, path):
+    """Write a snapshot to `path`, as JSON for .json files and Prometheus text otherwise"""
+    snapshot = metrics.snapshot()
+    text = to_json(snapshot) if path.endswith('.json') else to_prometheus(snapshot)
+    # Swapped in whole, so a scraper never reads a half-written file
+    tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def serve_metrics(metrics, port, host='127.0.0.1'):
+    """Serve /metrics (Prometheus text) and /metrics.json from a daemon thread"""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split('?')[0]
+            if path == '/metrics':
+                body, content_type = to_prometheus(metrics.snapshot()), PROMETHEUS_CONTENT_TYPE
+            elif path == '/metrics.json':
+                body, content_type = to_json(metrics.snapshot()), 'application/json'
+            else:
+                self.send_error(404)
+                return
+            data = body.encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+    return server
+
+
+# One registry per process; Streamlit re-runs app.py but imports this module once
+METRICS = Metrics()
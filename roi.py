@@ -0,0 +1,154 @@
+"""
+ROI Scenario Engine
+The ROI Calculator's cost model written once over NumPy arrays: every input may
+be a scalar or an array, and all results broadcast, so a single scenario, a
+Monte Carlo sample or a full parameter grid (millions of scenarios) is one
+vectorized evaluation. Rates are percentages, as entered on the calculator page.
+"""
+
+import numpy as np
+import pandas as pd
+
+PRODUCTIVITY_LOSS = 0.5  # share of salary lost while a role is vacant
+YEARS = 5
+
+DEFAULTS = {
+    'total_employees': 5000,
+    'avg_salary': 70000,
+    'attrition_rate': 15.0,
+    'replacement_multiplier': 1.5,
+    'model_accuracy': 93.0,
+    'success_rate': 35.0,
+    'implementation_cost': 150000,
+    'annual_maintenance': 50000,
+}
+
+LABELS = {
+    'total_employees': 'Total Employees',
+    'avg_salary': 'Average Salary',
+    'attrition_rate': 'Attrition Rate',
+    'replacement_multiplier': 'Replacement Cost Multiplier',
+    'model_accuracy': 'Model Accuracy',
+    'success_rate': 'Intervention Success Rate',
+    'implementation_cost': 'Implementation Cost',
+    'annual_maintenance': 'Annual Maintenance',
+}
+
+# Inputs that are percentages can't leave [0, 100] however wide the uncertainty
+BOUNDS = {'attrition_rate': (0.0, 100.0), 'model_accuracy': (0.0, 100.0), 'success_rate': (0.0, 100.0)}
+
+
+def evaluate(total_employees, avg_salary, attrition_rate, replacement_multiplier, model_accuracy,
+             success_rate, implementation_cost, annual_maintenance, years=YEARS):
+    """ROI figures for every scenario the (broadcast) inputs describe, as a dict of arrays"""
+    total_employees, avg_salary, attrition_rate, replacement_multiplier, model_accuracy, \
+        success_rate, implementation_cost, annual_maintenance = np.broadcast_arrays(*(
+            np.asarray(x, dtype=np.float64) for x in (
+                total_employees, avg_salary, attrition_rate, replacement_multiplier, model_accuracy,
+                success_rate, implementation_cost, annual_maintenance)))
+
+    # Whole people leave, as with int() on the calculator page
+    attrition_count = np.floor(total_employees * attrition_rate / 100)
+    cost_per_attrition = avg_salary * replacement_multiplier + avg_salary * PRODUCTIVITY_LOSS
+    identified = attrition_count * model_accuracy / 100
+    retained = identified * success_rate / 100
+    savings = retained * cost_per_attrition
+
+    year1_net = savings - implementation_cost - annual_maintenance
+    annual_net = savings - annual_maintenance
+    total_net = year1_net + annual_net * (years - 1)
+    investment = implementation_cost + annual_maintenance * years
+    with np.errstate(divide='ignore', invalid='ignore'):
+        roi = np.where(investment > 0, total_net / investment * 100, np.nan)
+        # Years of net benefit needed to earn back the implementation cost
+        payback = np.where(annual_net > 0, implementation_cost / annual_net, np.inf)
+
+    return {
+        'attrition_count': attrition_count,
+        'attrition_cost': attrition_count * cost_per_attrition,
+        'cost_per_attrition': cost_per_attrition,
+        'identified': identified,
+        'retained': retained,
+        'savings': savings,
+        'year1_net': year1_net,
+        'annual_net': annual_net,
+        'total_net': total_net,
+        'investment': investment,
+        'roi': roi,
+        'payback_years': payback,
+    }
+
+
+def scenario(**inputs):
+    """One scenario's results as plain floats; unspecified inputs take DEFAULTS"""
+    return {name: float(value) for name, value in evaluate(**{**DEFAULTS, **inputs}).items()}
+
+
+def grid(base=None, **ranges):
+    """Evaluate every combination of the given input ranges (others fixed at `base`)
+
+    Each range gets its own axis, so the result arrays have shape
+    (len(range_1), len(range_2), ...) without materializing the input grid.
+    """
+    inputs = {**DEFAULTS, **(base or {})}
+    for axis, (name, values) in enumerate(ranges.items()):
+        shape = [1] * len(ranges)
+        shape[axis] = -1
+        inputs[name] = np.asarray(values, dtype=np.float64).reshape(shape)
+    return evaluate(**inputs)
+
+
+def _bounded(name, values):
+    low, high = BOUNDS.get(name, (0.0, np.inf))
+    return np.clip(values, low, high)
+
+
+def monte_carlo(base=None, uncertainty=None, n=100_000, seed=0):
+    """Results for `n` random scenarios around `base`
+
+    `uncertainty` maps an input to its relative spread (0.2 = ±20%); draws are
+    triangular between the two bounds with the mode at the base value.
+    """
+    inputs = {**DEFAULTS, **(base or {})}
+    rng = np.random.default_rng(seed)
+    for name, spread in (uncertainty or {}).items():
+        centre = float(inputs[name])
+        if spread <= 0 or centre == 0:
+            continue
+        low, high = sorted((centre * (1 - spread), centre * (1 + spread)))
+        inputs[name] = _bounded(name, rng.triangular(low, centre, high, size=n))
+    return evaluate(**inputs)
+
+
+def percentiles(values, q=(5, 50, 95)):
+    """Percentiles of one result over all scenarios, ignoring undefined ones"""
+    values = np.ravel(values)
+    values = values[np.isfinite(values)]
+    if not len(values):
+        return {p: np.nan for p in q}
+    return dict(zip(q, np.percentile(values, q)))
+
+
+def sensitivity(base=None, uncertainty=None, metric='total_net'):
+    """Tornado table: `metric` with each input moved alone to its low and high bound
+
+    All 2 x inputs one-at-a-time scenarios are evaluated together; rows are
+    sorted by swing, largest first.
+    """
+    inputs = {**DEFAULTS, **(base or {})}
+    names = [name for name, spread in (uncertainty or {}).items() if spread > 0]
+    if not names:
+        return pd.DataFrame(columns=['Parameter', 'Low', 'High', 'Swing'])
+    columns = {name: np.full(2 * len(names), float(value)) for name, value in inputs.items()}
+    for i, name in enumerate(names):
+        centre = float(inputs[name])
+        columns[name][2 * i] = _bounded(name, centre * (1 - uncertainty[name]))
+        columns[name][2 * i + 1] = _bounded(name, centre * (1 + uncertainty[name]))
+    result = evaluate(**columns)[metric].reshape(-1, 2)
+    table = pd.DataFrame({
+        'Parameter': [LABELS.get(name, name) for name in names],
+        'Low': result[:, 0],
+        'High': result[:, 1],
+    })
+    table['Swing'] = (table['High'] - table['Low']).abs()
+    return table.sort_values('Swing', ascending=False, ignore_index=True)
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Employee Frame Schema
+Compact dtypes for the employee data, declared from DATA_DICTIONARY.md. Rating
+scales and category codes load as int8, text categories as `category` and
+continuous measures as float32. Both the dictionary's column names and the
+ones employee.csv uses are covered. A column is only narrowed when every value
+fits, so unexpected data is left as it was rather than truncated.
+
+Usage:
+    python schema.py --input employee.csv     # per-column memory and timing report
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+# Small integer scales and codes (int8 is signed so rating arithmetic can go negative)
+ORDINAL_COLUMNS = [
+    'age', 'gender', 'marital_status', 'department', 'job_role', 'job_level', 'stock_option_level',
+    'stock_options', 'num_companies_worked', 'performance_rating', 'satisfaction_level', 'job_satisfaction',
+    'environment_satisfaction', 'manager_rating', 'involvement_level', 'work_life_balance', 'business_travel',
+    'projects_count', 'attrition', 'age_group',
+]
+# Text labels with a handful of distinct values
+CATEGORICAL_COLUMNS = ['gender', 'education', 'marital_status', 'department', 'job_role']
+CONTINUOUS_COLUMNS = [
+    'salary', 'base_salary', 'salary_hike_pct', 'tenure_years', 'years_in_role', 'years_with_manager',
+    'years_since_promotion', 'overtime_hours', 'training_hours', 'distance_from_home', 'commute_distance',
+    'attrition_risk_score',
+]
+
+_INTEGER_TYPES = [np.int8, np.int16, np.int32]
+
+
+def _smallest_integer(values):
+    """Narrowest signed integer dtype holding every value, or None"""
+    if len(values) == 0:
+        return None
+    low, high = values.min(), values.max()
+    for dtype in _INTEGER_TYPES:
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return np.dtype(dtype)
+    return None
+
+
+def compact_dtypes(df):
+    """Target dtype for each schema column of `df` that can be narrowed safely"""
+    dtypes = {}
+    for col in df.columns:
+        values = df[col]
+        kind = values.dtype.kind
+        if kind == 'O' and col in CATEGORICAL_COLUMNS:
+            dtypes[col] = 'category'
+        elif kind in 'iu' and (col in ORDINAL_COLUMNS or col in CONTINUOUS_COLUMNS):
+            dtype = _smallest_integer(values.to_numpy())
+            if dtype is not None and dtype.itemsize < values.dtype.itemsize:
+                dtypes[col] = dtype
+        elif kind == 'f' and values.dtype.itemsize > 4 and (col in CONTINUOUS_COLUMNS or col in ORDINAL_COLUMNS):
+            # Ordinals with gaps parse as float; float32 keeps the NaNs
+            dtypes[col] = np.dtype(np.float32)
+    return dtypes
+
+
+def compact(df):
+    """`df` with the schema's compact dtypes applied (a new frame; the input is untouched)"""
+    dtypes = compact_dtypes(df)
+    return df.astype(dtypes) if dtypes else df
+
+
+def default_memory(path, chunksize=100_000):
+    """Per-column dtypes and deep memory of `path` under pandas' default dtypes, read one chunk at a time
+
+    Returns the (dtypes, memory) pair memory_report accepts in place of the
+    full default-dtype frame, so the report never holds that frame in memory.
+    """
+    dtypes, memory = {}, None
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        chunk.columns = chunk.columns.str.strip()
+        usage = chunk.memory_usage(index=False, deep=True)
+        memory = usage if memory is None else memory + usage
+        for col, dtype in chunk.dtypes.items():
+            dtypes.setdefault(col, []).append(dtype)
+    if memory is None:
+        return pd.Series(dtype=object), pd.Series(dtype=np.int64)
+
+    # A column parsed differently across chunks would be upcast by a single read
+    combined = {col: kinds[0] if len(set(kinds)) == 1
+                else np.result_type(*kinds) if all(k.kind in 'biuf' for k in kinds) else np.dtype(object)
+                for col, kinds in dtypes.items()}
+    # Numbers and text in one column load as text, so size those columns again as strings
+    mixed = {col for col, kinds in dtypes.items() if len(set(kinds)) > 1 and combined[col] == object}
+    if mixed:
+        memory[list(mixed)] = 0
+        for chunk in pd.read_csv(path, chunksize=chunksize, dtype=str, usecols=lambda c: c.strip() in mixed):
+            chunk.columns = chunk.columns.str.strip()
+            memory = memory.add(chunk.memory_usage(index=False, deep=True), fill_value=0).astype(np.int64)
+    return pd.Series(combined, dtype=object), memory
+
+
+def memory_report(before, after):
+    """Per-column deep memory of two versions of one frame, largest savings first
+
+    `before` is the default-dtype frame or the (dtypes, memory) pair from default_memory.
+    """
+    if isinstance(before, pd.DataFrame):
+        before = before.dtypes, before.memory_usage(index=False, deep=True)
+    dtypes, memory = before
+    report = pd.DataFrame({
+        'Before dtype': dtypes.astype(str),
+        'After dtype': after.dtypes.reindex(dtypes.index).astype(str),
+        'Before (MB)': memory / 1024 ** 2,
+        'After (MB)': after.memory_usage(index=False, deep=True).reindex(dtypes.index) / 1024 ** 2,
+    })
+    report['Saved (MB)'] = report['Before (MB)'] - report['After (MB)']
+    return report.sort_values('Saved (MB)', ascending=False)
+
+
+def _best_time(fn, repeats=5):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report the memory and speed effect of the compact employee schema')
+    parser.add_argument('--input', default='employee.csv', help='Employee CSV')
+    args = parser.parse_args()
+
+    print('=' * 70)
+    print('🗜️  EMPLOYEE SCHEMA')
+    print('=' * 70)
+    before = pd.read_csv(args.input)
+    start = time.perf_counter()
+    after = compact(before)
+    elapsed = time.perf_counter() - start
+    report = memory_report(before, after)
+    total_before, total_after = report['Before (MB)'].sum(), report['After (MB)'].sum()
+    print(f'✅ {len(before):,} rows compacted in {elapsed:.2f}s')
+    print(report.round(2).to_string())
+    print(f'\n📦 Memory: {total_before:,.1f} MB → {total_after:,.1f} MB '
+          f'({total_before / max(total_after, 1e-9):.1f}x smaller)')
+
+    # The kind of work the dashboard does on every rerun
+    dept = 'department' if 'department' in before.columns else None
+    if dept and 'attrition' in before.columns:
+        for label, fn in [
+            ('groupby department → attrition rate', lambda df: df['attrition'].eq(1).groupby(df[dept], observed=True).mean()),
+            ('filter one department', lambda df: df[df[dept] == df[dept].iloc[0]]),
+        ]:
+            old, new = _best_time(lambda: fn(before)), _best_time(lambda: fn(after))
+            print(f'⏱️  {label:<38} {old * 1000:8.1f} ms → {new * 1000:8.1f} ms ({old / max(new, 1e-9):.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,262 @@
+"""
+Attrition Scoring Engine
+Loads the trained model artifacts once and scores one employee or a whole
+workforce through the same NumPy-array code path.
+"""
+
+import hashlib
+import os
+import pickle
+import numpy as np
+import pandas as pd
+
+from tree_compiler import CompiledForest, source_stamp
+
+MODEL_DIR = 'models'
+COMPILED_MODEL = 'compiled_model.npz'
+# Category codes, thresholds and defaults the model was trained with (written by train.py)
+REFERENCE_FILE = 'reference.pkl'
+
+# Up to this many rows the compiled forest beats the estimator's own
+# predict_proba; larger batches amortize sklearn's per-call overhead
+COMPILED_MAX_ROWS = 256
+
+# String columns label-encoded in the notebook (LabelEncoder = sorted unique values)
+CATEGORICAL_COLUMNS = ['gender', 'education', 'marital_status', 'department', 'job_role']
+
+# Engineered features, in the order the notebook creates them
+ENGINEERED_FEATURES = [
+    'salary_per_tenure', 'recent_hike_flag', 'promotion_rate', 'overdue_promotion',
+    'high_overtime', 'work_life_risk', 'satisfaction_score', 'low_satisfaction',
+    'high_performer', 'training_intensity', 'projects_per_year'
+]
+
+# Risk bands from DATA_DICTIONARY.md: Low (0-0.3), Medium (0.3-0.7), High (0.7-1.0)
+RISK_THRESHOLDS = (0.3, 0.7)
+RISK_LABELS = np.array(['Low', 'Medium', 'High'])
+
+
+def risk_category(probabilities):
+    """Map attrition probabilities to Low/Medium/High labels"""
+    probabilities = np.asarray(probabilities, dtype=np.float64)
+    return RISK_LABELS[np.searchsorted(RISK_THRESHOLDS, probabilities, side='right')]
+
+
+def encode_record(scorer, record):
+    """One employee's fields (a dict) as model-ready floats; ValueError names the first bad field
+
+    Category fields take the labels the scorer was fitted with. Numeric codes are
+    refused once labels are known, since they could silently fall to the default.
+    """
+    encoded = {}
+    for name in scorer.base_features:
+        value = record.get(name)
+        if value is None:
+            continue
+        lookup = scorer.vocabularies.get(name)
+        if lookup is not None:
+            if not isinstance(value, str):
+                raise ValueError(f"'{name}' takes one of the labels {sorted(lookup)}, got {value!r}")
+            # Unseen labels fall back to the most common category, as in batch scoring
+            encoded[name] = float(lookup.get(value, scorer.defaults[name]))
+            continue
+        try:
+            encoded[name] = float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"'{name}' must be a number, got {value!r}") from None
+    return encoded
+
+
+def records_to_columns(scorer, records):
+    """Turn a list of encode_record() outputs into per-feature arrays, defaulting missing values"""
+    # Every feature gets a column, so even a batch of empty records has a row count
+    return {name: np.array([record.get(name, scorer.defaults[name]) for record in records], dtype=np.float64)
+            for name in scorer.base_features}
+
+
+def load_compiled(path, model_stamp):
+    """The compiled forest at `path`, or None if missing or built from another model"""
+    if not os.path.exists(path):
+        return None
+    try:
+        forest = CompiledForest.load(path)
+    except (OSError, ValueError, KeyError):
+        return None
+    return forest if forest.source_stamp == model_stamp else None
+
+
+class FeatureBuilder:
+    """The notebook's label encoding and feature engineering, shared by training and scoring"""
+
+    def __init__(self, feature_names, defaults=None):
+        self.feature_names = list(feature_names)
+        self.n_features = len(self.feature_names)
+        self.index = {name: i for i, name in enumerate(self.feature_names)}
+        self.base_features = [f for f in self.feature_names if f not in ENGINEERED_FEATURES]
+        self.defaults = dict(defaults or {})
+        self.vocabularies = {}
+        self.hike_median = self.defaults.get('salary_hike_pct', np.nan)
+        self.overtime_q75 = np.nan
+        # Set once statistics saved at training time are loaded; fit_reference() then keeps them
+        self.trained_reference = False
+
+    def fit_reference(self, df):
+        """Learn category codes, thresholds and default values from the employee data
+
+        A no-op when the reference the model was trained with has been loaded.
+        """
+        if self.trained_reference:
+            return self
+        for col in dict.fromkeys(CATEGORICAL_COLUMNS + self.base_features):
+            if col in df.columns and (df[col].dtype == object or isinstance(df[col].dtype, pd.CategoricalDtype)):
+                # Hash-count the labels instead of sorting every row
+                counts = df[col].value_counts()
+                labels = sorted(str(label) for label in counts.index)
+                self.vocabularies[col] = {label: code for code, label in enumerate(labels)}
+                self.defaults[col] = float(self.vocabularies[col][str(counts.idxmax())])
+        for col in self.base_features:
+            if col in df.columns and col not in self.vocabularies:
+                self.defaults[col] = float(df[col].median())
+        if 'salary_hike_pct' in df.columns:
+            self.hike_median = float(df['salary_hike_pct'].median())
+        if 'overtime_hours' in df.columns:
+            self.overtime_q75 = float(df['overtime_hours'].quantile(0.75))
+        return self
+
+    def reference(self):
+        """The fitted category codes, thresholds and defaults as plain Python values"""
+        return {
+            'vocabularies': {col: dict(vocab) for col, vocab in self.vocabularies.items()},
+            'defaults': {col: float(value) for col, value in self.defaults.items()},
+            'hike_median': float(self.hike_median),
+            'overtime_q75': float(self.overtime_q75),
+        }
+
+    def set_reference(self, reference):
+        """Adopt statistics from reference() instead of fitting them on data"""
+        self.vocabularies = {col: dict(vocab) for col, vocab in reference['vocabularies'].items()}
+        self.defaults.update(reference['defaults'])
+        self.hike_median = reference['hike_median']
+        self.overtime_q75 = reference['overtime_q75']
+        return self
+
+    def encode(self, name, values):
+        """Encode one raw column as float64, mapping category labels to their codes"""
+        values = np.asarray(values)
+        if values.dtype.kind not in 'OUS':
+            return values.astype(np.float64, copy=False)
+        lookup = self.vocabularies.get(name)
+        if lookup is None:
+            raise ValueError(f"No category codes for '{name}'; call fit_reference() first")
+        default = self.defaults[name]
+        if values.size <= 64:
+            return np.array([lookup.get(str(v), default) for v in values.ravel()], dtype=np.float64)
+        # Hash-factorize once, then look up the handful of distinct labels
+        labels, uniques = pd.factorize(values, use_na_sentinel=False)
+        codes = np.array([lookup.get(str(u), default) for u in uniques], dtype=np.float64)
+        return codes[labels]
+
+    def build_matrix(self, columns, n_rows=None):
+        """Assemble the raw (unscaled) feature matrix in feature_names.pkl order
+
+        `columns` is any mapping of column name to array-like (a DataFrame works);
+        base features it does not provide are filled with the reference defaults.
+        """
+        if n_rows is None:
+            n_rows = len(next(iter(columns.values()))) if isinstance(columns, dict) else len(columns)
+        # Column-major so every per-feature write and read below is contiguous
+        X = np.empty((n_rows, self.n_features), dtype=np.float64, order='F')
+        for name in self.base_features:
+            i = self.index[name]
+            if name in columns:
+                X[:, i] = self.encode(name, columns[name])
+            else:
+                X[:, i] = self.defaults[name]
+
+        col = lambda name: X[:, self.index[name]]
+        tenure_plus_one = col('tenure_years') + 1
+        engineered = {
+            'salary_per_tenure': col('base_salary') / tenure_plus_one,
+            'recent_hike_flag': col('salary_hike_pct') > self.hike_median,
+            'promotion_rate': col('tenure_years') / (col('years_since_promotion') + 1),
+            'overdue_promotion': col('years_since_promotion') > 3,
+            'high_overtime': col('overtime_hours') > self.overtime_q75,
+            'work_life_risk': (col('work_life_balance') < 3) & (col('overtime_hours') > 5),
+            'satisfaction_score': (col('job_satisfaction') + col('environment_satisfaction')
+                                   + col('work_life_balance')) / 3,
+            'high_performer': col('performance_rating') >= 4,
+            'training_intensity': col('training_hours') / tenure_plus_one,
+            'projects_per_year': col('projects_count') / tenure_plus_one,
+        }
+        engineered['low_satisfaction'] = engineered['satisfaction_score'] < 3
+        for name, values in engineered.items():
+            if name in self.index:
+                X[:, self.index[name]] = values
+        return X
+
+
+class AttritionScorer(FeatureBuilder):
+    """Vectorized scorer around best_model.pkl, scaler.pkl and feature_names.pkl"""
+
+    def __init__(self, model_dir=MODEL_DIR):
+        model_path = os.path.join(model_dir, 'best_model.pkl')
+        with open(model_path, 'rb') as f:
+            self.model = pickle.load(f)
+        self.model_stamp = source_stamp(model_path)
+        self.compiled = load_compiled(os.path.join(model_dir, COMPILED_MODEL), self.model_stamp)
+        with open(os.path.join(model_dir, 'scaler.pkl'), 'rb') as f:
+            self.scaler = pickle.load(f)
+        with open(os.path.join(model_dir, 'feature_names.pkl'), 'rb') as f:
+            feature_names = list(pickle.load(f))
+
+        # Scaling is done by hand to skip sklearn's per-call validation
+        self.mean = np.asarray(self.scaler.mean_, dtype=np.float64)
+        self.scale = np.asarray(self.scaler.scale_, dtype=np.float64)
+
+        # Until a reference is loaded or fitted, missing inputs fall back to the
+        # training means (a scaled value of 0) and the thresholds to estimates
+        super().__init__(feature_names, defaults={f: self.mean[i] for i, f in enumerate(feature_names)
+                                                  if f not in ENGINEERED_FEATURES})
+        overtime = self.index['overtime_hours']
+        self.overtime_q75 = self.mean[overtime] + 0.6745 * self.scale[overtime]
+
+        reference_path = os.path.join(model_dir, REFERENCE_FILE)
+        if os.path.exists(reference_path):
+            with open(reference_path, 'rb') as f:
+                self.set_reference(pickle.load(f))
+            self.trained_reference = True
+
+    def fingerprint(self):
+        """Digest of everything besides a row's own values that can change its score"""
+        h = hashlib.blake2b(digest_size=16)
+        h.update(self.model_stamp.encode())
+        h.update(self.mean.tobytes())
+        h.update(self.scale.tobytes())
+        # Numeric defaults only fill columns an input lacks entirely, so they are
+        # left out; category defaults also cover unseen labels and are kept
+        reference = [self.feature_names, self.hike_median, self.overtime_q75,
+                     sorted((col, sorted(vocab.items()), self.defaults[col])
+                            for col, vocab in self.vocabularies.items())]
+        h.update(repr(reference).encode())
+        return h.hexdigest()
+
+    def transform(self, X):
+        """Standardize a raw feature matrix in place"""
+        X -= self.mean
+        X /= self.scale
+        return X
+
+    def predict_scaled(self, X):
+        """Attrition probability for rows that are already engineered and scaled"""
+        if self.compiled is not None and X.shape[0] <= COMPILED_MAX_ROWS:
+            return self.compiled.predict_proba(X)[:, 1]
+        return self.model.predict_proba(X)[:, 1]
+
+    def predict_proba(self, columns):
+        """Attrition probability for every row of `columns`"""
+        return self.predict_scaled(self.transform(self.build_matrix(columns)))
+
+    def score_one(self, record):
+        """Attrition probability for a single employee given as a dict"""
+        columns = {name: np.asarray([value]) for name, value in record.items()}
+        return float(self.predict_proba(columns)[0])
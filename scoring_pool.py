@@ -0,0 +1,228 @@
+"""
+Shared Scoring Pool
+One bounded pool of scoring threads per process, shared by every Streamlit
+session. Single-employee requests that arrive together are coalesced into one
+model call. Bulk jobs (a whole uploaded file) are cut into chunks and scored
+one chunk at a time between them, so one analyst's large file never holds up
+the other sessions' predictions. Threads rather than processes keep a single
+copy of the model. The tree ensembles' predict loops release the GIL, so
+workers overlap on the model call itself.
+"""
+
+import itertools
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+import numpy as np
+import pandas as pd
+
+from scoring import encode_record, records_to_columns
+
+WORKERS = 2
+MAX_BATCH_SIZE = 256
+BATCH_WINDOW_MS = 2.0
+BULK_CHUNK_ROWS = 20_000
+MAX_PENDING = 10_000
+LATENCY_SAMPLES = 2048
+
+# Lower runs first; bulk chunks only start when no single request is waiting
+INTERACTIVE, BULK = 0, 1
+
+
+class PoolBusy(RuntimeError):
+    """Raised when the request queue is full"""
+
+
+class _BulkJob:
+    """A large scoring request, handed out one chunk at a time"""
+
+    def __init__(self, columns, n_rows, chunk_rows):
+        self.columns = columns
+        self.n_rows = n_rows
+        self.chunk_rows = chunk_rows
+        self.result = np.empty(n_rows, dtype=np.float64)
+        self.future = Future()
+        self.created = time.perf_counter()
+        self.next_start = 0
+        self.done_rows = 0
+        self.lock = threading.Lock()
+
+    def take(self):
+        """Row range of the next chunk, or None once every chunk has been handed out"""
+        with self.lock:
+            if self.next_start >= self.n_rows:
+                return None
+            start = self.next_start
+            self.next_start = min(start + self.chunk_rows, self.n_rows)
+            return start, self.next_start
+
+    def finish(self, start, stop, probabilities):
+        """Store one chunk's scores; True when it was the last one"""
+        self.result[start:stop] = probabilities
+        with self.lock:
+            self.done_rows += stop - start
+            return self.done_rows == self.n_rows
+
+
+class ScoringPool:
+    """Bounded thread pool scoring for every session through one AttritionScorer"""
+
+    def __init__(self, scorer, workers=WORKERS, max_batch_size=MAX_BATCH_SIZE, window_ms=BATCH_WINDOW_MS,
+                 chunk_rows=BULK_CHUNK_ROWS, max_pending=MAX_PENDING):
+        self.scorer = scorer
+        self.max_batch_size = max_batch_size
+        self.window = window_ms / 1000
+        self.chunk_rows = chunk_rows
+        self.max_pending = max_pending
+        self.queue = queue.PriorityQueue()
+        self._order = itertools.count()
+        self._lock = threading.Lock()
+        self._latency = {INTERACTIVE: deque(maxlen=LATENCY_SAMPLES), BULK: deque(maxlen=LATENCY_SAMPLES)}
+        self._counts = {'requests': 0, 'batches': 0, 'bulk_jobs': 0, 'bulk_rows': 0, 'errors': 0}
+        self._busy = 0
+        self._closed = False
+        self._threads = [threading.Thread(target=self._work, name=f'scoring-{i}', daemon=True)
+                         for i in range(workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def _put(self, priority, item):
+        if self._closed:
+            raise RuntimeError('The scoring pool has been shut down')
+        if self.queue.qsize() >= self.max_pending:
+            raise PoolBusy(f'{self.max_pending:,} scoring requests are already waiting')
+        self.queue.put((priority, next(self._order), item))
+
+    def submit(self, record):
+        """Future for one employee's attrition probability (record = dict of fields)
+
+        Raises ValueError for a record that cannot be encoded, before it is queued,
+        so it never fails the other sessions' requests coalesced with it.
+        """
+        encoded = encode_record(self.scorer, record)
+        future = Future()
+        self._put(INTERACTIVE, (encoded, future, time.perf_counter()))
+        return future
+
+    def score_one(self, record, timeout=None):
+        """Attrition probability for one employee, coalesced with concurrent requests"""
+        return self.submit(record).result(timeout)
+
+    def submit_bulk(self, columns, n_rows=None):
+        """Future for the probabilities of a whole frame (or mapping of column arrays)"""
+        if n_rows is None:
+            n_rows = len(columns) if isinstance(columns, pd.DataFrame) else len(next(iter(columns.values())))
+        job = _BulkJob(columns, n_rows, self.chunk_rows)
+        if n_rows == 0:
+            job.future.set_result(job.result)
+            return job.future
+        self._put(BULK, job)
+        return job.future
+
+    def score_bulk(self, columns, timeout=None):
+        """Attrition probabilities for every row, scored in chunks between interactive requests"""
+        return self.submit_bulk(columns).result(timeout)
+
+    def _work(self):
+        while True:
+            priority, _, item = self.queue.get()
+            if item is None:
+                return
+            with self._lock:
+                self._busy += 1
+            try:
+                if priority == INTERACTIVE:
+                    self._run_interactive([item])
+                else:
+                    self._run_bulk(item)
+            finally:
+                with self._lock:
+                    self._busy -= 1
+
+    def _run_interactive(self, batch):
+        # Coalesce whatever single requests arrive within the window into one model call
+        deadline = time.perf_counter() + self.window
+        while len(batch) < self.max_batch_size:
+            try:
+                priority, order, item = self.queue.get(timeout=max(deadline - time.perf_counter(), 0))
+            except queue.Empty:
+                break
+            if priority != INTERACTIVE or item is None:
+                # Not ours to coalesce; put it back with its place in line
+                self.queue.put((priority, order, item))
+                break
+            batch.append(item)
+
+        try:
+            probabilities = self.scorer.predict_proba(records_to_columns(self.scorer, [r for r, _, _ in batch]))
+        except Exception as exc:
+            with self._lock:
+                self._counts['errors'] += 1
+            for _, future, _ in batch:
+                future.set_exception(exc)
+            return
+        finished = time.perf_counter()
+        with self._lock:
+            self._counts['requests'] += len(batch)
+            self._counts['batches'] += 1
+            self._latency[INTERACTIVE].extend(finished - queued for _, _, queued in batch)
+        for (_, future, _), probability in zip(batch, probabilities):
+            future.set_result(float(probability))
+
+    def _run_bulk(self, job):
+        span = None if job.future.done() else job.take()
+        if span is None:
+            return
+        start, stop = span
+        if stop < job.n_rows:
+            # Back of the line: waiting single requests and other analysts' jobs go first
+            self.queue.put((BULK, next(self._order), job))
+        try:
+            if isinstance(job.columns, pd.DataFrame):
+                chunk = job.columns.iloc[start:stop]
+            else:
+                chunk = {name: values[start:stop] for name, values in job.columns.items()}
+            last = job.finish(start, stop, self.scorer.predict_proba(chunk))
+        except Exception as exc:
+            with self._lock:
+                self._counts['errors'] += 1
+            if not job.future.done():
+                job.future.set_exception(exc)
+            return
+        if last:
+            with self._lock:
+                self._counts['bulk_jobs'] += 1
+                self._counts['bulk_rows'] += job.n_rows
+                self._latency[BULK].append(time.perf_counter() - job.created)
+            job.future.set_result(job.result)
+
+    def metrics(self):
+        """Queue depth, throughput counters and latency percentiles (ms) since start"""
+        with self._lock:
+            counts = dict(self._counts)
+            latency = {lane: np.array(samples) for lane, samples in self._latency.items()}
+            busy = self._busy
+        stats = {
+            'queue_depth': self.queue.qsize(),
+            'busy_workers': busy,
+            'workers': len(self._threads),
+            **counts,
+            'mean_batch_size': round(counts['requests'] / counts['batches'], 2) if counts['batches'] else 0.0,
+        }
+        for lane, name in [(INTERACTIVE, 'request'), (BULK, 'bulk_job')]:
+            values = latency[lane] * 1000
+            for q in (50, 95, 99):
+                stats[f'{name}_p{q}_ms'] = round(float(np.percentile(values, q)), 3) if len(values) else None
+        return stats
+
+    def shutdown(self):
+        """Stop the workers once the requests already queued have been served"""
+        self._closed = True
+        for _ in self._threads:
+            # Sorts after every queued request of either lane
+            self.queue.put((BULK + 1, next(self._order), None))
+        for thread in self._threads:
+            thread.join()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Attrition Scoring Service
+FastAPI wrapper around AttritionScorer. Concurrent single-employee requests are
+gathered into micro-batches for a configurable window, so the model runs one
+predict_proba per batch instead of one per request.
+
+Usage:
+    pip install fastapi uvicorn pydantic
+    python scoring_service.py --port 8000 --window-ms 5 --max-batch 256
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import List, Optional, Union
+
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel
+
+from data_cache import read_csv_cached
+from scoring import AttritionScorer, MODEL_DIR, encode_record, records_to_columns, risk_category
+
+BATCH_WINDOW_MS = float(os.environ.get('ATTRITION_BATCH_WINDOW_MS', 5))
+MAX_BATCH_SIZE = int(os.environ.get('ATTRITION_MAX_BATCH', 256))
+REFERENCE_DATA = os.environ.get('ATTRITION_REFERENCE_DATA', 'employee.csv')
+
+
+class Employee(BaseModel):
+    """Raw employee attributes; omitted fields default to the typical employee"""
+    employee_id: Optional[int] = None
+    age: Optional[float] = None
+    gender: Optional[Union[str, int]] = None
+    education: Optional[Union[str, int]] = None
+    marital_status: Optional[Union[str, int]] = None
+    department: Optional[Union[str, int]] = None
+    job_role: Optional[Union[str, int]] = None
+    tenure_years: Optional[float] = None
+    years_since_promotion: Optional[float] = None
+    base_salary: Optional[float] = None
+    salary_hike_pct: Optional[float] = None
+    stock_options: Optional[float] = None
+    performance_rating: Optional[float] = None
+    training_hours: Optional[float] = None
+    overtime_hours: Optional[float] = None
+    work_life_balance: Optional[float] = None
+    commute_distance: Optional[float] = None
+    projects_count: Optional[float] = None
+    num_companies_worked: Optional[float] = None
+    job_satisfaction: Optional[float] = None
+    environment_satisfaction: Optional[float] = None
+    manager_rating: Optional[float] = None
+
+
+class Prediction(BaseModel):
+    employee_id: Optional[int] = None
+    attrition_risk_score: float
+    risk_category: str
+
+
+class MicroBatcher:
+    """Collects single scoring requests and scores them together"""
+
+    def __init__(self, scorer, window_ms=BATCH_WINDOW_MS, max_batch_size=MAX_BATCH_SIZE):
+        self.scorer = scorer
+        self.window = window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self.queue = asyncio.Queue()
+        self.batches = 0
+        self.requests = 0
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def score(self, record):
+        """Validate and queue one record, then wait for its probability"""
+        # Encoded before queueing, so a bad record fails alone instead of its whole micro-batch
+        encoded = encode_record(self.scorer, record)
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((encoded, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            # The window starts with the first request, so a lone call waits at most `window`
+            deadline = loop.time() + self.window
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            records = [record for record, _ in batch]
+            try:
+                # Run the model off the event loop so new requests keep queueing
+                probabilities = await loop.run_in_executor(None, self.predict_records, records)
+            except Exception as exc:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            self.batches += 1
+            self.requests += len(batch)
+            for (_, future), probability in zip(batch, probabilities):
+                if not future.done():
+                    future.set_result(float(probability))
+
+    def predict_records(self, records):
+        """Score a list of encoded records in one model call"""
+        return self.scorer.predict_proba(records_to_columns(self.scorer, records))
+
+    def encode_records(self, records):
+        """encode_record() for each field dict; the ValueError says which one is bad"""
+        encoded = []
+        for i, record in enumerate(records):
+            try:
+                encoded.append(encode_record(self.scorer, record))
+            except ValueError as exc:
+                raise ValueError(f'employee {i}: {exc}') from None
+        return encoded
+
+
+def load_scorer(model_dir=MODEL_DIR, reference_data=REFERENCE_DATA):
+    """Load the model artifacts and fit encoders on the reference data if present"""
+    scorer = AttritionScorer(model_dir)
+    if reference_data and os.path.exists(reference_data):
+        scorer.fit_reference(read_csv_cached(reference_data))
+    return scorer
+
+
+def create_app(scorer=None, window_ms=BATCH_WINDOW_MS, max_batch_size=MAX_BATCH_SIZE):
+    """Build the FastAPI app; pass a scorer to skip loading from disk"""
+    state = {}
+
+    @asynccontextmanager
+    async def lifespan(app):
+        state['batcher'] = MicroBatcher(scorer or load_scorer(), window_ms, max_batch_size)
+        state['batcher'].start()
+        state['started'] = time.time()
+        yield
+        await state['batcher'].stop()
+
+    app = FastAPI(title='Employee Attrition Scoring Service', lifespan=lifespan)
+
+    @app.get('/health')
+    async def health():
+        batcher = state['batcher']
+        return {
+            'status': 'ok',
+            'uptime_seconds': round(time.time() - state['started'], 1),
+            'requests_scored': batcher.requests,
+            'batches_run': batcher.batches,
+            'mean_batch_size': round(batcher.requests / batcher.batches, 2) if batcher.batches else 0.0,
+            'queue_depth': batcher.queue.qsize()
+        }
+
+    @app.post('/predict', response_model=Prediction)
+    async def predict(employee: Employee):
+        record = employee.model_dump()
+        try:
+            probability = await state['batcher'].score(record)
+        except ValueError as exc:
+            raise HTTPException(status_code=422, detail=str(exc))
+        return Prediction(employee_id=employee.employee_id, attrition_risk_score=probability,
+                          risk_category=str(risk_category(probability)))
+
+    @app.post('/predict/batch', response_model=List[Prediction])
+    async def predict_batch(employees: List[Employee]):
+        # Callers that already batch skip the queue and get one model call
+        batcher = state['batcher']
+        try:
+            records = batcher.encode_records([e.model_dump() for e in employees])
+        except ValueError as exc:
+            raise HTTPException(status_code=422, detail=str(exc))
+        probabilities = await asyncio.get_running_loop().run_in_executor(None, batcher.predict_records, records)
+        categories = risk_category(probabilities)
+        return [Prediction(employee_id=e.employee_id, attrition_risk_score=float(p), risk_category=str(c))
+                for e, p, c in zip(employees, probabilities, categories)]
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the attrition scoring service')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--window-ms', type=float, default=BATCH_WINDOW_MS, help='Micro-batch collection window')
+    parser.add_argument('--max-batch', type=int, default=MAX_BATCH_SIZE, help='Largest micro-batch')
+    args = parser.parse_args()
+
+    import uvicorn
+    uvicorn.run(create_app(window_ms=args.window_ms, max_batch_size=args.max_batch),
+                host=args.host, port=args.port)
+
+
+if __name__ == '__main__':
+    main()
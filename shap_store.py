@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+SHAP Explanation Store
+Computes SHAP values for every employee offline, in parallel chunks, and keeps
+them as a memory-mapped float32 matrix (one column per feature_names.pkl entry)
+with an employee_id index, so the app can show a person's top risk drivers
+without running SHAP at request time.
+
+Usage:
+    pip install shap
+    python shap_store.py --input employee.csv --chunksize 20000 --workers 4
+    python shap_store.py --features   # reuse the scaled matrix from feature_store.py
+"""
+
+import argparse
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from batch_score import fit_reference_streaming
+from data_cache import file_version
+from employee_store import EmployeeStore
+from feature_store import FeatureStore
+from scoring import AttritionScorer, MODEL_DIR
+from tree_compiler import source_stamp
+
+VALUES_FILE = 'shap_values.npy'
+INDEX_FILE = 'shap_index.npz'
+
+# Same background size and seed as the notebook's shap.sample(X_train, 100, random_state=42)
+BACKGROUND_SIZE = 100
+RANDOM_STATE = 42
+# Largest gap between the summed SHAP values and the model output before a run is flagged
+ADDITIVITY_TOLERANCE = 1e-3
+
+_worker = {}
+
+
+class ShapStore:
+    """Read-only, memory-mapped SHAP values looked up by employee_id"""
+
+    def __init__(self, values, ids, meta):
+        self.values = values
+        self.meta = meta
+        self.feature_names = meta['feature_names']
+        self.expected_value = meta['expected_value']
+        self.index = EmployeeStore(pd.DataFrame({'employee_id': ids}))
+
+    @classmethod
+    def open(cls, directory='.', model_dir=MODEL_DIR, data_path=None):
+        """Map the store in `directory`; None if missing or computed for another model or other data"""
+        values_path = os.path.join(directory, VALUES_FILE)
+        index_path = os.path.join(directory, INDEX_FILE)
+        if not (os.path.exists(values_path) and os.path.exists(index_path)):
+            return None
+        with np.load(index_path) as data:
+            ids = data['employee_id']
+            meta = json.loads(str(data['meta']))
+        model_path = os.path.join(model_dir, 'best_model.pkl')
+        if os.path.exists(model_path) and meta.get('model_stamp') != source_stamp(model_path):
+            return None
+        # Rows are matched by employee_id only, so values for an older employee.csv would look current
+        if data_path is not None and os.path.exists(data_path) and meta.get('data_version') != file_version(data_path):
+            return None
+        # Pages are read on demand, so opening costs the same for 5k or 5M employees
+        values = np.load(values_path, mmap_mode='r')
+        if values.shape != (len(ids), len(meta['feature_names'])):
+            return None
+        return cls(values, ids, meta)
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, employee_id):
+        return employee_id in self.index
+
+    def get(self, employee_id):
+        """SHAP values for one employee as a Series, or None if unknown"""
+        position = self.index.locate([employee_id])[0]
+        if position < 0:
+            return None
+        return pd.Series(np.asarray(self.values[position], dtype=np.float64),
+                         index=self.feature_names, name=employee_id)
+
+    def top_drivers(self, employee_id, n=5):
+        """The `n` features with the largest effect on this employee's risk"""
+        row = self.get(employee_id)
+        if row is None:
+            return None
+        top = row.reindex(row.abs().sort_values(ascending=False).index[:n])
+        return pd.DataFrame({
+            'Feature': top.index,
+            'SHAP Impact': top.to_numpy(),
+            'Effect': np.where(top.to_numpy() > 0, '⬆️ Raises risk', '⬇️ Lowers risk')
+        })
+
+
+def sample_background(scorer, path, n_rows, size=BACKGROUND_SIZE, random_state=RANDOM_STATE, features=None):
+    """Scaled feature rows sampled from the input, used as the explainer's background"""
+    if size <= 0:
+        return None
+    rng = np.random.RandomState(random_state)
+    positions = rng.choice(n_rows, size=min(size, n_rows), replace=False)
+    if features is not None:
+        # The same rows, in file order, taken from the precomputed matrix
+        return np.asarray(features.values[np.sort(positions)], dtype=np.float64)
+    keep = set(positions + 1)
+    # Row 0 is the header; every other unsampled line is skipped while parsing
+    sample = pd.read_csv(path, skiprows=lambda i: i > 0 and i not in keep)
+    return scorer.transform(scorer.build_matrix(sample))
+
+
+def make_explainer(model, background):
+    """TreeExplainer that sends every row down the same branches as the model itself
+
+    sklearn trees compare float32(x) against a float64 threshold, while shap rounds
+    the threshold to float32, so a value just above a split can take the other
+    branch and break additivity. Flooring each threshold to float32 and explaining
+    float32 inputs makes both sides agree.
+    """
+    import shap
+    explainer = shap.TreeExplainer(model, None if background is None else _float32(background))
+    thresholds = getattr(explainer.model, 'thresholds', None)
+    if thresholds is not None and thresholds.dtype == np.float64:
+        floor = thresholds.astype(np.float32)
+        above = floor > thresholds
+        floor[above] = np.nextafter(floor[above], np.float32(-np.inf))
+        explainer.model.thresholds = floor.astype(np.float64)
+    return explainer
+
+
+def _float32(X):
+    """The values the model actually compares, kept as float64 for shap"""
+    return np.asarray(X, dtype=np.float32).astype(np.float64)
+
+
+def _init_worker(scorer, background, values_path, features_path=None):
+    """Build one explainer (and map the feature store, if used) per worker process"""
+    _worker['scorer'] = scorer
+    _worker['explainer'] = make_explainer(scorer.model, background)
+    _worker['values_path'] = values_path
+    _worker['features'] = None if features_path is None else np.load(features_path, mmap_mode='r')
+
+
+def _expected_value(explainer):
+    expected = np.ravel(explainer.expected_value)
+    return float(expected[-1])
+
+
+def _explain_chunk(chunk, start):
+    """Write SHAP values for one CSV chunk straight into the shared memory map"""
+    scorer = _worker['scorer']
+    return _explain(scorer.transform(scorer.build_matrix(chunk)), start)
+
+
+def _explain_rows(start, stop):
+    """Write SHAP values for rows [start, stop) of the mapped feature store"""
+    return _explain(np.asarray(_worker['features'][start:stop], dtype=np.float64), start)
+
+
+def _explain(X, start):
+    """SHAP values of scaled rows, written at `start` in the output memory map
+
+    Returns the number of rows and the largest additivity error among them.
+    """
+    explainer = _worker['explainer']
+    X = _float32(X)
+    # Checked below against our own tolerance, so one borderline row reports instead of aborting the run
+    values = explainer.shap_values(X, check_additivity=False)
+    # Older shap returns one array per class, newer a (rows, features, classes) cube
+    if isinstance(values, list):
+        values = values[-1]
+    elif values.ndim == 3:
+        values = values[:, :, -1]
+    output = np.asarray(explainer.model.predict(X))
+    if output.ndim == 2:
+        output = output[:, -1]
+    error = float(np.abs(values.sum(axis=1) + _expected_value(explainer) - output).max()) if len(X) else 0.0
+    out = np.load(_worker['values_path'], mmap_mode='r+')
+    out[start:start + len(X)] = values.astype(np.float32)
+    out.flush()
+    del out
+    return len(X), error
+
+
+def build_store(input_path='employee.csv', output_dir='.', model_dir=MODEL_DIR,
+                chunksize=20_000, workers=None, background_size=BACKGROUND_SIZE, features=None):
+    """Compute SHAP values for every row of `input_path`; returns (rows, largest additivity error)
+
+    With `features` (an open FeatureStore built from `input_path`), the scaled
+    rows are read from its memory map instead of re-parsing and transforming the CSV.
+    """
+    workers = workers or os.cpu_count() or 1
+    # Taken before reading, so an edit made mid-run leaves the store looking stale rather than current
+    data_version = file_version(input_path)
+    scorer = fit_reference_streaming(AttritionScorer(model_dir), input_path, chunksize)
+    if features is not None:
+        if features.meta.get('fingerprint') != scorer.fingerprint():
+            raise ValueError('The feature store was built for another model or dataset; rebuild it')
+        ids = features.ids
+        background = sample_background(scorer, input_path, len(ids), background_size, features=features)
+    else:
+        ids = pd.read_csv(input_path, usecols=['employee_id'])['employee_id'].to_numpy()
+        background = sample_background(scorer, input_path, len(ids), background_size)
+    features_path = None if features is None else features.path
+
+    os.makedirs(output_dir, exist_ok=True)
+    values_path = os.path.join(output_dir, VALUES_FILE)
+    index_path = os.path.join(output_dir, INDEX_FILE)
+    # Written under temporary names and swapped in at the end, so an open store
+    # keeps serving the previous values until the new ones are complete
+    values_tmp = f'{values_path}.{os.getpid()}.tmp.npy'
+
+    def tasks():
+        """(function, args) per chunk, each carrying its start row"""
+        if features is not None:
+            # Workers slice the mapped matrix themselves; only row ranges are sent
+            for start in range(0, len(ids), chunksize):
+                yield _explain_rows, (start, min(start + chunksize, len(ids)))
+            return
+        start = 0
+        for chunk in pd.read_csv(input_path, chunksize=chunksize):
+            yield _explain_chunk, (chunk, start)
+            start += len(chunk)
+
+    max_error = 0.0
+    try:
+        np.lib.format.open_memmap(values_tmp, mode='w+', dtype=np.float32,
+                                  shape=(len(ids), scorer.n_features)).flush()
+        if workers == 1:
+            _init_worker(scorer, background, values_tmp, features_path)
+            for explain, args in tasks():
+                max_error = max(max_error, explain(*args)[1])
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(scorer, background, values_tmp, features_path)) as pool:
+                pending = deque()
+                for explain, args in tasks():
+                    pending.append(pool.submit(explain, *args))
+                    # Bound the number of parsed chunks waiting in the queue
+                    if len(pending) >= 2 * workers:
+                        max_error = max(max_error, pending.popleft().result()[1])
+                while pending:
+                    max_error = max(max_error, pending.popleft().result()[1])
+
+        # The workers' explainers are gone; the base value is cheap to rebuild here
+        expected_value = _expected_value(make_explainer(scorer.model, background))
+    except BaseException:
+        # A failed run leaves the previous store as it was and no half-written file behind
+        if os.path.exists(values_tmp):
+            os.remove(values_tmp)
+        raise
+
+    meta = {
+        'feature_names': scorer.feature_names,
+        'expected_value': expected_value,
+        'model_stamp': scorer.model_stamp,
+        'data_version': data_version,
+        'background_size': 0 if background is None else len(background),
+        'additivity_max_error': max_error,
+        'created': time.strftime('%Y-%m-%d %H:%M:%S')
+    }
+    index_tmp = f'{index_path}.{os.getpid()}.tmp.npz'
+    np.savez(index_tmp, employee_id=ids, meta=np.array(json.dumps(meta)))
+    os.replace(values_tmp, values_path)
+    os.replace(index_tmp, index_path)
+    return len(ids), max_error
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Precompute per-employee SHAP values into a memory-mapped store')
+    parser.add_argument('--input', default='employee.csv', help='Employee CSV to explain')
+    parser.add_argument('--output-dir', default='.', help=f'Directory for {VALUES_FILE} and {INDEX_FILE}')
+    parser.add_argument('--model-dir', default=MODEL_DIR, help='Directory holding the model artifacts')
+    parser.add_argument('--chunksize', type=int, default=20_000, help='Rows per chunk')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--background', type=int, default=BACKGROUND_SIZE,
+                        help='Background rows for interventional SHAP (0 = tree path dependent, much faster)')
+    parser.add_argument('--features', nargs='?', const='.', default=None, metavar='DIR',
+                        help='Explain rows from the feature store built by feature_store.py (default dir: .)')
+    args = parser.parse_args()
+
+    print('=' * 70)
+    print('🔍 SHAP EXPLANATION STORE')
+    print('=' * 70)
+    features = None
+    if args.features is not None:
+        features = FeatureStore.open(args.features, args.model_dir, args.input)
+        if features is None:
+            parser.error(f'No current feature store in {args.features}; run feature_store.py first')
+    start = time.perf_counter()
+    n_rows, max_error = build_store(args.input, args.output_dir, args.model_dir, args.chunksize,
+                                    args.workers, args.background, features)
+    elapsed = time.perf_counter() - start
+    print(f'✅ Explained {n_rows:,} employees in {elapsed:.1f}s ({n_rows / max(elapsed, 1e-9):,.0f} rows/s)')
+    if max_error <= ADDITIVITY_TOLERANCE:
+        print(f'✅ Additivity: SHAP values sum to the model output within {max_error:.2g}')
+    else:
+        print(f'⚠️  Additivity: SHAP values miss the model output by up to {max_error:.4f} '
+              f'(tolerance {ADDITIVITY_TOLERANCE:g})')
+    print(f'📁 Wrote {os.path.join(args.output_dir, VALUES_FILE)} and {os.path.join(args.output_dir, INDEX_FILE)}')
+
+
+if __name__ == '__main__':
+    main()
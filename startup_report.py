@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Startup Time Report
+Imports app.py in fresh interpreters under `python -X importtime` and reports
+the cold-start import cost, the packages it is spent in, and which heavy
+plotting/ML libraries get loaded before any page is opened.
+
+Usage:
+    python startup_report.py --runs 3 --top 15
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+# Libraries app.py should only load once a page actually needs them
+DEFERRED_PACKAGES = ['matplotlib', 'seaborn', 'scipy', 'sklearn', 'xgboost', 'shap']
+
+
+def import_times(module, cwd):
+    """Self and cumulative import time (µs) per module for one cold import"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=cwd, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f'import {module} failed:\n{result.stderr[-2000:]}')
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def summarize(runs, module):
+    """Best-of-N totals, per-package self time and the deferred packages that loaded"""
+    best = min(runs, key=lambda times: times[module][1])
+    by_package = defaultdict(int)
+    for name, (self_us, _) in best.items():
+        by_package[name.split('.')[0]] += self_us
+    loaded = [p for p in DEFERRED_PACKAGES if p in best]
+    return best[module][1], best[module][0], by_package, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure cold-start import time of the Streamlit app')
+    parser.add_argument('--module', default='app', help='Module to import')
+    parser.add_argument('--runs', type=int, default=3, help='Fresh interpreters to measure (best is reported)')
+    parser.add_argument('--top', type=int, default=15, help='Packages to list')
+    args = parser.parse_args()
+
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    print('=' * 70)
+    print(f'⏱️  COLD-START IMPORT REPORT: {args.module}')
+    print('=' * 70)
+
+    runs = [import_times(args.module, cwd) for _ in range(args.runs)]
+    total_us, own_us, by_package, loaded = summarize(runs, args.module)
+
+    print(f'\nTotal import time:  {total_us / 1e6:.3f}s (best of {args.runs})')
+    print(f'{args.module}.py itself: {own_us / 1e6:.3f}s')
+    print(f'\nTop {args.top} packages by self time:')
+    for package, self_us in sorted(by_package.items(), key=lambda item: -item[1])[:args.top]:
+        print(f'  {package:<30} {self_us / 1e3:>9.1f} ms  {self_us / total_us * 100:>5.1f}%')
+
+    if loaded:
+        print(f'\n⚠️  Loaded at startup: {", ".join(loaded)}')
+    else:
+        print(f'\n✅ None of {", ".join(DEFERRED_PACKAGES)} loaded at startup')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Out-of-Core Summary Statistics
+One chunked pass produces what df.describe() and df.isnull().sum() report:
+count, mean, std, min/max and null counts are exact, and the 25/50/75%
+quantiles come from a KLL sketch. Every piece merges, so partitions can be
+summarized separately (or in parallel) and combined.
+
+Usage:
+    python summary_stats.py --input employee.csv --chunksize 500000 --output employee_stats.pkl
+"""
+
+import argparse
+import pickle
+import time
+
+import numpy as np
+import pandas as pd
+
+QUANTILES = (0.25, 0.5, 0.75)
+
+
+class KLLSketch:
+    """Mergeable quantile sketch (Karnin-Lang-Liberty) whose rank error shrinks as 1/k"""
+
+    def __init__(self, k=2000, seed=0):
+        self.k = k
+        self.levels = [np.empty(0)]
+        self.n = 0
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        # Lower levels hold fewer items, geometrically shrinking by 2/3
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def update(self, values):
+        """Add a batch of values (NaN ignored)"""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return self
+        self.n += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other):
+        """Fold another sketch's items into this one"""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.n += other.n
+        self._compress()
+        return self
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                # An odd item stays behind so promoted weight stays exact
+                keep = items[-1:] if len(items) % 2 else items[:0]
+                paired = items[:len(items) - len(keep)]
+                promoted = paired[self._rng.integers(2)::2]
+                self.levels[level] = keep
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    def quantile(self, q):
+        """Approximate q-quantile(s); exact (linearly interpolated) until the first compaction"""
+        if self.n == 0:
+            return np.full(np.shape(q), np.nan)
+        if len(self.levels) == 1:
+            return np.quantile(self.levels[0], q)
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2.0 ** level) for level, items in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        cumulative = np.cumsum(weights[order])
+        ranks = np.asarray(q) * (cumulative[-1] - 1) + 1
+        return items[order][np.minimum(np.searchsorted(cumulative, ranks), len(items) - 1)]
+
+
+class ColumnStats:
+    """Exact moments and extremes plus a quantile sketch for one numeric column"""
+
+    def __init__(self, k=2000):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.sketch = KLLSketch(k)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return self
+        mean = float(values.mean())
+        self._merge_moments(len(values), mean, float(((values - mean) ** 2).sum()),
+                            float(values.min()), float(values.max()))
+        self.sketch.update(values)
+        return self
+
+    def merge(self, other):
+        if other.count:
+            self._merge_moments(other.count, other.mean, other.m2, other.min, other.max)
+        self.sketch.merge(other.sketch)
+        return self
+
+    def _merge_moments(self, count, mean, m2, lo, hi):
+        # Chan et al. pairwise update: exact and stable regardless of how rows are split
+        total = self.count + count
+        delta = mean - self.mean
+        self.m2 += m2 + delta ** 2 * self.count * count / total
+        self.mean += delta * count / total
+        self.count = total
+        self.min = min(self.min, lo)
+        self.max = max(self.max, hi)
+
+    @property
+    def std(self):
+        return np.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else np.nan
+
+
+class SummaryStatistics:
+    """describe()-style summary and null counts accumulated chunk by chunk"""
+
+    def __init__(self, k=2000):
+        self.k = k
+        self.rows = 0
+        self.nulls = {}
+        self.columns = {}
+
+    def update(self, chunk):
+        """Add a DataFrame chunk"""
+        self.rows += len(chunk)
+        for col, n_null in chunk.isna().sum().items():
+            self.nulls[col] = self.nulls.get(col, 0) + int(n_null)
+        for col in chunk.select_dtypes(include=[np.number]).columns:
+            if col not in self.columns:
+                self.columns[col] = ColumnStats(self.k)
+            self.columns[col].update(chunk[col].to_numpy())
+        return self
+
+    def merge(self, other):
+        """Combine with the summary of another partition"""
+        self.rows += other.rows
+        for col, n_null in other.nulls.items():
+            self.nulls[col] = self.nulls.get(col, 0) + n_null
+        for col, stats in other.columns.items():
+            if col in self.columns:
+                self.columns[col].merge(stats)
+            else:
+                self.columns[col] = stats
+        return self
+
+    def describe(self):
+        """Same layout as DataFrame.describe() for the numeric columns"""
+        index = ['count', 'mean', 'std', 'min'] + [f'{q:.0%}' for q in QUANTILES] + ['max']
+        table = {}
+        for col, s in self.columns.items():
+            empty = s.count == 0
+            table[col] = [s.count, np.nan if empty else s.mean, s.std,
+                          np.nan if empty else s.min,
+                          *s.sketch.quantile(list(QUANTILES)),
+                          np.nan if empty else s.max]
+        return pd.DataFrame(table, index=index, dtype=np.float64)
+
+    def missing(self):
+        """Null count per column, like df.isnull().sum()"""
+        return pd.Series(self.nulls, dtype=np.int64)
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            pickle.dump(self, f)
+
+    @staticmethod
+    def load(path):
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+
+def summarize_frame(df, chunksize=100_000, k=2000):
+    """Summary of an in-memory frame, built in row blocks"""
+    stats = SummaryStatistics(k)
+    for start in range(0, len(df), chunksize):
+        stats.update(df.iloc[start:start + chunksize])
+    return stats
+
+
+def summarize_csv(path, chunksize=500_000, k=2000):
+    """Summary of a CSV streamed in chunks, for files larger than memory"""
+    stats = SummaryStatistics(k)
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        stats.update(chunk)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='One-pass describe() and missing-value report for a CSV')
+    parser.add_argument('--input', default='employee.csv', help='CSV to summarize')
+    parser.add_argument('--chunksize', type=int, default=500_000, help='Rows per chunk')
+    parser.add_argument('--k', type=int, default=2000, help='Quantile sketch size (larger = more accurate)')
+    parser.add_argument('--output', default=None, help='Optional pickle to save the mergeable summary to')
+    args = parser.parse_args()
+
+    print('=' * 70)
+    print('📊 SUMMARY STATISTICS')
+    print('=' * 70)
+    start = time.perf_counter()
+    stats = summarize_csv(args.input, args.chunksize, args.k)
+    elapsed = time.perf_counter() - start
+    print(f'✅ Summarized {stats.rows:,} rows in {elapsed:.1f}s\n')
+    with pd.option_context('display.width', 200, 'display.max_columns', 50):
+        print(stats.describe().round(3).T)
+    missing = stats.missing()
+    missing = missing[missing > 0]
+    print('\n' + (f'⚠️  Missing values:\n{missing}' if not missing.empty else '✅ No missing values'))
+    if args.output:
+        stats.save(args.output)
+        print(f'📁 Wrote {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+FilterIndex must select exactly the rows the pages' original isin()/>= filters did,
+including when the risk, department or score columns contain missing values.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from filter_index import FilterIndex
+
+
+def make_predictions(n_rows=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({
+        'RiskLevel': rng.choice(['High', 'Medium', 'Low'], n_rows).astype(object),
+        'Department': rng.choice(['Sales', 'R&D', 'HR'], n_rows).astype(object),
+        'Attrition_Probability': rng.random(n_rows),
+    })
+    frame.loc[rng.random(n_rows) < 0.1, 'RiskLevel'] = np.nan
+    frame.loc[rng.random(n_rows) < 0.1, 'Department'] = np.nan
+    frame.loc[rng.random(n_rows) < 0.05, 'Attrition_Probability'] = np.nan
+    return frame
+
+
+def baseline_filter(frame, filters, min_score=None):
+    """The copy()/isin() chain the pages used before the index"""
+    filtered = frame.copy()
+    for col, selected in filters.items():
+        if len(selected):
+            filtered = filtered[filtered[col].isin(selected)]
+    if min_score is not None:
+        filtered = filtered[filtered['Attrition_Probability'] >= min_score]
+    return filtered
+
+
+def make_index(frame):
+    return FilterIndex(frame, categorical=['RiskLevel', 'Department'], score='Attrition_Probability')
+
+
+def test_missing_values_are_a_filter_value():
+    frame = make_predictions()
+    index = make_index(frame)
+
+    assert any(pd.isna(value) for value in index.values('RiskLevel'))
+    assert any(pd.isna(value) for value in index.values('Department'))
+
+
+def test_selecting_every_value_keeps_every_row():
+    frame = make_predictions()
+    index = make_index(frame)
+    filters = {col: index.values(col) for col in ('RiskLevel', 'Department')}
+
+    assert len(index.filter(filters)) == len(baseline_filter(frame, filters)) == len(frame)
+
+
+def test_row_counts_match_baseline_with_nans():
+    frame = make_predictions()
+    index = make_index(frame)
+    cases = [
+        ({'RiskLevel': ['High']}, None),
+        ({'RiskLevel': ['High', np.nan]}, None),
+        ({'Department': [float('nan')]}, None),
+        ({'RiskLevel': [np.nan], 'Department': ['Sales', np.nan]}, None),
+        ({'RiskLevel': ['High', 'Medium'], 'Department': []}, 0.5),
+        ({'RiskLevel': [np.nan]}, 0.0),
+        ({}, 0.7),
+    ]
+    for filters, min_score in cases:
+        expected = baseline_filter(frame, filters, min_score)
+        result = index.filter(filters, min_score=min_score)
+        assert len(result) == len(expected), (filters, min_score)
+        assert result.index.equals(expected.index), (filters, min_score)
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Model Training Pipeline
+The notebook's modelling section as a script: feature engineering, label
+encoding, the 80/20 stratified split and scaling (cached between runs), then
+every candidate's holdout fit and cross-validation folds in parallel on a
+process pool. Features come from the scorer's own FeatureBuilder. Writes
+best_model.pkl, scaler.pkl, feature_names.pkl, reference.pkl (the training
+category codes and thresholds) and Model.csv, and recompiles
+compiled_model.npz for the new model.
+
+Usage:
+    python train.py --input employee.csv --workers 4
+    python train.py --models "Random Forest" "Gradient Boosting" --cv 10
+"""
+
+import argparse
+import json
+import os
+import pickle
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score, roc_auc_score
+from sklearn.model_selection import StratifiedKFold, train_test_split
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+
+from scoring import COMPILED_MODEL, ENGINEERED_FEATURES, MODEL_DIR, REFERENCE_FILE, FeatureBuilder
+from tree_compiler import compile_file, source_stamp
+
+TARGET = 'attrition'
+DROP_COLUMNS = ['employee_id', 'attrition_risk_score', 'tenure_category']
+RANDOM_STATE = 42
+TEST_SIZE = 0.2
+CV_FOLDS = 5
+METRICS = ['Accuracy', 'Precision', 'Recall', 'F1-Score', 'AUC-ROC']
+
+CACHE_DIR = '.train_cache'
+# Bump whenever prepare_data or the scorer's feature builder change, so cached matrices are rebuilt
+FEATURE_VERSION = 2
+REPORT_FILE = 'training_report.json'
+
+_worker = {}
+
+
+def model_feature_names(df):
+    """Model inputs in the notebook's column order: the raw columns, then the engineered ones"""
+    return [c for c in df.columns if c not in DROP_COLUMNS and c != TARGET] + ENGINEERED_FEATURES
+
+
+def prepare_data(df, test_size=TEST_SIZE, random_state=RANDOM_STATE):
+    """Encoded, split and scaled matrices exactly as the notebook builds them"""
+    feature_names = model_feature_names(df)
+    # The scorer's own encoder and feature builder, so training and serving cannot drift apart
+    builder = FeatureBuilder(feature_names).fit_reference(df)
+    X = pd.DataFrame(builder.build_matrix(df), columns=feature_names)
+    y = df[TARGET]
+    y = LabelEncoder().fit_transform(y.astype(str)) if y.dtype == object else y.to_numpy()
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=test_size,
+                                                        random_state=random_state, stratify=y)
+    scaler = StandardScaler()
+    return {
+        'X_train': scaler.fit_transform(X_train),
+        'X_test': scaler.transform(X_test),
+        'y_train': y_train,
+        'y_test': y_test,
+        'scaler': scaler,
+        'feature_names': feature_names,
+        'reference': builder.reference(),
+    }
+
+
+def load_prepared(path, use_cache=True, test_size=TEST_SIZE, random_state=RANDOM_STATE):
+    """Prepared matrices for `path`, from the feature cache when the input is unchanged
+
+    Returns (data, cache_hit).
+    """
+    key = f'{source_stamp(path)[:16]}.v{FEATURE_VERSION}.{test_size}.{random_state}'
+    cached = os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIR,
+                          f'{os.path.basename(path)}.{key}.pkl')
+    if use_cache and os.path.exists(cached):
+        try:
+            with open(cached, 'rb') as f:
+                return pickle.load(f), True
+        except (OSError, EOFError, pickle.UnpicklingError):
+            pass
+
+    data = prepare_data(pd.read_csv(path), test_size, random_state)
+    if use_cache:
+        tmp = f'{cached}.{os.getpid()}.tmp'
+        try:
+            os.makedirs(os.path.dirname(cached), exist_ok=True)
+            with open(tmp, 'wb') as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, cached)
+        except OSError:
+            # A read-only checkout still trains, just without the cache
+            if os.path.exists(tmp):
+                os.remove(tmp)
+    return data, False
+
+
+def candidate_models(y_train, names=None):
+    """The notebook's candidates, with XGBoost only if it is installed"""
+    models = OrderedDict([
+        ('Logistic Regression', LogisticRegression(random_state=RANDOM_STATE, max_iter=1000, class_weight='balanced')),
+        ('Random Forest', RandomForestClassifier(n_estimators=100, random_state=RANDOM_STATE, class_weight='balanced')),
+        ('Gradient Boosting', GradientBoostingClassifier(n_estimators=100, random_state=RANDOM_STATE)),
+    ])
+    try:
+        import xgboost as xgb
+        scale_pos_weight = (y_train == 0).sum() / (y_train == 1).sum()
+        # One thread per model: parallelism comes from the process pool
+        models['XGBoost'] = xgb.XGBClassifier(n_estimators=100, random_state=RANDOM_STATE, eval_metric='logloss',
+                                              scale_pos_weight=scale_pos_weight, n_jobs=1)
+    except ImportError:
+        pass
+    if names:
+        unknown = [name for name in names if name not in models]
+        if unknown:
+            raise ValueError(f'Unknown or unavailable models: {unknown}; choose from {list(models)}')
+        models = OrderedDict((name, models[name]) for name in names)
+    return models
+
+
+def holdout_metrics(y_true, y_pred, y_proba):
+    """The notebook's comparison metrics on the test split"""
+    return {
+        'Accuracy': accuracy_score(y_true, y_pred),
+        'Precision': precision_score(y_true, y_pred, zero_division=0),
+        'Recall': recall_score(y_true, y_pred, zero_division=0),
+        'F1-Score': f1_score(y_true, y_pred, zero_division=0),
+        'AUC-ROC': roc_auc_score(y_true, y_proba),
+    }
+
+
+def cv_folds(data, n_folds=CV_FOLDS):
+    """(train, validation) row indices of the same unshuffled stratified folds cross_val_score(cv=n) uses"""
+    if n_folds < 2:
+        return []
+    return list(StratifiedKFold(n_splits=n_folds).split(data['X_train'], data['y_train']))
+
+
+def _init_worker(data, n_folds):
+    """Hand each worker the training matrices once instead of with every task"""
+    _worker['data'] = data
+    _worker['folds'] = cv_folds(data, n_folds)
+
+
+def _run_task(name, estimator, fold):
+    """Fit one model on the full training split (fold None) or on one CV fold"""
+    data = _worker['data']
+    start = time.perf_counter()
+    model = clone(estimator)
+    if fold is None:
+        model.fit(data['X_train'], data['y_train'])
+        proba = model.predict_proba(data['X_test'])[:, 1]
+        metrics = holdout_metrics(data['y_test'], model.predict(data['X_test']), proba)
+        return name, fold, model, metrics, time.perf_counter() - start
+    train, valid = _worker['folds'][fold]
+    model.fit(data['X_train'][train], data['y_train'][train])
+    y_valid = data['y_train'][valid]
+    metrics = {'AUC-ROC': roc_auc_score(y_valid, model.predict_proba(data['X_train'][valid])[:, 1]),
+               'F1-Score': f1_score(y_valid, model.predict(data['X_train'][valid]), zero_division=0)}
+    return name, fold, None, metrics, time.perf_counter() - start
+
+
+def train_models(data, models, n_folds=CV_FOLDS, workers=None):
+    """Holdout fit and CV folds of every model; returns (fitted models, results table)"""
+    workers = workers or os.cpu_count() or 1
+    # Full fits first: they are the longest tasks, so the pool drains evenly
+    tasks = [(name, estimator, None) for name, estimator in models.items()]
+    tasks += [(name, estimator, fold) for fold in range(n_folds if n_folds > 1 else 0)
+              for name, estimator in models.items()]
+    if workers == 1:
+        _init_worker(data, n_folds)
+        outputs = [_run_task(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks)), initializer=_init_worker,
+                                 initargs=(data, n_folds)) as pool:
+            outputs = list(pool.map(_run_task, *zip(*tasks)))
+
+    fitted, rows = {}, OrderedDict((name, {'Model': name}) for name in models)
+    cv = {name: [] for name in models}
+    for name, fold, model, metrics, seconds in outputs:
+        if fold is None:
+            fitted[name] = model
+            rows[name].update(metrics)
+            rows[name]['Fit Time (s)'] = seconds
+        else:
+            cv[name].append(metrics)
+            rows[name]['CV Time (s)'] = rows[name].get('CV Time (s)', 0.0) + seconds
+    for name, folds in cv.items():
+        if folds:
+            auc = np.array([m['AUC-ROC'] for m in folds])
+            rows[name]['CV AUC-ROC'] = auc.mean()
+            rows[name]['CV AUC-ROC Std'] = auc.std()
+            rows[name]['CV F1-Score'] = np.mean([m['F1-Score'] for m in folds])
+    return fitted, pd.DataFrame(list(rows.values()))
+
+
+def _dump(obj, path):
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'wb') as f:
+        pickle.dump(obj, f)
+    os.replace(tmp, path)
+
+
+def save_artifacts(model, data, model_dir=MODEL_DIR):
+    """Write the pickles the app and scorers load, then recompile the fast path"""
+    os.makedirs(model_dir, exist_ok=True)
+    _dump(data['scaler'], os.path.join(model_dir, 'scaler.pkl'))
+    _dump(data['feature_names'], os.path.join(model_dir, 'feature_names.pkl'))
+    # Category codes and thresholds of the training data, so scoring never refits them
+    _dump(data['reference'], os.path.join(model_dir, REFERENCE_FILE))
+    model_path = os.path.join(model_dir, 'best_model.pkl')
+    _dump(model, model_path)
+    try:
+        return compile_file(model_path, os.path.join(model_dir, COMPILED_MODEL))
+    except ValueError:
+        # Not a tree ensemble; scorers notice the stale artifact and use the model itself
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Train and compare the attrition models in parallel')
+    parser.add_argument('--input', default='employee.csv', help='Employee CSV with the attrition label')
+    parser.add_argument('--model-dir', default=MODEL_DIR, help='Where to write the model artifacts')
+    parser.add_argument('--report', default='Model.csv', help='Model comparison CSV')
+    parser.add_argument('--models', nargs='+', default=None, help='Subset of candidate models to train')
+    parser.add_argument('--metric', default='F1-Score', choices=METRICS + ['CV AUC-ROC', 'CV F1-Score'],
+                        help='Metric that picks the best model (the notebook uses holdout F1)')
+    parser.add_argument('--cv', type=int, default=CV_FOLDS, help='Cross-validation folds (0 to skip)')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--no-cache', action='store_true', help='Rebuild the feature matrices from scratch')
+    args = parser.parse_args()
+    if args.metric.startswith('CV') and args.cv < 2:
+        parser.error(f'{args.metric} needs cross-validation (--cv 2 or more)')
+
+    print('=' * 70)
+    print('🏋️  MODEL TRAINING PIPELINE')
+    print('=' * 70)
+    stages = OrderedDict()
+
+    start = time.perf_counter()
+    data, cache_hit = load_prepared(args.input, use_cache=not args.no_cache)
+    stages['features'] = time.perf_counter() - start
+    print(f"✅ Features: {len(data['y_train']):,} train / {len(data['y_test']):,} test rows, "
+          f"{len(data['feature_names'])} features ({'cached' if cache_hit else 'built'})")
+
+    start = time.perf_counter()
+    models = candidate_models(data['y_train'], args.models)
+    fitted, results = train_models(data, models, args.cv, args.workers)
+    stages['training'] = time.perf_counter() - start
+    print(f"✅ Trained {len(models)} models with {args.cv}-fold CV in {stages['training']:.1f}s\n")
+
+    with pd.option_context('display.width', 200, 'display.max_columns', 20):
+        print(results.round(4).to_string(index=False))
+    best_name = results.loc[results[args.metric].idxmax(), 'Model']
+    print(f'\n🏆 Best Model (by {args.metric}): {best_name}')
+
+    start = time.perf_counter()
+    compiled = save_artifacts(fitted[best_name], data, args.model_dir)
+    results.round(4).to_csv(args.report, index=False)
+    stages['save'] = time.perf_counter() - start
+
+    report = {
+        'best_model': best_name,
+        'metric': args.metric,
+        'data_stamp': source_stamp(args.input),
+        'feature_cache_hit': cache_hit,
+        'cv_folds': args.cv,
+        'workers': args.workers or os.cpu_count() or 1,
+        'stages': {stage: round(seconds, 3) for stage, seconds in stages.items()},
+        'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+    }
+    with open(os.path.join(args.model_dir, REPORT_FILE), 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print('\n⏱️  Stage timings:')
+    for stage, seconds in stages.items():
+        print(f'   {stage:<10} {seconds:8.2f}s')
+    print(f'\n📁 Wrote {args.model_dir}/best_model.pkl, scaler.pkl, feature_names.pkl, {REFERENCE_FILE}, '
+          f'{REPORT_FILE} and {args.report}')
+    if compiled is not None:
+        print(f'📁 Recompiled {args.model_dir}/{COMPILED_MODEL}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Tree Ensemble Compiler
+Flattens a fitted GradientBoosting, RandomForest or XGBoost classifier into
+contiguous node arrays (feature, threshold, children, leaf value) and evaluates
+every tree for a whole batch with vectorized NumPy, without the estimator's
+per-call validation and per-tree Python overhead.
+
+Usage:
+    python tree_compiler.py --model models/best_model.pkl --output models/compiled_model.npz
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import numpy as np
+
+# Rows evaluated per block; keeps the (rows x trees) node table cache-sized
+BLOCK_SIZE = 1024
+
+
+class _FlatBuilder:
+    """Accumulates trees into global arrays with each node's children adjacent"""
+
+    def __init__(self):
+        self.feature, self.threshold, self.left, self.value, self.roots = [], [], [], [], []
+        self.depth = 0
+
+    def _new_node(self):
+        self.feature.append(0)
+        self.threshold.append(np.inf)
+        self.left.append(len(self.left))
+        self.value.append(0.0)
+        return len(self.feature) - 1
+
+    def add_tree(self, feature, threshold, left, right, value):
+        """Append one tree given per-node arrays (left/right = -1 at leaves)"""
+        root = self._new_node()
+        self.roots.append(root)
+        queue = [(0, root, 0)]
+        while queue:
+            node, slot, level = queue.pop()
+            self.depth = max(self.depth, level)
+            if left[node] == -1:
+                # Leaves point at themselves and never branch right, so extra
+                # traversal steps past a shallow leaf are no-ops
+                self.left[slot] = slot
+                self.value[slot] = value[node]
+                continue
+            child = self._new_node()
+            self._new_node()
+            self.feature[slot] = feature[node]
+            self.threshold[slot] = threshold[node]
+            self.left[slot] = child
+            queue.append((left[node], child, level + 1))
+            queue.append((right[node], child + 1, level + 1))
+
+
+def _add_sklearn_trees(builder, trees, leaf_value):
+    for tree in trees:
+        t = tree.tree_
+        builder.add_tree(t.feature, t.threshold, t.children_left, t.children_right, leaf_value(t))
+
+
+def _compile_gradient_boosting(model, builder):
+    if model.n_classes_ != 2:
+        raise ValueError('Only binary GradientBoostingClassifier models can be compiled')
+    learning_rate = model.learning_rate
+    _add_sklearn_trees(builder, model.estimators_[:, 0], lambda t: t.value[:, 0, 0] * learning_rate)
+    # Initial raw prediction is the prior log-odds (or 0 for init='zero')
+    if model.init_ == 'zero':
+        return 0.0, 'logistic', False
+    prior = model.init_.predict_proba(np.zeros((1, model.n_features_in_)))[0, 1]
+    return float(np.log(prior / (1 - prior))), 'logistic', False
+
+
+def _compile_random_forest(model, builder):
+    if model.n_classes_ != 2:
+        raise ValueError('Only binary RandomForestClassifier models can be compiled')
+    n_trees = len(model.estimators_)
+
+    def leaf_value(t):
+        counts = t.value[:, 0, :]
+        return counts[:, 1] / counts.sum(axis=1) / n_trees
+
+    _add_sklearn_trees(builder, model.estimators_, leaf_value)
+    return 0.0, 'identity', False
+
+
+def _compile_xgboost(model, builder):
+    booster = model.get_booster()
+    config = json.loads(booster.save_config())
+    prior = float(str(config['learner']['learner_model_param']['base_score']).strip('[]'))
+
+    for dump in booster.get_dump(dump_format='json'):
+        nodes = {}
+        stack = [json.loads(dump)]
+        while stack:
+            node = stack.pop()
+            nodes[node['nodeid']] = node
+            stack.extend(node.get('children', []))
+        n = max(nodes) + 1
+        feature = np.zeros(n, dtype=np.int64)
+        threshold = np.full(n, np.inf)
+        left = np.full(n, -1)
+        right = np.full(n, -1)
+        value = np.zeros(n)
+        for node_id, node in nodes.items():
+            if 'leaf' in node:
+                value[node_id] = node['leaf']
+            else:
+                feature[node_id] = int(str(node['split']).lstrip('f'))
+                threshold[node_id] = node['split_condition']
+                left[node_id] = node['yes']
+                right[node_id] = node['no']
+        builder.add_tree(feature, threshold, left, right, value)
+    # XGBoost sends x < threshold left; sklearn sends x <= threshold left
+    return float(np.log(prior / (1 - prior))), 'logistic', True
+
+
+def _float32_thresholds(threshold, strict):
+    """Round float64 split points to float32 without changing any float32 comparison"""
+    t32 = threshold.astype(np.float32)
+    if not strict:
+        # x <= t for float32 x holds exactly when x <= the largest float32 not above t
+        t32 = np.where(t32 > threshold, np.nextafter(t32, np.float32(-np.inf)), t32)
+    return t32.astype(np.float32)
+
+
+def compile_model(model):
+    """Flatten a fitted tree-ensemble classifier into a CompiledForest"""
+    name = type(model).__name__
+    compilers = {
+        'GradientBoostingClassifier': _compile_gradient_boosting,
+        'RandomForestClassifier': _compile_random_forest,
+        'XGBClassifier': _compile_xgboost,
+    }
+    if name not in compilers:
+        raise ValueError(f'Cannot compile {name}; supported: GradientBoosting, RandomForest, XGBoost')
+    builder = _FlatBuilder()
+    base, link, strict = compilers[name](model, builder)
+    return CompiledForest(
+        feature=np.asarray(builder.feature, dtype=np.int32),
+        threshold=_float32_thresholds(np.asarray(builder.threshold, dtype=np.float64), strict),
+        left=np.asarray(builder.left, dtype=np.int32),
+        value=np.asarray(builder.value, dtype=np.float64),
+        roots=np.asarray(builder.roots, dtype=np.int32),
+        depth=builder.depth, base=base, link=link, strict=strict,
+        n_features=model.n_features_in_, source=name
+    )
+
+
+class CompiledForest:
+    """Flat-array tree ensemble with a predict_proba compatible with sklearn's"""
+
+    def __init__(self, feature, threshold, left, value, roots, depth,
+                 base, link, strict, n_features, source=''):
+        self.feature = feature
+        self.threshold = threshold
+        # Right child is always left + 1
+        self.left = left
+        self.value = value
+        self.roots = roots
+        self.depth = int(depth)
+        self.base = float(base)
+        self.link = str(link)
+        self.strict = bool(strict)
+        self.n_features_in_ = int(n_features)
+        self.source = str(source)
+        self.classes_ = np.array([0, 1])
+
+    def _raw_block(self, X):
+        n_rows = X.shape[0]
+        # Each row's flat offset into X, so one take() gathers a feature per (row, tree)
+        row_offset = (np.arange(n_rows, dtype=np.int32) * np.int32(X.shape[1]))[:, None]
+        flat = X.ravel()
+        node = np.broadcast_to(self.roots, (n_rows, len(self.roots)))
+        for _ in range(self.depth):
+            x = flat.take(row_offset + self.feature.take(node))
+            threshold = self.threshold.take(node)
+            go_right = x >= threshold if self.strict else x > threshold
+            node = self.left.take(node) + go_right
+        return self.base + self.value.take(node).sum(axis=1)
+
+    def decision_function(self, X):
+        """Raw ensemble output (log-odds for boosting, probability for forests)"""
+        # The estimators compare float32 features, and the thresholds were rounded to match
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.shape[0] <= BLOCK_SIZE:
+            return self._raw_block(X)
+        return np.concatenate([self._raw_block(X[start:start + BLOCK_SIZE])
+                               for start in range(0, X.shape[0], BLOCK_SIZE)])
+
+    def predict_proba(self, X):
+        """Class probabilities as an (n, 2) array"""
+        raw = self.decision_function(X)
+        positive = 1 / (1 + np.exp(-raw)) if self.link == 'logistic' else raw
+        return np.column_stack([1 - positive, positive])
+
+    def predict(self, X):
+        return (self.predict_proba(X)[:, 1] > 0.5).astype(int)
+
+    def save(self, path, source_stamp=None):
+        """Write the arrays to a single .npz artifact"""
+        np.savez(path, feature=self.feature, threshold=self.threshold, left=self.left,
+                 value=self.value, roots=self.roots,
+                 meta=np.array(json.dumps({
+                     'depth': self.depth, 'base': self.base, 'link': self.link,
+                     'strict': self.strict, 'n_features': self.n_features_in_,
+                     'source': self.source, 'source_stamp': source_stamp
+                 })))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            meta = json.loads(str(data['meta']))
+            forest = cls(data['feature'], data['threshold'], data['left'],
+                         data['value'], data['roots'], meta['depth'], meta['base'],
+                         meta['link'], meta['strict'], meta['n_features'], meta['source'])
+        forest.source_stamp = meta.get('source_stamp')
+        return forest
+
+
+def source_stamp(path):
+    """Content hash of the pickled model the artifact was compiled from"""
+    # Hash rather than mtime so a checked-in artifact stays valid after a clone
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def compile_file(model_path, output_path):
+    """Compile a pickled model into an .npz artifact"""
+    with open(model_path, 'rb') as f:
+        model = pickle.load(f)
+    forest = compile_model(model)
+    forest.save(output_path, source_stamp=source_stamp(model_path))
+    return forest
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compile a tree-ensemble model into flat NumPy arrays')
+    parser.add_argument('--model', default=os.path.join('models', 'best_model.pkl'))
+    parser.add_argument('--output', default=os.path.join('models', 'compiled_model.npz'))
+    args = parser.parse_args()
+
+    forest = compile_file(args.model, args.output)
+    print(f'✅ Compiled {forest.source}: {len(forest.roots)} trees, {len(forest.feature):,} nodes, '
+          f'depth {forest.depth}')
+    print(f'📁 Wrote {args.output} ({os.path.getsize(args.output) / 1024:.1f} KB)')
+
+
+if __name__ == '__main__':
+    main()
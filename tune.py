@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Hyperparameter Search
+Successive halving over random configurations of the tree-ensemble candidates
+under a wall-clock budget. Every configuration starts on a small slice of each
+cross-validation fold's training rows; only the best third of each rung goes
+on to three times as many rows. The prepared matrices and CV folds come from
+train.py's cache and are computed once for all trials. Each trial records its
+ROC-AUC and fit/predict latency. The pick is the cheapest model to score within
+`--tolerance` AUC of the best, since the whole workforce is scored nightly.
+
+Usage:
+    python tune.py --budget 600 --workers 4
+    python tune.py --models XGBoost --candidates 27 --tolerance 0.002 --save
+"""
+
+import argparse
+import json
+import math
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import ParameterSampler
+
+from scoring import MODEL_DIR
+from train import (CV_FOLDS, RANDOM_STATE, candidate_models, cv_folds, holdout_metrics, load_prepared,
+                   save_artifacts)
+
+SEARCH_SPACES = {
+    'Random Forest': {
+        'n_estimators': [50, 100, 200, 400],
+        'max_depth': [None, 6, 10, 16],
+        'min_samples_leaf': [1, 2, 5, 10],
+        'max_features': ['sqrt', 0.5],
+    },
+    'Gradient Boosting': {
+        'n_estimators': [50, 100, 200, 400],
+        'learning_rate': [0.03, 0.05, 0.1, 0.2],
+        'max_depth': [2, 3, 4, 5],
+        'subsample': [0.7, 0.85, 1.0],
+    },
+    'XGBoost': {
+        'n_estimators': [50, 100, 200, 400],
+        'learning_rate': [0.03, 0.05, 0.1, 0.2],
+        'max_depth': [2, 3, 4, 6],
+        'subsample': [0.7, 0.85, 1.0],
+        'colsample_bytree': [0.6, 0.8, 1.0],
+        'min_child_weight': [1, 5],
+    },
+}
+
+ETA = 3
+MIN_RESOURCES = 400  # training rows per fold on the first rung
+
+_worker = {}
+
+
+def sample_candidates(models, n_per_model, random_state=RANDOM_STATE):
+    """Random configurations per model family; the default settings are always included"""
+    candidates = []
+    for name, estimator in models.items():
+        space = SEARCH_SPACES[name]
+        defaults = {key: estimator.get_params()[key] for key in space}
+        configs = [defaults] + list(ParameterSampler(space, n_iter=max(n_per_model - 1, 0), random_state=random_state))
+        seen = set()
+        for params in configs:
+            key = json.dumps(params, sort_keys=True, default=str)
+            if key not in seen:
+                seen.add(key)
+                candidates.append((name, params))
+    return candidates
+
+
+def rung_sizes(n_rows, n_candidates, eta=ETA, min_resources=MIN_RESOURCES):
+    """Training rows per fold on each rung, ending with the full fold"""
+    by_resources = int(math.log(max(n_rows / min_resources, 1), eta)) + 1
+    by_candidates = math.ceil(math.log(max(n_candidates, 1), eta)) + 1
+    n_rungs = max(min(by_resources, by_candidates), 1)
+    return [int(n_rows / eta ** (n_rungs - 1 - rung)) for rung in range(n_rungs)]
+
+
+def _init_worker(data, folds, estimators):
+    """Share the prepared matrices, fold splits and base estimators with each worker once"""
+    _worker['data'] = data
+    _worker['folds'] = folds
+    _worker['estimators'] = estimators
+
+
+def _run_trial(candidate, fold, n_rows):
+    """Fit one configuration on the first `n_rows` of one fold's (shuffled) training rows"""
+    name, params = candidate
+    data = _worker['data']
+    train, valid = _worker['folds'][fold]
+    model = clone(_worker['estimators'][name]).set_params(**params)
+    start = time.perf_counter()
+    model.fit(data['X_train'][train[:n_rows]], data['y_train'][train[:n_rows]])
+    fit_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    proba = model.predict_proba(data['X_train'][valid])[:, 1]
+    predict_us = (time.perf_counter() - start) / len(valid) * 1e6
+    return roc_auc_score(data['y_train'][valid], proba), fit_seconds, predict_us
+
+
+def _evaluate_rung(pool, candidates, n_folds, n_rows, deadline):
+    """Results of every (candidate, fold) that finished before the deadline"""
+    tasks = [(c, fold) for c in range(len(candidates)) for fold in range(n_folds)]
+    results = {}
+    if pool is None:
+        for c, fold in tasks:
+            if time.perf_counter() > deadline:
+                break
+            results[c, fold] = _run_trial(candidates[c], fold, n_rows)
+        return results
+    futures = {pool.submit(_run_trial, candidates[c], fold, n_rows): (c, fold) for c, fold in tasks}
+    done, pending = wait(futures, timeout=max(deadline - time.perf_counter(), 0))
+    for future in pending:
+        future.cancel()
+    for future in done:
+        results[futures[future]] = future.result()
+    return results
+
+
+def successive_halving(data, models, n_candidates=9, n_folds=CV_FOLDS, budget=600, workers=None,
+                       eta=ETA, min_resources=MIN_RESOURCES):
+    """Trial table of a budgeted successive-halving search
+
+    Returns one row per (configuration, rung) that finished on every fold.
+    """
+    workers = workers or os.cpu_count() or 1
+    deadline = time.perf_counter() + budget
+    candidates = sample_candidates(models, n_candidates)
+    # One shuffle per fold, drawn once, so each rung's slice is a superset of the last
+    rng = np.random.default_rng(RANDOM_STATE)
+    folds = [(rng.permutation(train), valid) for train, valid in cv_folds(data, n_folds)]
+    sizes = rung_sizes(min(len(train) for train, _ in folds), len(candidates), eta, min_resources)
+
+    pool = None
+    if workers > 1:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                   initargs=(data, folds, dict(models)))
+    else:
+        _init_worker(data, folds, dict(models))
+
+    trials, alive, complete = [], list(range(len(candidates))), -1
+    try:
+        for rung, n_rows in enumerate(sizes):
+            rung_candidates = [candidates[c] for c in alive]
+            results = _evaluate_rung(pool, rung_candidates, n_folds, n_rows, deadline)
+            scored = []
+            for i, c in enumerate(alive):
+                folds_done = [results[i, fold] for fold in range(n_folds) if (i, fold) in results]
+                if len(folds_done) < n_folds:
+                    continue
+                auc, fit_seconds, predict_us = np.array(folds_done).T
+                name, params = candidates[c]
+                trials.append({'Model': name, 'Params': json.dumps(params, sort_keys=True, default=str),
+                               'Rung': rung, 'Rows': n_rows, 'ROC-AUC': auc.mean(), 'ROC-AUC Std': auc.std(),
+                               'Fit Time (s)': fit_seconds.mean(), 'Predict (us/row)': predict_us.mean()})
+                scored.append((auc.mean(), c))
+            if len(scored) < len(alive):
+                # Budget exhausted mid-rung; what finished is kept but not used for selection
+                break
+            complete = rung
+            if rung == len(sizes) - 1:
+                break
+            scored.sort(key=lambda item: -item[0])
+            alive = [c for _, c in scored[:max(math.ceil(len(scored) / eta), 1)]]
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+    trials = pd.DataFrame(trials)
+    if not trials.empty:
+        trials['Complete'] = trials['Rung'] <= complete
+    return trials
+
+
+def select_trial(trials, tolerance=0.005):
+    """Cheapest-to-score trial of the final rung within `tolerance` ROC-AUC of its best"""
+    complete = trials[trials['Complete']] if not trials.empty else trials
+    if complete.empty:
+        return None
+    # Only the last rung every survivor finished is compared, all on the same rows
+    final = complete[complete['Rung'] == complete['Rung'].max()]
+    contenders = final[final['ROC-AUC'] >= final['ROC-AUC'].max() - tolerance]
+    return contenders.sort_values(['Predict (us/row)', 'ROC-AUC'], ascending=[True, False]).iloc[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Budgeted successive-halving search over the tree-ensemble models')
+    parser.add_argument('--input', default='employee.csv', help='Employee CSV with the attrition label')
+    parser.add_argument('--models', nargs='+', default=list(SEARCH_SPACES), choices=list(SEARCH_SPACES),
+                        help='Model families to search')
+    parser.add_argument('--candidates', type=int, default=9, help='Random configurations per model family')
+    parser.add_argument('--budget', type=float, default=600, help='Wall-clock budget in seconds')
+    parser.add_argument('--tolerance', type=float, default=0.005,
+                        help='ROC-AUC given up for a cheaper-to-score model')
+    parser.add_argument('--cv', type=int, default=CV_FOLDS, help='Cross-validation folds')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--trials', default='tuning_trials.csv', help='Where to write every trial')
+    parser.add_argument('--save', action='store_true', help='Refit the selection and write it to --model-dir')
+    parser.add_argument('--model-dir', default=MODEL_DIR, help='Where --save writes the model artifacts')
+    args = parser.parse_args()
+    if args.cv < 2:
+        parser.error('--cv must be 2 or more')
+
+    print('=' * 70)
+    print('🔎 HYPERPARAMETER SEARCH')
+    print('=' * 70)
+    start = time.perf_counter()
+    data, cache_hit = load_prepared(args.input)
+    print(f"✅ Features: {len(data['y_train']):,} train rows ({'cached' if cache_hit else 'built'})")
+
+    available = candidate_models(data['y_train'])
+    models = OrderedDict((name, available[name]) for name in args.models if name in available)
+    trials = successive_halving(data, models, args.candidates, args.cv, args.budget, args.workers)
+    elapsed = time.perf_counter() - start
+    if trials.empty:
+        print(f'❌ No configuration finished within the {args.budget:.0f}s budget')
+        return
+    trials.round(6).to_csv(args.trials, index=False)
+    print(f'✅ {len(trials)} trials on {trials["Rung"].nunique()} rungs in {elapsed:.1f}s')
+    best = select_trial(trials, args.tolerance)
+    if best is None:
+        print(f'❌ No rung finished within the {args.budget:.0f}s budget; raise --budget')
+        return
+    if not trials['Complete'].all():
+        print(f"⚠️  Budget ran out during rung {trials['Rung'].max()}; selecting from rung {best['Rung']}")
+
+    final = trials[trials['Complete'] & (trials['Rung'] == best['Rung'])].sort_values('ROC-AUC', ascending=False)
+    with pd.option_context('display.width', 200, 'display.max_colwidth', 90):
+        print()
+        print(final.drop(columns='Complete').round(4).to_string(index=False))
+
+    print(f"\n🏆 Selected {best['Model']} {best['Params']}")
+    print(f"   CV ROC-AUC {best['ROC-AUC']:.4f} (best {final['ROC-AUC'].max():.4f}), "
+          f"{best['Predict (us/row)']:.2f} us/row to score")
+    print(f'📁 Wrote {args.trials}')
+
+    if args.save:
+        model = clone(models[best['Model']]).set_params(**json.loads(best['Params']))
+        model.fit(data['X_train'], data['y_train'])
+        metrics = holdout_metrics(data['y_test'], model.predict(data['X_test']),
+                                  model.predict_proba(data['X_test'])[:, 1])
+        print('   Holdout: ' + ', '.join(f'{metric} {value:.4f}' for metric, value in metrics.items()))
+        compiled = save_artifacts(model, data, args.model_dir)
+        print(f"📁 Wrote {args.model_dir}/best_model.pkl, scaler.pkl, feature_names.pkl, reference.pkl"
+              + (' and compiled_model.npz' if compiled is not None else ''))
+
+
+if __name__ == '__main__':
+    main()
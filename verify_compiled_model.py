@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Verify the compiled tree ensemble against the pickled model
+Scores the notebook's held-out test split with both and checks the
+probabilities agree.
+"""
+
+import os
+import numpy as np
+from sklearn.model_selection import train_test_split
+
+from data_cache import read_csv_cached
+from scoring import AttritionScorer, COMPILED_MODEL, MODEL_DIR
+from tree_compiler import compile_file
+
+TOLERANCE = 1e-6
+
+print("=" * 70)
+print("🔍 COMPILED MODEL PARITY CHECK")
+print("=" * 70)
+
+compiled_path = os.path.join(MODEL_DIR, COMPILED_MODEL)
+scorer = AttritionScorer(MODEL_DIR)
+if scorer.compiled is None:
+    print(f"⚙️  {compiled_path} missing or stale, compiling...")
+    scorer.compiled = compile_file(os.path.join(MODEL_DIR, 'best_model.pkl'), compiled_path)
+
+df = read_csv_cached('employee.csv')
+scorer.fit_reference(df)
+
+# Same split as the notebook
+_, X_test = train_test_split(df, test_size=0.2, random_state=42, stratify=df['attrition'])
+columns = {name: X_test[name].to_numpy() for name in scorer.base_features if name in X_test.columns}
+X = scorer.transform(scorer.build_matrix(columns))
+
+expected = scorer.model.predict_proba(X)[:, 1]
+actual = scorer.compiled.predict_proba(X)[:, 1]
+max_diff = float(np.abs(expected - actual).max())
+flipped = int(((expected > 0.5) != (actual > 0.5)).sum())
+
+print(f"\nModel: {scorer.compiled.source} ({len(scorer.compiled.roots)} trees, "
+      f"{len(scorer.compiled.feature):,} nodes)")
+print(f"Test rows: {len(X):,}")
+print(f"Max |Δ probability|: {max_diff:.2e}")
+print(f"Class flips: {flipped}")
+
+if max_diff <= TOLERANCE and flipped == 0:
+    print("\n✅ Compiled model matches predict_proba")
+else:
+    print(f"\n❌ Compiled model differs from predict_proba (tolerance {TOLERANCE:g})")
+    raise SystemExit(1)
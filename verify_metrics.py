@@ -1,7 +1,7 @@
-import pandas as pd
+from data_cache import read_csv_cached
 
 # Load employee data
-df = pd.read_csv('employee.csv')
+df = read_csv_cached('employee.csv')
 
 # Count actual attrition
 attrition_count = df['attrition'].sum()
@@ -29,7 +29,7 @@ print(f"Annual Savings: ${annual_savings:,.0f}")
 print(f"Annual Savings (in millions): ${annual_savings/1_000_000:.1f}M")
 
 # Check predictions
-pred = pd.read_csv('attritionprediction.csv')
+pred = read_csv_cached('attritionprediction.csv')
 high_risk_count = len(pred[pred['risk_category'] == 'High'])
 print(f"\n=== PREDICTIONS ===")
 print(f"High-Risk Employees Identified: {high_risk_count}")
@@ -1,8 +1,13 @@
 """Verify ROI Calculator calculations are accurate"""
-import pandas as pd
+import time
+
+import numpy as np
+
+import roi
+from data_cache import read_csv_cached
 
 # Load actual data
-df = pd.read_csv('employee.csv')
+df = read_csv_cached('employee.csv')
 
 # Actual values
 total_employees = 5000
@@ -20,12 +25,23 @@ print(f"Current Attrition Rate: {current_attrition_rate}%")
 print(f"Model Accuracy: {model_accuracy}%")
 print(f"Intervention Success Rate: {retention_success_rate}%")
 
-# Calculations
-annual_attrition_count = int(total_employees * current_attrition_rate / 100)
+# Calculations (same engine as the calculator page)
+inputs = {
+    'total_employees': total_employees,
+    'avg_salary': avg_salary,
+    'attrition_rate': current_attrition_rate,
+    'replacement_multiplier': replacement_cost_multiplier,
+    'model_accuracy': model_accuracy,
+    'success_rate': retention_success_rate,
+    'implementation_cost': implementation_cost,
+    'annual_maintenance': annual_maintenance,
+}
+result = roi.scenario(**inputs)
+annual_attrition_count = int(result['attrition_count'])
 replacement_cost = avg_salary * replacement_cost_multiplier
-productivity_loss = avg_salary * 0.5
-total_cost_per_employee = replacement_cost + productivity_loss
-annual_attrition_cost = annual_attrition_count * total_cost_per_employee
+productivity_loss = avg_salary * roi.PRODUCTIVITY_LOSS
+total_cost_per_employee = result['cost_per_attrition']
+annual_attrition_cost = result['attrition_cost']
 
 print(f"\n=== ATTRITION COSTS ===")
 print(f"Annual Attrition Count: {annual_attrition_count}")
@@ -35,10 +51,9 @@ print(f"Total Cost per Attrition: ${total_cost_per_employee:,.0f}")
 print(f"Annual Attrition Cost: ${annual_attrition_cost:,.0f}")
 
 # ML Impact
-identifiable_rate = model_accuracy / 100
-identified_employees = annual_attrition_count * identifiable_rate
-retained_employees = identified_employees * (retention_success_rate / 100)
-cost_savings = retained_employees * total_cost_per_employee
+identified_employees = result['identified']
+retained_employees = result['retained']
+cost_savings = result['savings']
 
 print(f"\n=== ML SYSTEM IMPACT ===")
 print(f"Identified At-Risk: {int(identified_employees)}")
@@ -46,7 +61,7 @@ print(f"Successfully Retained: {int(retained_employees)}")
 print(f"Annual Savings: ${cost_savings:,.0f}")
 
 # Year 1
-year1_net = cost_savings - implementation_cost - annual_maintenance
+year1_net = result['year1_net']
 print(f"\n=== YEAR 1 ===")
 print(f"Gross Savings: ${cost_savings:,.0f}")
 print(f"Implementation Cost: ${implementation_cost:,.0f}")
@@ -54,14 +69,14 @@ print(f"Annual Maintenance: ${annual_maintenance:,.0f}")
 print(f"Year 1 Net Benefit: ${year1_net:,.0f}")
 
 # Year 2-5
-annual_net = cost_savings - annual_maintenance
+annual_net = result['annual_net']
 print(f"\n=== YEARS 2-5 ===")
 print(f"Annual Net Benefit: ${annual_net:,.0f}")
 
 # 5-year totals
-five_year_total = year1_net + (annual_net * 4)
-total_investment = implementation_cost + (annual_maintenance * 5)
-five_year_roi = (five_year_total / total_investment) * 100
+five_year_total = result['total_net']
+total_investment = result['investment']
+five_year_roi = result['roi']
 
 print(f"\n=== 5-YEAR PROJECTION ===")
 print(f"Total Investment: ${total_investment:,.0f}")
@@ -69,11 +84,10 @@ print(f"Total 5-Year Benefit: ${five_year_total:,.0f}")
 print(f"5-Year ROI: {five_year_roi:.1f}%")
 
 # Payback period
-if year1_net > 0:
-    months_to_payback = (implementation_cost / (cost_savings / 12))
-    print(f"Payback Period: {months_to_payback:.1f} months")
+payback_years = result['payback_years']
+if payback_years < 1:
+    print(f"Payback Period: {payback_years * 12:.1f} months")
 else:
-    payback_years = implementation_cost / annual_net if annual_net > 0 else float('inf')
     print(f"Payback Period: {payback_years:.1f} years")
 
 # Verify against About page claim
@@ -83,3 +97,29 @@ print(f"Calculator shows ${cost_savings:,.0f} annual savings ({retention_success
 print(f"\nNote: Different assumptions:")
 print(f"  - About: 30% reduction, $82K replacement cost")
 print(f"  - Calculator: {model_accuracy}% accuracy * {retention_success_rate}% success = {model_accuracy * retention_success_rate / 100:.1f}% effective, ${total_cost_per_employee:,.0f} total cost")
+
+# Vectorized engine: a parameter grid must reproduce the single scenario above
+print(f"\n=== SCENARIO ENGINE ===")
+start = time.perf_counter()
+scenarios = roi.grid(inputs,
+                     attrition_rate=np.linspace(5, 30, 100),
+                     model_accuracy=np.linspace(80, 99, 100),
+                     success_rate=np.linspace(10, 80, 100))
+elapsed = time.perf_counter() - start
+print(f"Grid: {scenarios['total_net'].size:,} scenarios in {elapsed * 1000:.0f} ms")
+point = roi.grid(inputs, attrition_rate=[current_attrition_rate], model_accuracy=[model_accuracy],
+                 success_rate=[retention_success_rate])
+assert np.isclose(point['total_net'].item(), five_year_total), "grid disagrees with the single scenario"
+print(f"✅ Grid evaluation matches the single scenario")
+
+uncertainty = {name: 0.2 for name in roi.DEFAULTS if name != 'total_employees'}
+start = time.perf_counter()
+draws = roi.monte_carlo(inputs, uncertainty, n=1_000_000)
+elapsed = time.perf_counter() - start
+bands = roi.percentiles(draws['total_net'])
+print(f"Monte Carlo (±20% on every assumption): 1,000,000 scenarios in {elapsed * 1000:.0f} ms")
+print(f"5-Year Benefit P5 / Median / P95: ${bands[5]:,.0f} / ${bands[50]:,.0f} / ${bands[95]:,.0f}")
+print(f"Chance of positive ROI: {np.mean(draws['roi'] > 0):.1%}")
+print("\nSensitivity (5-year benefit with one input at -20% / +20%):")
+for _, row in roi.sensitivity(inputs, uncertainty).iterrows():
+    print(f"  {row['Parameter']:<28} ${row['Low']:>14,.0f}  ${row['High']:>14,.0f}")